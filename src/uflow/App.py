@@ -1,7 +1,6 @@
 """Application class here"""
 
 import os
-import json
 import shutil
 from string import ascii_letters
 import random
@@ -19,9 +18,14 @@ from uflow.Core.GraphManager import GraphManagerSingleton
 from uflow.Core.Common import currentProcessorTime
 from uflow.Core.Common import SingletonDecorator
 from uflow.Core.Common import validateGraphDataPackages
+from uflow.Core.BulkLoad import readGraphFile
+from uflow.Core.GraphContainer import CONTAINER_EXTENSION, writeGraphFile
 from uflow.UI.Canvas.UICommon import SessionDescriptor
 from uflow.UI.Widgets.BlueprintCanvas import BlueprintCanvasWidget
 from uflow.UI.Tool.Tool import ShelfTool, DockTool
+from uflow.UI.Tool.ProfilerTool import ProfilerTool
+from uflow.UI.Tool.MemoryTool import MemoryTool
+from uflow.Core.Tracer import Tracer
 from uflow.UI.EditorHistory import EditorHistory
 from uflow.UI.Tool import GET_TOOLS
 from uflow.UI.Utils.stylesheet import editableStyleSheet
@@ -45,6 +49,10 @@ from uflow.ConfigManager import ConfigManager
 import uflow.UI.resources
 
 EDITOR_TARGET_FPS = 30
+GRAPH_FILES_FILTER = (
+    "Graph files (*.pygraph *{0});;Json graph files (*.pygraph);;"
+    "Graph containers (*{0})".format(CONTAINER_EXTENSION)
+)
 
 
 def generateRandomString(numbSymbols=5):
@@ -213,6 +221,18 @@ class uflow(QMainWindow):
         preferencesAction = editMenu.addAction("Preferences")
         preferencesAction.setIcon(QtGui.QIcon(":/options_icon.png"))
         preferencesAction.triggered.connect(self.showPreferencesWindow)
+        profilerAction = editMenu.addAction("Profiler")
+        profilerAction.triggered.connect(self.showProfilerTool)
+        memoryAction = editMenu.addAction("Memory")
+        memoryAction.triggered.connect(self.showMemoryTool)
+        tracingAction = editMenu.addAction("Record trace")
+        tracingAction.setCheckable(True)
+        tracingAction.setChecked(Tracer().isEnabled())
+        tracingAction.toggled.connect(
+            lambda bEnabled: Tracer().enable() if bEnabled else Tracer().disable()
+        )
+        saveTraceAction = editMenu.addAction("Save trace...")
+        saveTraceAction.triggered.connect(self.saveTrace)
 
         pluginsMenu = self.menuBar.addMenu("Plugins")
         packagePlugin = pluginsMenu.addAction("Create package...")
@@ -235,6 +255,32 @@ class uflow(QMainWindow):
     def showPreferencesWindow(self):
         self.preferencesWindow.show()
 
+    def saveTrace(self):
+        filePath, _ = QFileDialog.getSaveFileName(
+            self, "Save trace", "trace.json", "Chrome trace (*.json)"
+        )
+        if filePath:
+            Tracer().dump(filePath)
+
+    def showProfilerTool(self):
+        return self.showSingletonTool(ProfilerTool)
+
+    def showMemoryTool(self):
+        return self.showSingletonTool(MemoryTool)
+
+    def showSingletonTool(self, toolClass):
+        for tool in self._tools:
+            if isinstance(tool, toolClass):
+                tool.show()
+                tool.onShow()
+                return tool
+        tool = toolClass()
+        self.registerToolInstance(tool)
+        self.addDockWidget(tool.defaultDockArea(), tool)
+        tool.setAppInstance(self)
+        tool.onShow()
+        return tool
+
     def registerToolInstance(self, instance):
         """Registers tool instance reference
 
@@ -357,16 +403,15 @@ class uflow(QMainWindow):
         self.updateLabel()
 
     def loadFromFile(self, filePath):
-        with open(filePath, "r") as f:
-            data = json.load(f)
-            self.loadFromData(data, clearHistory=True)
-            self.currentFileName = filePath
-            EditorHistory().saveState(
-                "Open {}".format(os.path.basename(self.currentFileName))
-            )
+        data = readGraphFile(filePath)
+        self.loadFromData(data, clearHistory=True)
+        self.currentFileName = filePath
+        EditorHistory().saveState(
+            "Open {}".format(os.path.basename(self.currentFileName))
+        )
 
     def load(self):
-        name_filter = "Graph files (*.pygraph)"
+        name_filter = GRAPH_FILES_FILTER
         savepath = QFileDialog.getOpenFileName(filter=name_filter)
         if type(savepath) in [tuple, list]:
             fpath = savepath[0]
@@ -377,7 +422,7 @@ class uflow(QMainWindow):
 
     def save(self, save_as=False):
         if save_as:
-            name_filter = "Graph files (*.pygraph)"
+            name_filter = GRAPH_FILES_FILTER
             default_name = (
                 "untitled" if self.currentFileName is None else self.currentFileName
             )
@@ -394,7 +439,7 @@ class uflow(QMainWindow):
                 self.currentFileName = None
         else:
             if self.currentFileName is None:
-                name_filter = "Graph files (*.pygraph)"
+                name_filter = GRAPH_FILES_FILTER
                 savepath = QFileDialog.getSaveFileName(
                     filter=name_filter, directory="untitled"
                 )
@@ -410,37 +455,28 @@ class uflow(QMainWindow):
         if not self.currentFileName:
             return False
 
-        if not self.currentFileName.endswith(".pygraph"):
+        if not self.currentFileName.endswith((".pygraph", CONTAINER_EXTENSION)):
             self.currentFileName += ".pygraph"
 
         if not self.currentFileName == "":
             # Get the current time and format it as a string
             current_time = datetime.now().strftime("%Y-%m-%d_%H_%M_%S")
 
-            tempFileName = (
-                self.currentFileName.replace(".pygraph", "")
-                + f"-tempfile-{current_time}.pygraph"
-            )
+            base, extension = os.path.splitext(self.currentFileName)
+            tempFileName = base + f"-tempfile-{current_time}" + extension
 
             try:
-                # save graph in temp file
-                with open(tempFileName, "w+") as tempPtr:
-                    saveData = self.graphManager.get().serialize()
-                    json.dump(saveData, tempPtr, indent=4)
-                    tempPtr.seek(0)
-                    content = tempPtr.read()
-
-                # write content to target file
-                with open(self.currentFileName, "w") as filePtr:
-                    filePtr.write(content)
+                # save graph in temp file, container is chosen by extension
+                saveData = self.graphManager.get().serialize()
+                writeGraphFile(tempFileName, saveData, targetPath=self.currentFileName)
 
-                # delete temp file
-                os.remove(tempFileName)
+                # replace target file
+                os.replace(tempFileName, self.currentFileName)
 
                 print(f"// saved: '{self.currentFileName}'")
             except Exception as e:
                 raise RuntimeError(
-                    f'JSON serialization failed.\nCould not save file "{self.currentFileName}"'
+                    f'Serialization failed.\nCould not save file "{self.currentFileName}"'
                 ) from e
 
             self.modified = False
@@ -16,7 +16,6 @@
 import os
 import sys
 import subprocess
-import json
 from time import process_time
 import pkgutil
 import uuid
@@ -37,6 +36,7 @@ from uflow.Core.PathsRegistry import PathsRegistry
 from uflow.Core.version import *
 from uflow.Core.GraphBase import GraphBase
 from uflow.Core.GraphManager import GraphManagerSingleton
+from uflow.Core.BulkLoad import readGraphFile
 from uflow.UI.Canvas.UICommon import *
 from uflow.UI.Widgets.BlueprintCanvas import BlueprintCanvasWidget
 from uflow.UI.Views.NodeBox import NodesBox
@@ -1216,13 +1216,12 @@ class MDIMain(QMainWindow):
         return ToolInstance
 
     def loadFromFile(self, filePath):
-        with open(filePath, "r") as f:
-            data = json.load(f)
-            self.loadFromData(data, clearHistory=True)
-            self.currentFileName = filePath
-            EditorHistory().saveState(
-                "Open {}".format(os.path.basename(self.currentFileName))
-            )
+        data = readGraphFile(filePath)
+        self.loadFromData(data, clearHistory=True)
+        self.currentFileName = filePath
+        EditorHistory().saveState(
+            "Open {}".format(os.path.basename(self.currentFileName))
+        )
 
     def loadFromData(self, data, clearHistory=False):
         # check first if all packages we are trying to load are legal
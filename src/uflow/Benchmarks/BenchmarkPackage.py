@@ -0,0 +1,252 @@
+"""
+.. sidebar:: **BenchmarkPackage.py**
+
+    Minimal pins and nodes used by benchmark graphs.
+
+Benchmarks must not depend on installed packages, so they register this package under
+:data:`PACKAGE_NAME` instead. It is not discovered by :func:`~uflow.INITIALIZE`.
+"""
+
+from uflow import GET_PACKAGES
+from uflow.Core import PinBase, NodeBase
+from uflow.Core.Common import pinAffects
+from uflow.Core.GraphBase import GraphBase
+
+PACKAGE_NAME = "BenchmarkPackage"
+
+
+class BenchFloatPin(PinBase):
+    """Float value pin"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, parent, direction, **kwargs):
+        super(BenchFloatPin, self).__init__(name, parent, direction, **kwargs)
+        self.setDefaultValue(0.0)
+
+    @staticmethod
+    def IsValuePin():
+        return True
+
+    @staticmethod
+    def pinDataTypeHint():
+        return "BenchFloatPin", 0.0
+
+    @staticmethod
+    def internalDataStructure():
+        return float
+
+    @staticmethod
+    def processData(data):
+        return float(data)
+
+    @staticmethod
+    def supportedDataTypes():
+        return ("BenchFloatPin",)
+
+
+class BenchExecPin(PinBase):
+    """Execution pin"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, parent, direction, **kwargs):
+        super(BenchExecPin, self).__init__(name, parent, direction, **kwargs)
+        self.dirty = False
+
+    def isExec(self):
+        return True
+
+    @staticmethod
+    def IsValuePin():
+        return False
+
+    @staticmethod
+    def pinDataTypeHint():
+        return "BenchExecPin", None
+
+    @staticmethod
+    def internalDataStructure():
+        return None
+
+    @staticmethod
+    def processData(data):
+        return None
+
+    @staticmethod
+    def supportedDataTypes():
+        return ("BenchExecPin",)
+
+    def setData(self, data):
+        pass
+
+
+class benchAdd(NodeBase):
+    """Pure node adding two values"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(benchAdd, self).__init__(name, **kwargs)
+        self.a = self.createInputPin("a", "BenchFloatPin")
+        self.b = self.createInputPin("b", "BenchFloatPin")
+        self.out = self.createOutputPin("out", "BenchFloatPin")
+
+    def compute(self, *args, **kwargs):
+        self.out.setData(self.a.getData() + self.b.getData())
+
+
+class benchWide(NodeBase):
+    """Pure node with many pins, summing all inputs into every output"""
+
+    _packageName = PACKAGE_NAME
+
+    PIN_COUNT = 32
+
+    def __init__(self, name, **kwargs):
+        super(benchWide, self).__init__(name, **kwargs)
+        self.values = [
+            self.createInputPin("in{}".format(i), "BenchFloatPin")
+            for i in range(self.PIN_COUNT)
+        ]
+        self.results = [
+            self.createOutputPin("out{}".format(i), "BenchFloatPin")
+            for i in range(self.PIN_COUNT)
+        ]
+
+    def compute(self, *args, **kwargs):
+        total = sum(pin.getData() for pin in self.values)
+        for pin in self.results:
+            pin.setData(total)
+
+
+class benchSink(NodeBase):
+    """Callable node pulling value, so upstream pure nodes are evaluated"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(benchSink, self).__init__(name, **kwargs)
+        self.inExec = self.createInputPin("inExec", "BenchExecPin", None, self.compute)
+        self.value = self.createInputPin("value", "BenchFloatPin")
+        self.result = None
+
+    def compute(self, *args, **kwargs):
+        self.result = self.value.getData()
+
+
+class graphInputs(NodeBase):
+    """Inputs of compound child graph"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(graphInputs, self).__init__(name, **kwargs)
+        self.out = self.createOutputPin("out", "BenchFloatPin")
+
+    def compute(self, *args, **kwargs):
+        pass
+
+
+class graphOutputs(NodeBase):
+    """Outputs of compound child graph"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(graphOutputs, self).__init__(name, **kwargs)
+        self.inp = self.createInputPin("in", "BenchFloatPin")
+
+    def compute(self, *args, **kwargs):
+        pass
+
+
+class compound(NodeBase):
+    """Node owning child graph, stored together with node
+
+    Input ``in`` feeds ``out`` of child :class:`graphInputs` node, output ``out`` reads ``in`` of
+    child :class:`graphOutputs` node. Evaluation engine recognizes these nodes by class name,
+    that is why they are not prefixed like other benchmark nodes.
+    """
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(compound, self).__init__(name, **kwargs)
+        self.inp = self.createInputPin("in", "BenchFloatPin")
+        self.out = self.createOutputPin("out", "BenchFloatPin")
+        self.isCompoundNode = True
+        self.rawGraph = None
+        self.inputsNode = None
+        self.outputsNode = None
+        self.inputsMap = {}
+        self.outputsMap = {}
+
+    def postCreate(self, jsonTemplate=None):
+        super(compound, self).postCreate(jsonTemplate)
+        graph = self.graph()
+        self.rawGraph = GraphBase(self.name, graph.graphManager, graph)
+        if jsonTemplate is not None and "graphData" in jsonTemplate:
+            self.rawGraph.populateFromJson(jsonTemplate["graphData"])
+            self.inputsNode = self.rawGraph.getNodesList(classNameFilters=["graphInputs"])[0]
+            self.outputsNode = self.rawGraph.getNodesList(classNameFilters=["graphOutputs"])[0]
+        else:
+            self.inputsNode = graphInputs("graphInputs")
+            self.outputsNode = graphOutputs("graphOutputs")
+            self.rawGraph.addNode(self.inputsNode)
+            self.rawGraph.addNode(self.outputsNode)
+        pinAffects(self.inp, self.inputsNode.out)
+        pinAffects(self.outputsNode.inp, self.out)
+        self.inputsMap = {self.inp: self.inputsNode.out}
+        self.outputsMap = {self.out: self.outputsNode.inp}
+
+    def serialize(self):
+        data = super(compound, self).serialize()
+        data["graphData"] = self.rawGraph.serialize()
+        return data
+
+    def kill(self, *args, **kwargs):
+        if self.rawGraph is not None:
+            self.rawGraph.remove()
+        super(compound, self).kill(*args, **kwargs)
+
+    def compute(self, *args, **kwargs):
+        for outputPin, innerPin in self.outputsMap.items():
+            outputPin.setData(innerPin.getData())
+            outputPin.setClean()
+
+
+class BenchmarkPackage(object):
+    """Package interface expected by :func:`~uflow.getRawNodeInstance`"""
+
+    def GetPinClasses(self):
+        return {"BenchFloatPin": BenchFloatPin, "BenchExecPin": BenchExecPin}
+
+    def GetNodeClasses(self):
+        return {
+            "benchAdd": benchAdd,
+            "benchWide": benchWide,
+            "benchSink": benchSink,
+            "graphInputs": graphInputs,
+            "graphOutputs": graphOutputs,
+            "compound": compound,
+        }
+
+    def GetFunctionLibraries(self):
+        return {}
+
+    def GetToolClasses(self):
+        return {}
+
+    def GetExporters(self):
+        return {}
+
+    def PrefsWidgets(self):
+        return None
+
+
+def registerBenchmarkPackage():
+    """Registers benchmark package if it is not registered yet"""
+    packages = GET_PACKAGES()
+    if PACKAGE_NAME not in packages:
+        packages[PACKAGE_NAME] = BenchmarkPackage()
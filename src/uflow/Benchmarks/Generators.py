@@ -0,0 +1,148 @@
+"""
+.. sidebar:: **Generators.py**
+
+    Synthetic graphs of configurable size.
+
+Every generator takes graph and scale (approximate number of nodes) and returns :class:`SyntheticGraph`
+with pin to change values of and callable sink node which pulls results. Available shapes are listed in
+:data:`GENERATORS`.
+"""
+
+from uflow import getRawNodeInstance
+from uflow.Core.Common import *
+from uflow.Benchmarks.BenchmarkPackage import PACKAGE_NAME
+
+
+class SyntheticGraph(object):
+    """Generated graph handles
+
+    :var source: Input pin all generated nodes depend on
+    :var sink: Callable node pulling value of last node
+    """
+
+    def __init__(self, graph, source, sink):
+        self.graph = graph
+        self.source = source
+        self.sink = sink
+
+
+def spawnNode(graph, className):
+    """Creates benchmark package node and adds it to graph
+
+    :rtype: :class:`~uflow.Core.NodeBase.NodeBase`
+    """
+    node = getRawNodeInstance(className, PACKAGE_NAME)
+    graph.addNode(node)
+    return node
+
+
+def _finish(graph, source, lastPin):
+    sink = spawnNode(graph, "benchSink")
+    connectPins(lastPin, sink.value)
+    return SyntheticGraph(graph, source, sink)
+
+
+def _addChain(graph, count, inputPin=None):
+    """Adds chain of nodes and returns first input and last output pins"""
+    first = spawnNode(graph, "benchAdd")
+    if inputPin is not None:
+        connectPins(inputPin, first.a)
+    last = first
+    for _ in range(count - 1):
+        node = spawnNode(graph, "benchAdd")
+        connectPins(last.out, node.a)
+        last = node
+    return first.a, last.out
+
+
+def chainGraph(graph, scale):
+    """Long chain: every node depends on previous one"""
+    source, lastPin = _addChain(graph, max(scale, 1))
+    return _finish(graph, source, lastPin)
+
+
+def fanGraph(graph, scale):
+    """Wide fan out from single node, reduced back by binary tree of nodes"""
+    root = spawnNode(graph, "benchAdd")
+    layer = []
+    for _ in range(max(scale // 2, 1)):
+        node = spawnNode(graph, "benchAdd")
+        connectPins(root.out, node.a)
+        layer.append(node.out)
+    while len(layer) > 1:
+        reduced = []
+        for i in range(0, len(layer) - 1, 2):
+            node = spawnNode(graph, "benchAdd")
+            connectPins(layer[i], node.a)
+            connectPins(layer[i + 1], node.b)
+            reduced.append(node.out)
+        if len(layer) % 2:
+            reduced.append(layer[-1])
+        layer = reduced
+    return _finish(graph, root.a, layer[0])
+
+
+def diamondGraph(graph, scale):
+    """Ladder of diamonds: every level splits into two nodes which join again"""
+    top = spawnNode(graph, "benchAdd")
+    lastPin = top.out
+    for _ in range(max(scale // 3, 1)):
+        left = spawnNode(graph, "benchAdd")
+        right = spawnNode(graph, "benchAdd")
+        join = spawnNode(graph, "benchAdd")
+        connectPins(lastPin, left.a)
+        connectPins(lastPin, right.a)
+        connectPins(left.out, join.a)
+        connectPins(right.out, join.b)
+        lastPin = join.out
+    return _finish(graph, top.a, lastPin)
+
+
+def nestedCompoundGraph(graph, scale, depth=16):
+    """Compound nodes nested ``depth`` levels deep. Child graph of every compound holds chain of nodes
+    between its ``graphInputs`` and ``graphOutputs``, with next compound inserted at the end of chain
+    """
+    perLevel = max(scale // depth, 1)
+    source, lastPin = _addChain(graph, perLevel)
+    compound = spawnNode(graph, "compound")
+    connectPins(lastPin, compound.inp)
+    result = compound.out
+    for level in range(depth):
+        _, lastPin = _addChain(compound.rawGraph, perLevel, compound.inputsNode.out)
+        outputsNode = compound.outputsNode
+        if level < depth - 1:
+            compound = spawnNode(compound.rawGraph, "compound")
+            connectPins(lastPin, compound.inp)
+            connectPins(compound.out, outputsNode.inp)
+        else:
+            connectPins(lastPin, outputsNode.inp)
+    return _finish(graph, source, result)
+
+
+def widePinsGraph(graph, scale):
+    """Chain of nodes with many pins. Only first pins of neighbour nodes are connected, so cost of
+    pin count is measured apart from cost of dense connections.
+    Has :attr:`~uflow.Benchmarks.BenchmarkPackage.benchWide.PIN_COUNT` times more pins than scale
+    """
+    first = spawnNode(graph, "benchWide")
+    last = first
+    for _ in range(max(scale // 2, 2) - 1):
+        node = spawnNode(graph, "benchWide")
+        connectPins(last.results[0], node.values[0])
+        last = node
+    return _finish(graph, first.values[0], last.results[0])
+
+
+#: Graph generators by shape name
+GENERATORS = {
+    "chain": chainGraph,
+    "fan": fanGraph,
+    "diamond": diamondGraph,
+    "compound": nestedCompoundGraph,
+    "widePins": widePinsGraph,
+}
+
+
+def pinCount(graph):
+    """Returns number of pins of all nodes in graph manager of graph"""
+    return sum(len(node.pins) for node in graph.graphManager.getAllNodes())
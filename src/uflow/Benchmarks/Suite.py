@@ -0,0 +1,423 @@
+"""
+.. sidebar:: **Suite.py**
+
+    Benchmark cases, runner and baseline comparison.
+
+Every case builds fresh graph of given scale in :meth:`BenchmarkCase.setup` and times single
+:meth:`BenchmarkCase.run` call. Work done by run is proportional to scale, so time of linear
+operation grows proportionally too. Growth exponent is fitted over all measured scales,
+values noticeably above one mean super-linear behaviour.
+
+Results can be saved as baseline and later runs compared against it.
+"""
+
+import gc
+import os
+import json
+import math
+import time
+import atexit
+import shutil
+import platform
+import tempfile
+
+from uflow.Core.Common import *
+from uflow.Core.GraphManager import GraphManagerSingleton
+from uflow.Benchmarks.BenchmarkPackage import registerBenchmarkPackage
+from uflow.Core.BulkLoad import readGraphFile
+from uflow.Core.GraphContainer import CONTAINER_EXTENSION, writeGraphFile
+from uflow.Benchmarks.Generators import GENERATORS, spawnNode
+
+DEFAULT_SCALES = (100, 200, 400)
+#: Growth exponent above which case is reported as super-linear
+SUPERLINEAR_EXPONENT = 1.3
+#: Relative slowdown against baseline reported as regression
+DEFAULT_TOLERANCE = 0.25
+
+
+class BenchmarkCase(object):
+    """Single measured operation
+
+    :param name: Case name, ``<group>.<operation>``
+    :type name: str
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def setup(self, manager, scale):
+        """Prepares state for :meth:`run`. Not timed
+
+        :param manager: Empty graph manager
+        :type manager: :class:`~uflow.Core.GraphManager.GraphManager`
+        :param scale: Approximate number of nodes
+        :type scale: int
+        :returns: Context passed to :meth:`run`
+        """
+        return None
+
+    def run(self, manager, context):
+        """Measured operation"""
+        raise NotImplementedError()
+
+
+class DeserializeCase(BenchmarkCase):
+    def __init__(self, shape):
+        super(DeserializeCase, self).__init__("{}.deserialize".format(shape))
+        self.shape = shape
+
+    def setup(self, manager, scale):
+        GENERATORS[self.shape](manager.activeGraph(), scale)
+        data = manager.serialize()
+        manager.clear()
+        return data
+
+    def run(self, manager, data):
+        manager.deserialize(data)
+
+
+class SerializeCase(BenchmarkCase):
+    def __init__(self, shape):
+        super(SerializeCase, self).__init__("{}.serialize".format(shape))
+        self.shape = shape
+
+    def setup(self, manager, scale):
+        GENERATORS[self.shape](manager.activeGraph(), scale)
+
+    def run(self, manager, context):
+        manager.serialize()
+
+
+_scratchDirectory = None
+
+
+def scratchFile(name):
+    """Returns path in temporary directory, which is removed at exit
+
+    :rtype: str
+    """
+    global _scratchDirectory
+    if _scratchDirectory is None:
+        _scratchDirectory = tempfile.mkdtemp(prefix="uflowBench")
+        atexit.register(shutil.rmtree, _scratchDirectory, True)
+    return os.path.join(_scratchDirectory, name)
+
+
+class SaveFileCase(BenchmarkCase):
+    """Serializes graph and writes it to json file or container"""
+
+    operation = "save"
+
+    def __init__(self, shape, bContainer):
+        super(SaveFileCase, self).__init__(
+            "{0}.{1}{2}".format(shape, self.operation, "Container" if bContainer else "Json")
+        )
+        self.shape = shape
+        self.filePath = scratchFile(
+            self.name + (CONTAINER_EXTENSION if bContainer else ".pygraph")
+        )
+
+    def setup(self, manager, scale):
+        GENERATORS[self.shape](manager.activeGraph(), scale)
+
+    def run(self, manager, context):
+        writeGraphFile(self.filePath, manager.serialize())
+
+
+class LoadFileCase(SaveFileCase):
+    """Reads graph from json file or container and deserializes it"""
+
+    operation = "load"
+
+    def setup(self, manager, scale):
+        GENERATORS[self.shape](manager.activeGraph(), scale)
+        writeGraphFile(self.filePath, manager.serialize())
+        manager.clear()
+
+    def run(self, manager, context):
+        manager.deserialize(readGraphFile(self.filePath))
+
+
+class PullColdCase(BenchmarkCase):
+    """Evaluates whole graph from sink, right after source value changed"""
+
+    def __init__(self, shape):
+        super(PullColdCase, self).__init__("{}.pullCold".format(shape))
+        self.shape = shape
+
+    def setup(self, manager, scale):
+        synthetic = GENERATORS[self.shape](manager.activeGraph(), scale)
+        synthetic.sink.compute()
+        synthetic.source.setData(1.0)
+        return synthetic
+
+    def run(self, manager, synthetic):
+        synthetic.sink.compute()
+
+
+class PullWarmCase(BenchmarkCase):
+    """Pulls value from sink when every node is already clean"""
+
+    def __init__(self, shape):
+        super(PullWarmCase, self).__init__("{}.pullWarm".format(shape))
+        self.shape = shape
+
+    def setup(self, manager, scale):
+        synthetic = GENERATORS[self.shape](manager.activeGraph(), scale)
+        synthetic.sink.compute()
+        return synthetic
+
+    def run(self, manager, synthetic):
+        synthetic.sink.compute()
+
+
+class PushCase(BenchmarkCase):
+    """Dirty propagation from source through whole graph"""
+
+    def __init__(self, shape):
+        super(PushCase, self).__init__("{}.push".format(shape))
+        self.shape = shape
+
+    def setup(self, manager, scale):
+        synthetic = GENERATORS[self.shape](manager.activeGraph(), scale)
+        synthetic.sink.compute()
+        return synthetic
+
+    def run(self, manager, synthetic):
+        push(synthetic.source)
+
+
+class ConnectPinsCase(BenchmarkCase):
+    """Connects ``scale`` pairs of nodes"""
+
+    def __init__(self):
+        super(ConnectPinsCase, self).__init__("pins.connectPins")
+
+    def setup(self, manager, scale):
+        graph = manager.activeGraph()
+        return [
+            (spawnNode(graph, "benchAdd").out, spawnNode(graph, "benchAdd").a)
+            for _ in range(max(scale // 2, 1))
+        ]
+
+    def run(self, manager, pairs):
+        for src, dst in pairs:
+            connectPins(src, dst)
+
+
+class CanConnectPinsCase(ConnectPinsCase):
+    """Checks ``scale`` pairs of pins whether they can be connected"""
+
+    def __init__(self):
+        BenchmarkCase.__init__(self, "pins.canConnectPins")
+
+    def run(self, manager, pairs):
+        for src, dst in pairs:
+            canConnectPins(src, dst)
+
+
+class UniqNodeNameCase(BenchmarkCase):
+    """Generates ``scale`` unique node names in graph of ``scale`` nodes"""
+
+    def __init__(self):
+        super(UniqNodeNameCase, self).__init__("names.getUniqNodeName")
+
+    def setup(self, manager, scale):
+        GENERATORS["chain"](manager.activeGraph(), scale)
+        return scale
+
+    def run(self, manager, scale):
+        for _ in range(scale):
+            manager.getUniqNodeName("benchAdd")
+
+
+def defaultCases():
+    """Returns all benchmark cases
+
+    :rtype: list(:class:`BenchmarkCase`)
+    """
+    cases = []
+    for shape in GENERATORS:
+        cases.append(DeserializeCase(shape))
+        cases.append(SerializeCase(shape))
+        for bContainer in (False, True):
+            cases.append(SaveFileCase(shape, bContainer))
+            cases.append(LoadFileCase(shape, bContainer))
+        cases.append(PullColdCase(shape))
+        cases.append(PullWarmCase(shape))
+        cases.append(PushCase(shape))
+    cases.append(ConnectPinsCase())
+    cases.append(CanConnectPinsCase())
+    cases.append(UniqNodeNameCase())
+    return cases
+
+
+def growthExponent(timings):
+    """Fits ``time ~ scale ** k`` and returns k
+
+    :param timings: Seconds by scale
+    :type timings: dict
+    :rtype: float or None
+    """
+    points = [
+        (math.log(scale), math.log(seconds))
+        for scale, seconds in timings.items()
+        if seconds > 0
+    ]
+    if len(points) < 2:
+        return None
+    meanX = sum(x for x, _ in points) / len(points)
+    meanY = sum(y for _, y in points) / len(points)
+    variance = sum((x - meanX) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+    return sum((x - meanX) * (y - meanY) for x, y in points) / variance
+
+
+class BenchmarkSuite(object):
+    """Runs benchmark cases headless over graph manager singleton
+
+    :param scales: Graph sizes every case is measured with
+    :type scales: list(int)
+    :param repeat: Number of measurements per case and scale, fastest is kept
+    :type repeat: int
+    :param cases: Cases to run, all by default
+    :type cases: list(:class:`BenchmarkCase`) or None
+    """
+
+    def __init__(self, scales=DEFAULT_SCALES, repeat=3, cases=None):
+        registerBenchmarkPackage()
+        self.scales = sorted(scales)
+        self.repeat = max(repeat, 1)
+        self.cases = defaultCases() if cases is None else cases
+        self.results = {}
+
+    def filter(self, patterns):
+        """Keeps cases which name contains any of patterns"""
+        self.cases = [
+            case
+            for case in self.cases
+            if any(pattern in case.name for pattern in patterns)
+        ]
+
+    def measure(self, case, scale):
+        """Returns fastest of :attr:`repeat` run times of case in seconds
+
+        :rtype: float
+        """
+        manager = GraphManagerSingleton().get()
+        best = None
+        for _ in range(self.repeat):
+            manager.clear()
+            context = case.setup(manager, scale)
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                case.run(manager, context)
+                elapsed = time.perf_counter() - start
+            finally:
+                gc.enable()
+            if best is None or elapsed < best:
+                best = elapsed
+        manager.clear()
+        return best
+
+    def run(self, progress=None):
+        """Measures all cases at all scales
+
+        :param progress: Called with case name, scale and seconds after every measurement
+        :type progress: callable or None
+        :returns: Seconds by scale by case name
+        :rtype: dict
+        """
+        for case in self.cases:
+            timings = self.results.setdefault(case.name, {})
+            for scale in self.scales:
+                timings[scale] = self.measure(case, scale)
+                if progress is not None:
+                    progress(case.name, scale, timings[scale])
+        return self.results
+
+    def save(self, filePath):
+        """Writes results to baseline json file"""
+        with open(filePath, "w") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "repeat": self.repeat,
+                    "results": {
+                        name: {str(scale): seconds for scale, seconds in timings.items()}
+                        for name, timings in self.results.items()
+                    },
+                },
+                f,
+                indent=2,
+            )
+
+    def report(self, baseline=None, tolerance=DEFAULT_TOLERANCE):
+        """Returns table of results with growth exponents and comparison against baseline
+
+        :param baseline: Results loaded by :func:`loadBaseline`
+        :type baseline: dict or None
+        :param tolerance: Relative slowdown reported as regression
+        :type tolerance: float
+        :returns: Report text and list of regressed case names
+        :rtype: tuple(str, list(str))
+        """
+        lines = []
+        header = "{0:<28}".format("case")
+        for scale in self.scales:
+            header += " {0:>10}".format(scale)
+        header += " {0:>7}".format("growth")
+        if baseline is not None:
+            header += " {0:>9}".format("vs base")
+        lines.append(header)
+
+        regressions = []
+        for name, timings in self.results.items():
+            line = "{0:<28}".format(name)
+            for scale in self.scales:
+                line += " {0:>10.3f}".format(timings[scale] * 1000.0)
+            exponent = growthExponent(timings)
+            line += " {0:>7}".format("-" if exponent is None else "{0:.2f}".format(exponent))
+            notes = []
+            if exponent is not None and exponent > SUPERLINEAR_EXPONENT:
+                notes.append("super-linear")
+            if baseline is not None:
+                ratios = [
+                    timings[scale] / baseline[name][scale]
+                    for scale in self.scales
+                    if baseline.get(name, {}).get(scale)
+                ]
+                if ratios:
+                    # geometric mean, so single noisy scale does not dominate
+                    ratio = math.exp(sum(math.log(r) for r in ratios) / len(ratios))
+                    line += " {0:>8.2f}x".format(ratio)
+                    if ratio > 1.0 + tolerance:
+                        notes.append("REGRESSION")
+                        regressions.append(name)
+                    elif ratio < 1.0 / (1.0 + tolerance):
+                        notes.append("improved")
+                else:
+                    line += " {0:>9}".format("-")
+            if notes:
+                line += "  " + ", ".join(notes)
+            lines.append(line)
+        lines.append("times in milliseconds, growth is exponent k of time ~ scale ** k")
+        return "\n".join(lines), regressions
+
+
+def loadBaseline(filePath):
+    """Reads baseline saved by :meth:`BenchmarkSuite.save`
+
+    :returns: Seconds by scale by case name
+    :rtype: dict
+    """
+    with open(filePath, "r") as f:
+        data = json.load(f)
+    return {
+        name: {int(scale): seconds for scale, seconds in timings.items()}
+        for name, timings in data["results"].items()
+    }
@@ -0,0 +1,16 @@
+"""Headless benchmarks of core graph operations.
+
+Run with ``python -m uflow.Benchmarks``. See :mod:`uflow.Benchmarks.Suite`.
+"""
+
+from uflow.Benchmarks.Suite import BenchmarkSuite, BenchmarkCase, loadBaseline
+from uflow.Benchmarks.Generators import GENERATORS, SyntheticGraph
+
+
+__all__ = [
+    "BenchmarkSuite",
+    "BenchmarkCase",
+    "loadBaseline",
+    "GENERATORS",
+    "SyntheticGraph",
+]
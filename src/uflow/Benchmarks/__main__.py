@@ -0,0 +1,65 @@
+import sys
+import argparse
+
+from uflow.Benchmarks.Suite import (
+    BenchmarkSuite,
+    loadBaseline,
+    DEFAULT_SCALES,
+    DEFAULT_TOLERANCE,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="uflow core benchmarks", allow_abbrev=False
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=int,
+        default=list(DEFAULT_SCALES),
+        help="Graph sizes in nodes",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Measurements per case, fastest is kept"
+    )
+    parser.add_argument(
+        "--filter",
+        nargs="+",
+        help="Run only cases which name contains any of given strings",
+    )
+    parser.add_argument("--list", action="store_true", help="List cases and exit")
+    parser.add_argument("--save", help="Write results to baseline json file")
+    parser.add_argument("--baseline", help="Compare results against baseline json file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative slowdown against baseline reported as regression",
+    )
+    args = parser.parse_args(argv)
+
+    suite = BenchmarkSuite(scales=args.scales, repeat=args.repeat)
+    if args.filter:
+        suite.filter(args.filter)
+    if args.list:
+        for case in suite.cases:
+            print(case.name)
+        return 0
+
+    def progress(name, scale, seconds):
+        sys.stderr.write(
+            "{0:<28} {1:>8} {2:>10.3f} ms\n".format(name, scale, seconds * 1000.0)
+        )
+
+    suite.run(progress)
+    baseline = loadBaseline(args.baseline) if args.baseline else None
+    text, regressions = suite.report(baseline, args.tolerance)
+    print(text)
+    if args.save:
+        suite.save(args.save)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""
+.. sidebar:: **BatchEvaluation.py**
+
+    Evaluates graph data path for many input records at once.
+
+Every output pin of ``graphInputs`` nodes accepts a column of values (list, numpy array or dataframe column)
+instead of a scalar. Nodes between ``graphInputs`` and ``graphOutputs`` are computed once per batch:
+
+* Function based nodes declaring ``meta={NodeMeta.VECTORIZED: True}`` receive whole columns as numpy arrays
+  in one call and should return column (or scalar, which is broadcast)
+* Other function based nodes are called directly once per row, without touching pins
+* Class based nodes are computed once per row with input values supplied by temporary evaluation engine.
+  Values of their output pins are collected after every row, then pins and downstream graph get their
+  previous values back
+* Compound nodes evaluate their subgraph for the whole batch
+
+Columns produced by row loops are stored as numpy arrays, so vectorized nodes can consume them.
+
+Example:
+::
+
+    root = GraphManagerSingleton().get().findRootGraph()
+    frame = evaluateBatch(root, {"a": numpy.arange(10000), "b": 2.0})
+
+Result is :class:`pandas.DataFrame` keyed by ``graphOutputs`` pin names, or dict of lists if pandas is not installed.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from uflow.Core.Interfaces import IEvaluationEngine
+from uflow.Core.EvaluationEngine import EvaluationEngine
+
+
+class _Column(object):
+    """Per row values of output pin"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def row(self, index):
+        return self.values[index]
+
+
+class _Scalar(object):
+    """Same value for every row"""
+
+    def __init__(self, value):
+        self.values = value
+
+    def row(self, index):
+        return self.values
+
+
+class BatchEvaluationEngine_Impl(IEvaluationEngine):
+    """Evaluation engine used while class based nodes are computed for a single row
+
+    Returns values of current row for pins evaluated by batch and current data for others.
+    """
+
+    def __init__(self, fallback):
+        super(BatchEvaluationEngine_Impl, self).__init__()
+        self.fallback = fallback
+        self.rowValues = {}
+
+    def getPinData(self, pin):
+        if pin in self.rowValues:
+            return self.rowValues[pin]
+        for source in pin.affected_by:
+            if source in self.rowValues:
+                return self.rowValues[source]
+        return self.fallback.getPinData(pin)
+
+
+def _rowCount(inputs):
+    count = None
+    for name, values in inputs.items():
+        if isinstance(values, _Column):
+            if count is not None and len(values.values) != count:
+                raise ValueError(
+                    "Input column '{0}' has {1} rows, expected {2}".format(
+                        name, len(values.values), count
+                    )
+                )
+            count = len(values.values)
+    return 1 if count is None else count
+
+
+def _isColumn(value):
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return value.ndim > 0
+    if pandas is not None and isinstance(value, (pandas.Series, pandas.Index)):
+        return True
+    return isinstance(value, (list, tuple))
+
+
+def _asColumnValues(value):
+    if pandas is not None and isinstance(value, (pandas.Series, pandas.Index)):
+        return value.to_numpy()
+    return value
+
+
+def _asArray(values):
+    """Converts column to one dimensional numpy array. Rows which are sequences are kept as objects"""
+    if numpy is None or isinstance(values, numpy.ndarray):
+        return values
+    try:
+        array = numpy.asarray(values)
+    except ValueError:
+        # rows of different lengths
+        array = None
+    if array is None or array.ndim != 1:
+        array = numpy.empty(len(values), dtype=object)
+        for index, value in enumerate(values):
+            array[index] = value
+    return array
+
+
+def _batchUpstreamNodes(graphOutputNodes):
+    """Returns nodes graph outputs depend on, in evaluation order"""
+    order = []
+    visited = set()
+    for outputNode in graphOutputNodes:
+        stack = [(outputNode, False)]
+        while stack:
+            node, bExpanded = stack.pop()
+            if bExpanded:
+                order.append(node)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append((node, True))
+            for pin in node.inputs.values():
+                if pin.isExec():
+                    continue
+                for source in pin.affected_by:
+                    upstream = source.owningNode()
+                    if upstream not in visited:
+                        stack.append((upstream, False))
+    return order
+
+
+class BatchEvaluator(object):
+    """Evaluates graph for columns of input values
+
+    :param graph: Graph containing ``graphInputs`` and ``graphOutputs`` nodes
+    :type graph: :class:`~uflow.Core.GraphBase.GraphBase`
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.graphInputNodes = graph.getNodesList(classNameFilters=["graphInputs"])
+        self.graphOutputNodes = graph.getNodesList(classNameFilters=["graphOutputs"])
+        if len(self.graphOutputNodes) == 0:
+            raise ValueError(
+                "Graph '{}' has no graphOutputs node".format(graph.name)
+            )
+        self.nodes = [
+            node
+            for node in _batchUpstreamNodes(self.graphOutputNodes)
+            if node.__class__.__name__ not in ("graphInputs", "graphOutputs")
+        ]
+        for node in self.nodes:
+            if node.isCallable():
+                raise ValueError(
+                    "Batch evaluation supports data nodes only. '{}' is callable".format(
+                        node.getName()
+                    )
+                )
+
+    def _graphInputPins(self):
+        return [
+            pin
+            for node in self.graphInputNodes
+            for pin in node.outputs.values()
+            if not pin.isExec()
+        ]
+
+    def _inputValue(self, pin, values):
+        for source in pin.affected_by:
+            if source in values:
+                return values[source]
+        return _Scalar(pin.currentData())
+
+    def evaluate(self, inputs):
+        """Evaluates graph
+
+        :param inputs: Columns or scalars by ``graphInputs`` pin name
+        :type inputs: dict or :class:`pandas.DataFrame`
+        :returns: Columns by ``graphOutputs`` pin name
+        :rtype: :class:`pandas.DataFrame` or dict(str, list)
+        """
+        if pandas is not None and isinstance(inputs, pandas.DataFrame):
+            inputs = {name: inputs[name] for name in inputs.columns}
+
+        values = {}
+        for pin in self._graphInputPins():
+            if pin.name in inputs:
+                value = inputs[pin.name]
+                values[pin] = (
+                    _Column(_asColumnValues(value))
+                    if _isColumn(value)
+                    else _Scalar(value)
+                )
+            else:
+                values[pin] = _Scalar(pin.currentData())
+        rowCount = _rowCount(values)
+
+        defaultImpl = EvaluationEngine().getImpl()
+        batchImpl = BatchEvaluationEngine_Impl(defaultImpl)
+        EvaluationEngine().setImpl(batchImpl)
+        try:
+            self._computeNodes(values, rowCount, batchImpl)
+        finally:
+            EvaluationEngine().setImpl(defaultImpl)
+
+        result = {}
+        for node in self.graphOutputNodes:
+            for pin in node.inputs.values():
+                if pin.isExec():
+                    continue
+                value = self._inputValue(pin, values)
+                result[pin.name] = [value.row(i) for i in range(rowCount)]
+        if pandas is None:
+            return result
+        return pandas.DataFrame(result)
+
+    def _computeNodes(self, values, rowCount, batchImpl):
+        for node in self.nodes:
+            function = getattr(node, "_function", None)
+            if function is not None and node.bVectorized:
+                self._computeVectorized(node, function, values)
+            elif function is not None:
+                self._computeFunctionRows(node, function, values, rowCount)
+            elif node.isCompoundNode:
+                self._computeCompound(node, values, rowCount, batchImpl)
+            else:
+                self._computeRows(node, batchImpl, values, rowCount)
+
+    def _valuePins(self, node):
+        inputPins = [p for p in node.inputs.values() if not p.isExec()]
+        outputPins = [p for p in node.outputs.values() if not p.isExec()]
+        return inputPins, outputPins
+
+    def _computeVectorized(self, node, function, values):
+        inputPins, outputPins = self._valuePins(node)
+        refValues = {}
+        kwargs = {}
+        for pin in inputPins:
+            value = self._inputValue(pin, values)
+            kwargs[pin.name] = (
+                _asArray(value.values) if isinstance(value, _Column) else value.values
+            )
+        for pin in outputPins:
+            if pin.name != "out":
+                kwargs[pin.name] = lambda v, name=pin.name: refValues.__setitem__(
+                    name, v
+                )
+        function.owningNode = node
+        refValues["out"] = function(**kwargs)
+        for pin in outputPins:
+            value = refValues.get(pin.name)
+            values[pin] = _Column(value) if _isColumn(value) else _Scalar(value)
+
+    def _computeFunctionRows(self, node, function, values, rowCount):
+        inputPins, outputPins = self._valuePins(node)
+        sources = [(p.name, self._inputValue(p, values)) for p in inputPins]
+        columns = {p.name: [] for p in outputPins}
+        refValues = {}
+        kwargs = {}
+        for pin in outputPins:
+            if pin.name != "out":
+                kwargs[pin.name] = lambda v, name=pin.name: refValues.__setitem__(
+                    name, v
+                )
+        function.owningNode = node
+        for index in range(rowCount):
+            # reference outputs not set in this row must not repeat previous row
+            refValues.clear()
+            for name, source in sources:
+                kwargs[name] = source.row(index)
+            refValues["out"] = function(**kwargs)
+            for name, column in columns.items():
+                column.append(refValues.get(name))
+        for pin in outputPins:
+            values[pin] = _Column(_asArray(columns[pin.name]))
+
+    def _computeRows(self, node, batchImpl, values, rowCount):
+        inputPins, outputPins = self._valuePins(node)
+        sources = [(p, self._inputValue(p, values)) for p in inputPins]
+        columns = {p: [] for p in outputPins}
+        previousValues = {p: p.currentData() for p in outputPins}
+        try:
+            for index in range(rowCount):
+                batchImpl.rowValues = {
+                    pin: source.row(index) for pin, source in sources
+                }
+                node.compute()
+                for pin, column in columns.items():
+                    column.append(pin.currentData())
+        finally:
+            batchImpl.rowValues = {}
+            for pin, value in previousValues.items():
+                pin.setData(value)
+        for pin in outputPins:
+            values[pin] = _Column(_asArray(columns[pin]))
+
+    def _computeCompound(self, node, values, rowCount, batchImpl):
+        inputPins, outputPins = self._valuePins(node)
+        subgraph = BatchEvaluator(node.rawGraph)
+        innerValues = {}
+        for pin in subgraph._graphInputPins():
+            innerValues[pin] = _Scalar(pin.currentData())
+        for pin in inputPins:
+            innerValues[node.inputsMap[pin]] = self._inputValue(pin, values)
+        subgraph._computeNodes(innerValues, rowCount, batchImpl)
+        for pin in outputPins:
+            values[pin] = subgraph._inputValue(node.outputsMap[pin], innerValues)
+
+
+def evaluateBatch(graph, inputs):
+    """Evaluates graph data path for many input records
+
+    :param graph: Graph containing ``graphInputs`` and ``graphOutputs`` nodes
+    :type graph: :class:`~uflow.Core.GraphBase.GraphBase`
+    :param inputs: Columns or scalars by ``graphInputs`` pin name
+    :type inputs: dict or :class:`pandas.DataFrame`
+    :returns: Columns by ``graphOutputs`` pin name
+    :rtype: :class:`pandas.DataFrame` or dict(str, list)
+    """
+    return BatchEvaluator(graph).evaluate(inputs)
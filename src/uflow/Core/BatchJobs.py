@@ -0,0 +1,423 @@
+"""
+.. sidebar:: **BatchJobs.py**
+
+    Runs one graph over many input records in a pool of worker processes.
+
+Every worker initializes packages and loads graph once, then executes it for records sent by main process
+using :class:`~uflow.Core.GraphExecutor.GraphExecutor`.
+
+Input records are read from JSON lines file (one object per line) or CSV file with header.
+CSV values are parsed as json when possible, so ``1.5`` becomes float and ``true`` becomes bool. Empty cells
+leave input at its default value.
+
+Results are written in input order as soon as they are ready, to JSON lines:
+::
+
+    {"index": 0, "status": "ok", "attempts": 1, "outputs": {"sum": 3.0}}
+    {"index": 1, "status": "failed", "attempts": 2, "error": "..."}
+
+or to CSV with ``index``, ``status``, ``attempts``, one column per ``graphOutputs`` pin and ``error`` columns.
+
+Failed records are retried on freshly loaded graph and do not affect other records.
+
+Example:
+::
+
+    summary = runBatch("sum.pygraph", "inputs.jsonl", "results.csv", workers=8)
+"""
+
+import os
+import csv
+import json
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from uflow.Core.Common import *
+from uflow.Core.BulkLoad import readGraphFile
+
+CSV_EXTENSION = ".csv"
+
+_executor = None
+
+
+def readRecords(filePath):
+    """Yields input records from JSON lines or CSV file
+
+    :param filePath: Path to ``.jsonl`` or ``.csv`` file
+    :type filePath: str
+    :rtype: generator(dict)
+    """
+    with open(filePath, "r", newline="") as f:
+        if filePath.lower().endswith(CSV_EXTENSION):
+            for row in csv.DictReader(f):
+                record = {}
+                for name, value in row.items():
+                    if value is None or value == "":
+                        continue
+                    try:
+                        record[name] = json.loads(value)
+                    except ValueError:
+                        record[name] = value
+                yield record
+        else:
+            for lineNumber, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(
+                        "{0}:{1} record is not an object".format(filePath, lineNumber)
+                    )
+                yield record
+
+
+def graphOutputNames(data):
+    """Returns names of root graph ``graphOutputs`` value pins in serialized graph
+
+    :param data: Serialized graph
+    :type data: dict
+    :rtype: list(str)
+    """
+    names = []
+    for node in data["nodes"]:
+        if node["type"] == "graphOutputs":
+            for inPin in node["inputs"]:
+                if inPin["dataType"] != "ExecPin" and inPin["name"] not in names:
+                    names.append(inPin["name"])
+    return names
+
+
+def _initializeWorker(graphPath, additionalPackageLocations, releaseIntermediates=False):
+    """Runs once in every worker process"""
+    global _executor
+    from uflow import GET_PACKAGES, INITIALIZE
+    from uflow.Core.GraphManager import GraphManagerSingleton
+    from uflow.Core.GraphExecutor import GraphExecutor
+
+    if len(GET_PACKAGES()) == 0:
+        INITIALIZE(additionalPackageLocations, headless=True)
+    # executor is the only graph in worker, so it uses process wide manager
+    _executor = GraphExecutor.fromFile(
+        graphPath, GraphManagerSingleton().get(), releaseIntermediates
+    )
+
+
+def _runRecord(record, retries):
+    """Worker side entry point
+
+    :param record: Input values by ``graphInputs`` pin name
+    :type record: dict
+    :param retries: How many times failed record is executed again
+    :type retries: int
+    :returns: Result entry without index
+    :rtype: dict
+    """
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            outputs = _executor.encodeOutputs(_executor.execute(record))
+            return {"status": "ok", "attempts": attempts, "outputs": outputs}
+        except Exception as e:
+            error = "{0}: {1}".format(type(e).__name__, e)
+            # failed run may leave nodes in any state
+            _executor.reload()
+            if attempts > retries:
+                return {"status": "failed", "attempts": attempts, "error": error}
+
+
+def _resolvedFuture(result):
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _isInterrupted(future):
+    """Whether record was not executed because its worker pool broke"""
+    if future is None or future.cancelled() or not future.done():
+        return True
+    return isinstance(future.exception(), BrokenProcessPool)
+
+
+class _JsonLinesWriter(object):
+    def __init__(self, stream, outputNames):
+        self.stream = stream
+
+    def write(self, result):
+        self.stream.write(json.dumps(result) + "\n")
+        self.stream.flush()
+
+
+class _CsvWriter(object):
+    def __init__(self, stream, outputNames):
+        self.stream = stream
+        self.outputNames = outputNames
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["index", "status", "attempts"] + outputNames + ["error"])
+
+    def write(self, result):
+        outputs = result.get("outputs", {})
+        row = [result["index"], result["status"], result["attempts"]]
+        for name in self.outputNames:
+            value = outputs.get(name, "")
+            row.append(value if isinstance(value, str) else json.dumps(value))
+        row.append(result.get("error", ""))
+        self.writer.writerow(row)
+        self.stream.flush()
+
+
+class BatchSummary(object):
+    """Counters of finished batch"""
+
+    def __init__(self):
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.retried = 0
+        self.workerCrashes = 0
+        self.wallTime = 0.0
+
+    def add(self, result):
+        self.total += 1
+        if result["status"] == "ok":
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        if result["attempts"] > 1:
+            self.retried += 1
+
+    def report(self):
+        """Returns human readable summary
+
+        :rtype: str
+        """
+        rate = self.total / self.wallTime if self.wallTime > 0 else 0.0
+        return "{0} records in {1:.3f} s ({2:.1f}/s): {3} ok, {4} failed, {5} retried, {6} worker crashes".format(
+            self.total,
+            self.wallTime,
+            rate,
+            self.succeeded,
+            self.failed,
+            self.retried,
+            self.workerCrashes,
+        )
+
+
+class BatchRunner(object):
+    """Executes graph for records using worker processes
+
+    :param graphPath: Path to ``.pygraph`` file
+    :type graphPath: str
+    :param workers: Number of worker processes. If 1, records are executed in current process
+    :type workers: int
+    :param retries: How many times failed record is executed again
+    :type retries: int
+    :param additionalPackageLocations: Package locations passed to :func:`~uflow.INITIALIZE` in workers
+    :type additionalPackageLocations: list(str) or None
+    :param context: Multiprocessing start method
+    :type context: str
+    :param releaseIntermediates: Free intermediate values as soon as they are consumed
+    :type releaseIntermediates: bool
+    """
+
+    def __init__(
+        self,
+        graphPath,
+        workers=None,
+        retries=1,
+        additionalPackageLocations=None,
+        context="spawn",
+        releaseIntermediates=False,
+    ):
+        self.graphPath = graphPath
+        self.workers = workers or os.cpu_count() or 1
+        self.retries = retries
+        self.additionalPackageLocations = additionalPackageLocations or []
+        self.context = context
+        self.bReleaseIntermediates = releaseIntermediates
+        self.summary = BatchSummary()
+        self._pool = None
+
+    def _startPool(self):
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.context),
+            initializer=_initializeWorker,
+            initargs=(
+                self.graphPath,
+                self.additionalPackageLocations,
+                self.bReleaseIntermediates,
+            ),
+        )
+
+    def _stopPool(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def run(self, records, writer):
+        """Executes graph for every record and writes results in input order
+
+        :param records: Input records
+        :type records: iterable(dict)
+        :param writer: Object with ``write(result)`` method
+        :returns: Batch counters
+        :rtype: :class:`BatchSummary`
+        """
+        start = time.perf_counter()
+        self.summary = BatchSummary()
+        if self.workers == 1:
+            _initializeWorker(
+                self.graphPath,
+                self.additionalPackageLocations,
+                self.bReleaseIntermediates,
+            )
+            for index, record in enumerate(records):
+                self._finish(writer, index, _runRecord(record, self.retries))
+        else:
+            self._runPool(records, writer)
+        self.summary.wallTime = time.perf_counter() - start
+        return self.summary
+
+    def _finish(self, writer, index, result):
+        result = dict(index=index, **result)
+        self.summary.add(result)
+        writer.write(result)
+
+    def _submit(self, entry):
+        try:
+            entry[2] = self._pool.submit(_runRecord, entry[1], self.retries)
+        except BrokenProcessPool:
+            entry[2] = None
+
+    def _restartPool(self):
+        self.summary.workerCrashes += 1
+        self._stopPool()
+        self._startPool()
+
+    def _recover(self, pending):
+        """Restarts pool after worker died and resubmits records which were interrupted
+
+        Finished records keep their results. Records interrupted for the first time are resubmitted
+        together. Records interrupted again are executed one at a time, so only the record which
+        kills worker is failed.
+        """
+        self._restartPool()
+        interrupted = [entry for entry in pending if _isInterrupted(entry[2])]
+        for entry in interrupted:
+            if entry[3] > 0:
+                self._isolate(entry)
+        for entry in interrupted:
+            if entry[3] == 0:
+                entry[3] = 1
+                self._submit(entry)
+
+    def _isolate(self, entry):
+        """Executes record alone in pool until it finishes or kills worker more than retries times"""
+        while True:
+            self._submit(entry)
+            try:
+                if entry[2] is None:
+                    raise BrokenProcessPool()
+                entry[2].result()
+                return
+            except BrokenProcessPool:
+                self._restartPool()
+                entry[3] += 1
+                if entry[3] > self.retries:
+                    entry[2] = _resolvedFuture(
+                        {
+                            "status": "failed",
+                            "attempts": entry[3],
+                            "error": "Worker process terminated abruptly",
+                        }
+                    )
+                    return
+
+    def _runPool(self, records, writer):
+        # bounded window keeps memory flat for any number of records
+        window = self.workers * 4
+        pending = deque()
+        self._startPool()
+        try:
+            records = iter(enumerate(records))
+            bExhausted = False
+            while pending or not bExhausted:
+                while not bExhausted and len(pending) < window:
+                    try:
+                        index, record = next(records)
+                    except StopIteration:
+                        bExhausted = True
+                        break
+                    # index, record, future, number of times record was interrupted
+                    entry = [index, record, None, 0]
+                    self._submit(entry)
+                    pending.append(entry)
+
+                if not pending:
+                    break
+                index, record, future, _ = pending[0]
+                try:
+                    if future is None:
+                        raise BrokenProcessPool()
+                    result = future.result()
+                except BrokenProcessPool:
+                    self._recover(pending)
+                    continue
+                pending.popleft()
+                self._finish(writer, index, result)
+        finally:
+            self._stopPool()
+
+
+def runBatch(
+    graphPath,
+    inputsPath,
+    outputPath=None,
+    workers=None,
+    retries=1,
+    additionalPackageLocations=None,
+    releaseIntermediates=False,
+):
+    """Executes graph for every record of inputs file
+
+    :param graphPath: Path to ``.pygraph`` file
+    :type graphPath: str
+    :param inputsPath: Path to ``.jsonl`` or ``.csv`` records file
+    :type inputsPath: str
+    :param outputPath: Results file path. CSV is written if it ends with ``.csv``, JSON lines otherwise.
+        Results are written to stdout if not specified
+    :type outputPath: str or None
+    :param workers: Number of worker processes. Defaults to number of processors
+    :type workers: int or None
+    :param retries: How many times failed record is executed again
+    :type retries: int
+    :param additionalPackageLocations: Package locations passed to :func:`~uflow.INITIALIZE` in workers
+    :type additionalPackageLocations: list(str) or None
+    :param releaseIntermediates: Free intermediate values as soon as they are consumed
+    :type releaseIntermediates: bool
+    :rtype: :class:`BatchSummary`
+    """
+    outputNames = graphOutputNames(readGraphFile(graphPath))
+
+    runner = BatchRunner(
+        graphPath,
+        workers,
+        retries,
+        additionalPackageLocations,
+        releaseIntermediates=releaseIntermediates,
+    )
+    if outputPath is None:
+        return runner.run(
+            readRecords(inputsPath), _JsonLinesWriter(sys.stdout, outputNames)
+        )
+
+    writerClass = (
+        _CsvWriter if outputPath.lower().endswith(CSV_EXTENSION) else _JsonLinesWriter
+    )
+    with open(outputPath, "w", newline="") as stream:
+        return runner.run(readRecords(inputsPath), writerClass(stream, outputNames))
@@ -0,0 +1,297 @@
+"""
+.. sidebar:: **BlobStore.py**
+
+    Content addressed sidecar storage of large pin values.
+
+Pin and variable values are serialized with json encoders of their pin classes and inlined into graph
+data. Large arrays, images and dataframes make graph files, saving, loading and undo snapshots slow. Values
+estimated larger than :attr:`BlobStore.minBytes` are stored as blob files instead and graph data holds only
+reference with content hash:
+::
+
+    "value": {"$blob": "3f2a...", "format": "npy", "nbytes": 80000000}
+
+Numpy arrays are stored with :func:`numpy.save`, other values are pickled with protocol 5 and their buffers
+are written out of band. Blobs are written to session directory when graph is serialized, so undo snapshots
+share one file per distinct value. :func:`~uflow.Core.GraphContainer.writeGraphFile` copies blobs referenced by
+saved data to ``<graph name>.blobs`` directory next to graph file. Blob which is already there is skipped,
+so saving graph again writes only changed values.
+
+:func:`~uflow.Core.BulkLoad.readGraphFile` registers blob directory of loaded graph. Arrays are loaded memory
+mapped in copy on write mode and buffers of pickled values reference memory mapped file, so data is read
+from disk only when it is used.
+
+Content is hashed on every serialization, so values modified in place after they were serialized get new blobs.
+"""
+
+import os
+import json
+import atexit
+import shutil
+import hashlib
+import tempfile
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from uflow.Core.Common import *
+from uflow.Core.Memoization import estimateSize
+from uflow.Core.SpillManager import (
+    NUMPY_EXTENSION,
+    PICKLE_EXTENSION,
+    _isPlainArray,
+    _pickleParts,
+    _writePickle,
+    _readPickle,
+)
+
+#: Key of blob reference in serialized value
+BLOB_KEY = "$blob"
+#: Suffix of blob directory, added to graph file path without extension
+BLOB_DIRECTORY_SUFFIX = ".blobs"
+_EXTENSIONS = {"npy": NUMPY_EXTENSION, "pkl": PICKLE_EXTENSION}
+
+
+def blobDirectory(graphPath):
+    """Returns blob directory of graph file
+
+    :rtype: str
+    """
+    return os.path.splitext(os.path.abspath(graphPath))[0] + BLOB_DIRECTORY_SUFFIX
+
+
+def isBlobReference(serialized):
+    """Returns whether serialized value is blob reference
+
+    :rtype: bool
+    """
+    return isinstance(serialized, dict) and BLOB_KEY in serialized
+
+
+def iterBlobReferences(data):
+    """Yields blob references found in serialized graph data
+
+    :rtype: generator(dict)
+    """
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            if BLOB_KEY in item:
+                yield item
+                continue
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def encodeValue(value, encoderClass):
+    """Serializes pin or variable value to json string or to blob reference if value is large
+
+    :param value: Value to serialize
+    :param encoderClass: Json encoder of pin class
+    :rtype: str or dict
+    """
+    store = BlobStore()
+    if store.bEnabled and value is not None:
+        nbytes = estimateSize(value)
+        if nbytes >= store.minBytes:
+            reference = store.put(value, nbytes)
+            if reference is not None:
+                return reference
+    return json.dumps(value, cls=encoderClass)
+
+
+def decodeValue(serialized, decoderClass):
+    """Restores value serialized by :func:`encodeValue`
+
+    :param serialized: Json string or blob reference
+    :param decoderClass: Json decoder of pin class
+    """
+    if isBlobReference(serialized):
+        return BlobStore().get(serialized)
+    return json.loads(serialized, cls=decoderClass)
+
+
+@SingletonDecorator
+class BlobStore(object):
+    """Writes, finds and loads blobs
+
+    :var minBytes: Values with smaller estimated size are inlined to json
+    :var directories: Registered blob directories of loaded or saved graphs, searched for blobs
+    """
+
+    def __init__(self):
+        self.minBytes = 1024 * 1024
+        self.bEnabled = True
+        self.sessionDirectory = None
+        self.directories = []
+        self._lock = threading.Lock()
+        self.written = 0
+        self.deduplicated = 0
+        self.copied = 0
+        self.skipped = 0
+        self.loaded = 0
+
+    def configure(self, minBytes=None, bEnabled=None):
+        """Sets blob size threshold or disables blobs, values are inlined to json then
+
+        :param minBytes: Smallest value size stored as blob
+        :type minBytes: int or None
+        :param bEnabled: Whether large values are stored as blobs
+        :type bEnabled: bool or None
+        """
+        if minBytes is not None:
+            self.minBytes = minBytes
+        if bEnabled is not None:
+            self.bEnabled = bEnabled
+
+    def addDirectory(self, directory):
+        """Registers directory blobs are looked up in"""
+        directory = os.path.abspath(directory)
+        with self._lock:
+            if directory not in self.directories:
+                self.directories.append(directory)
+
+    def _session(self):
+        with self._lock:
+            if self.sessionDirectory is None:
+                self.sessionDirectory = tempfile.mkdtemp(prefix="uflowBlobs")
+                atexit.register(shutil.rmtree, self.sessionDirectory, True)
+            return self.sessionDirectory
+
+    @staticmethod
+    def fileName(reference):
+        return reference[BLOB_KEY] + _EXTENSIONS[reference["format"]]
+
+    def find(self, reference):
+        """Returns path of blob file or None if it is not in any known directory
+
+        :rtype: str or None
+        """
+        fileName = self.fileName(reference)
+        directories = list(self.directories)
+        if self.sessionDirectory is not None:
+            directories.insert(0, self.sessionDirectory)
+        for directory in directories:
+            filePath = os.path.join(directory, fileName)
+            if os.path.exists(filePath):
+                return filePath
+        return None
+
+    def put(self, value, nbytes=None):
+        """Stores value to session directory unless blob with the same content exists
+
+        :param nbytes: Known size of value, estimated if not given
+        :type nbytes: int or None
+        :returns: Blob reference or None if value can not be stored
+        :rtype: dict or None
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        parts = None
+        if _isPlainArray(value):
+            array = numpy.ascontiguousarray(value)
+            fileFormat = "npy"
+            digest.update("{0}{1}".format(array.dtype.str, array.shape).encode("utf-8"))
+            digest.update(memoryview(array).cast("B"))
+        else:
+            try:
+                parts = _pickleParts(value)
+            except Exception:
+                return None
+            fileFormat = "pkl"
+            digest.update(parts[0])
+            for raw in parts[1]:
+                digest.update(raw)
+        reference = {
+            BLOB_KEY: digest.hexdigest(),
+            "format": fileFormat,
+            "nbytes": nbytes if nbytes is not None else estimateSize(value),
+        }
+
+        if self.find(reference) is not None:
+            self.deduplicated += 1
+        else:
+            filePath = os.path.join(self._session(), self.fileName(reference))
+            # written under temporary name, so partially written blob is never found
+            tempPath = "{0}.{1}.tmp".format(filePath, threading.get_ident())
+            if fileFormat == "npy":
+                with open(tempPath, "wb") as f:
+                    numpy.save(f, array, allow_pickle=False)
+            else:
+                _writePickle(tempPath, value, parts)
+            os.replace(tempPath, filePath)
+            self.written += 1
+        return reference
+
+    def get(self, reference):
+        """Loads blob memory mapped
+
+        :param reference: Blob reference
+        :type reference: dict
+        :raises FileNotFoundError: If blob is not in any known directory
+        """
+        filePath = self.find(reference)
+        if filePath is None:
+            raise FileNotFoundError(
+                "Blob {0} not found in {1}".format(
+                    self.fileName(reference), self.directories
+                )
+            )
+        if reference["format"] == "npy":
+            value = numpy.load(filePath, mmap_mode="c")
+        else:
+            value = _readPickle(filePath, bMapped=True)
+        self.loaded += 1
+        return value
+
+    def export(self, data, graphPath):
+        """Copies blobs referenced by serialized graph to blob directory of graph file
+
+        :param data: Serialized graph
+        :type data: dict
+        :param graphPath: Graph file path
+        :type graphPath: str
+        :returns: Number of copied blobs
+        :rtype: int
+        """
+        directory = blobDirectory(graphPath)
+        copied = 0
+        for reference in iterBlobReferences(data):
+            target = os.path.join(directory, self.fileName(reference))
+            if os.path.exists(target):
+                self.skipped += 1
+                continue
+            source = self.find(reference)
+            if source is None:
+                raise FileNotFoundError(
+                    "Blob {0} not found".format(self.fileName(reference))
+                )
+            os.makedirs(directory, exist_ok=True)
+            tempPath = "{0}.{1}.tmp".format(target, threading.get_ident())
+            try:
+                os.link(source, tempPath)
+            except OSError:
+                shutil.copyfile(source, tempPath)
+            os.replace(tempPath, target)
+            copied += 1
+        self.copied += copied
+        if copied:
+            self.addDirectory(directory)
+        return copied
+
+    def stats(self):
+        """Returns blob counters
+
+        :rtype: dict
+        """
+        return {
+            "written": self.written,
+            "deduplicated": self.deduplicated,
+            "copied": self.copied,
+            "skipped": self.skipped,
+            "loaded": self.loaded,
+        }
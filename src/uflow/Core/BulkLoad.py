@@ -0,0 +1,199 @@
+"""
+.. sidebar:: **BulkLoad.py**
+
+    Deferred bookkeeping and phase timings of graph loading.
+
+Adding single node makes its name unique against every other node right away. Loaded nodes are already
+named, they can only collide with nodes which were in graph manager before. While :class:`BulkLoader` is
+active, :meth:`~uflow.Core.GraphBase.GraphBase.addNode` keeps names from serialized data. Names are
+made unique once all nodes of graph are added, before links are restored, and again when loader is deactivated.
+Links are restored by node uid, names from serialized data are used only as fallback.
+
+:meth:`~uflow.Core.GraphManager.GraphManager.deserialize` and
+:meth:`~uflow.Core.GraphBase.GraphBase.populateFromJson` always load in bulk. Loaders are nested safely,
+compound nodes restored inside loaded graph share outer loader.
+
+Time spent in every phase is collected to :class:`LoadTimings`, which is available as
+:attr:`~uflow.Core.GraphManager.GraphManager.lastLoadTimings` after loading. Phases are exclusive, nested
+phase is not counted to phase it was entered from.
+
+Example:
+::
+
+    timings = LoadTimings()
+    data = readGraphFile("graph.pygraph", timings)
+    graphManager.deserialize(data, timings)
+    print(timings.report())
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+#: Phases of graph loading, in order they are reported
+LOAD_PHASES = ("parse", "construct", "pinRestore", "postCreate", "connect", "finalize")
+
+
+class LoadTimings(object):
+    """Seconds spent in every loading phase
+
+    :var phases: Phase name to seconds
+    :vartype phases: :class:`~collections.OrderedDict`
+    """
+
+    def __init__(self):
+        self.phases = OrderedDict((name, 0.0) for name in LOAD_PHASES)
+        self.nodes = 0
+        self.links = 0
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        """Counts time spent inside of block to phase. Enclosing phase is paused meanwhile
+
+        :param name: Phase name
+        :type name: str
+        """
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self.phases[outer[0]] += now - outer[1]
+        entry = [name, now]
+        self._stack.append(entry)
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            self._stack.pop()
+            self.phases[name] = self.phases.get(name, 0.0) + now - entry[1]
+            if self._stack:
+                self._stack[-1][1] = now
+
+    @property
+    def total(self):
+        return sum(self.phases.values())
+
+    def asDict(self):
+        """Returns phases in milliseconds
+
+        :rtype: dict
+        """
+        result = OrderedDict(
+            (name, round(seconds * 1000.0, 3)) for name, seconds in self.phases.items()
+        )
+        result["total"] = round(self.total * 1000.0, 3)
+        result["nodes"] = self.nodes
+        result["links"] = self.links
+        return result
+
+    def report(self):
+        """Returns one line summary
+
+        :rtype: str
+        """
+        parts = [
+            "{0} {1:.1f}ms".format(name, seconds * 1000.0)
+            for name, seconds in self.phases.items()
+        ]
+        return "loaded {0} nodes, {1} links in {2:.1f}ms: {3}".format(
+            self.nodes, self.links, self.total * 1000.0, ", ".join(parts)
+        )
+
+
+def readGraphFile(filePath, timings=None):
+    """Reads serialized graph from json ``.pygraph`` file or from
+    :mod:`~uflow.Core.GraphContainer` file
+
+    Only root graph of container is decoded here, compound subgraphs are decoded when they are restored.
+    Blob directory of graph is registered in :class:`~uflow.Core.BlobStore.BlobStore`.
+
+    :param filePath: File to read
+    :type filePath: str
+    :param timings: Parse time is counted here if given
+    :type timings: :class:`LoadTimings` or None
+    :rtype: dict
+    """
+    from uflow.Core.GraphContainer import GraphContainer, isContainerFile
+    from uflow.Core.BlobStore import BlobStore, blobDirectory
+
+    if timings is None:
+        timings = LoadTimings()
+    directory = blobDirectory(filePath)
+    if os.path.isdir(directory):
+        BlobStore().addDirectory(directory)
+    with timings.phase("parse"):
+        if isContainerFile(filePath):
+            return GraphContainer(filePath).root()
+        with open(filePath, "r") as f:
+            return json.load(f)
+
+
+class BulkLoader(object):
+    """Defers node name uniqueness checks of graph manager while active
+
+    :param graphManager: Graph manager nodes are loaded into
+    :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager`
+    :param timings: Timings to fill. Loader which is nested in another one uses timings of outer loader
+    :type timings: :class:`LoadTimings` or None
+    """
+
+    def __init__(self, graphManager, timings=None):
+        self.graphManager = graphManager
+        self.timings = timings if timings is not None else LoadTimings()
+        self.addedNodes = []
+        self._outer = None
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.deactivate()
+
+    @property
+    def bNested(self):
+        return self._outer is not None
+
+    def activate(self):
+        outer = self.graphManager.bulkLoader
+        if outer is not None:
+            self._outer = outer
+            self.timings = outer.timings
+            return
+        self.graphManager.bulkLoader = self
+
+    def deactivate(self):
+        """Makes names of loaded nodes unique, unless loader is nested"""
+        if self.bNested:
+            return
+        try:
+            with self.timings.phase("finalize"):
+                self.finalize()
+        finally:
+            self.graphManager.bulkLoader = None
+            self.graphManager.lastLoadTimings = self.timings
+
+    def nodeAdded(self, node):
+        """Called by :meth:`~uflow.Core.GraphBase.GraphBase.addNode` instead of immediate bookkeeping"""
+        self.addedNodes.append(node)
+        self.timings.nodes += 1
+
+    def finalize(self):
+        self.makeNamesUnique()
+
+    def makeNamesUnique(self):
+        """Renames nodes added so far which collide with other nodes
+
+        Nodes which were in graph manager before loading keep their names.
+        """
+        names = self.graphManager.names.nodes
+        for node in self.addedNodes:
+            if node.graph is None or node.graph() is None:
+                # removed while loading
+                continue
+            # nodes which were in graph before loading keep their names
+            if names.count(node.name) > 1:
+                node.setName(names.uniqName(node.name))
+        self.addedNodes = []
@@ -11,6 +11,8 @@ import time
 import struct
 import weakref
 import sys
+import threading
+from contextlib import contextmanager
 
 from enum import IntEnum, Flag, auto
 
@@ -34,6 +36,96 @@ REF = "Reference"
 global GlobalVariables
 GlobalVariables = {}
 
+_threadState = threading.local()
+
+
+def isEvaluationWorkerThread():
+    """Whether current thread is a worker thread of parallel evaluation engine
+
+    Ui wrappers must not be touched from such threads.
+
+    :rtype: bool
+    """
+    return getattr(_threadState, "evaluationWorker", False)
+
+
+def markEvaluationWorkerThread():
+    """Marks current thread as evaluation worker thread
+
+    .. warning:: Used internally by evaluation engines
+    """
+    _threadState.evaluationWorker = True
+
+
+def sendSignal(signal, *args):
+    """Sends signal, or queues it when called from evaluation worker thread
+
+    Queued signals are sent from owning thread by evaluation engine,
+    see :func:`takeDeferredSignals`.
+
+    :param signal: Signal to send
+    :type signal: :class:`blinker.Signal`
+    """
+    if not isEvaluationWorkerThread():
+        signal.send(*args)
+        return
+    deferred = getattr(_threadState, "deferredSignals", None)
+    if deferred is None:
+        deferred = _threadState.deferredSignals = []
+    deferred.append((signal, args))
+
+
+def takeDeferredSignals():
+    """Returns and forgets signals queued on current thread by :func:`sendSignal`
+
+    .. warning:: Used internally by evaluation engines
+
+    :rtype: list(tuple(:class:`blinker.Signal`, tuple))
+    """
+    deferred = getattr(_threadState, "deferredSignals", None) or []
+    _threadState.deferredSignals = None
+    return deferred
+
+
+class InvalidationPass(object):
+    """State of dirty propagation shared by nested :meth:`~uflow.Core.PinBase.PinBase.setData` calls
+
+    :var visited: Pins dirty propagation went through
+    :var notified: Pins which sent :attr:`~uflow.Core.PinBase.PinBase.markedAsDirty`
+    """
+
+    def __init__(self):
+        self.visited = set()
+        self.notified = set()
+
+
+@contextmanager
+def invalidationPass():
+    """Opens invalidation pass on current thread or joins already opened one
+
+    Within one pass every pin is marked dirty and sends
+    :attr:`~uflow.Core.PinBase.PinBase.markedAsDirty` only once.
+
+    :rtype: :class:`InvalidationPass`
+    """
+    current = getattr(_threadState, "invalidationPass", None)
+    if current is not None:
+        yield current
+        return
+    current = _threadState.invalidationPass = InvalidationPass()
+    try:
+        yield current
+    finally:
+        _threadState.invalidationPass = None
+
+
+def currentInvalidationPass():
+    """Returns invalidation pass opened on current thread or None
+
+    :rtype: :class:`InvalidationPass` or None
+    """
+    return getattr(_threadState, "invalidationPass", None)
+
 
 def fetchPackageNames(graphJson):
     """Parses serialized graph and returns all package names it uses
@@ -322,6 +414,18 @@ def pinAffects(lhs, rhs):
     assert lhs is not rhs, "pin can not affect itself"
     lhs.affects.add(rhs)
     rhs.affected_by.add(lhs)
+    invalidateEvaluationPlans()
+
+
+def invalidateEvaluationPlans():
+    """Drops cached evaluation plans of the evaluation engine
+
+    Should be called every time graph topology changes.
+    Connections, pin creation and deletion call this automatically.
+    """
+    from uflow.Core.EvaluationEngine import EvaluationEngine
+
+    EvaluationEngine().invalidateEvaluationPlans()
 
 
 def canConnectPins(src, dst):
@@ -647,6 +751,7 @@ def disconnectPins(src, dst):
             src, dst = dst, src
         src.affects.remove(dst)
         dst.affected_by.remove(src)
+        invalidateEvaluationPlans()
         src.pinDisconnected(dst)
         dst.pinDisconnected(src)
         push(dst)
@@ -661,15 +766,24 @@ def push(start_from):
 
     this part of graph will be recomputed every tick
 
+    Propagation is iterative and every pin is visited once per :func:`invalidationPass`,
+    so cost is proportional to number of connections in affected part of graph.
+
     :param start_from: pin from which recursion begins
     :type start_from: :py:class:`~uflow.Core.PinBase.PinBase`
     """
-    # print("push", start_from.name, start_from.owningNode().name)
-    if not len(start_from.affects) == 0:
-        start_from.setDirty()
-        for i in start_from.affects:
-            i.setDirty()
-            push(i)
+    if len(start_from.affects) == 0:
+        return
+    with invalidationPass() as invalidation:
+        stack = [start_from]
+        while stack:
+            pin = stack.pop()
+            # pin could be cleaned by listeners since it was visited
+            if pin in invalidation.visited and pin.dirty:
+                continue
+            invalidation.visited.add(pin)
+            pin.setDirty()
+            stack.extend(pin.affects)
 
 
 def extractDigitsFromEndOfString(string):
@@ -885,6 +999,7 @@ class PinOptions(Flag):
     Storable = auto()  #: Determines if pin data can be stored when pin serialized
     AllowAny = auto()  #: Special flag that allow a pin to be :class:`~FlowBasePackage.Pins.AnyPin.AnyPin`, which means non typed without been marked as error. By default, a :py:class:`FlowBasePackage.Pins.AnyPin.AnyPin` need to be initialized with some data type, other defined pin. This flag overrides that. Used in lists and non typed nodes
     DictElementSupported = auto()  #: Dicts are constructed with :class:`DictElement` objects. So dict pins will only allow other dicts until this flag enabled. Used in :class:`~FlowBasePackage.Nodes.makeDict` node
+    KeepData = auto()  #: Pin value is never released to save memory. See :mod:`~uflow.Core.IntermediateRelease` and :mod:`~uflow.Core.MemoryManager`
 
 
 class StructureType(IntEnum):
@@ -983,8 +1098,29 @@ class NodeMeta:
     :var CATEGORY: To specify category for node. Will be considered by node box
     :var KEYWORDS: To specify list of additional keywords, used in node box search field
     :var CACHE_ENABLED: To specify if node is cached or not
+    :var THREAD_SAFE: To specify if node can be computed on worker thread by parallel evaluation engine
+    :var ISOLATION: To specify where function based node is computed. See :class:`NodeIsolation`
+    :var MEMOIZE: To specify if node outputs are remembered for every combination of input values. See :mod:`~uflow.Core.Memoization`
+    :var PERSISTENT_CACHE: To specify if node outputs are stored on disk between runs. See :mod:`~uflow.Core.DiskCache`
+    :var VECTORIZED: To specify if function accepts columns of values. See :mod:`~uflow.Core.BatchEvaluation`
     """
 
     CATEGORY = "Category"
     KEYWORDS = "Keywords"
     CACHE_ENABLED = "CacheEnabled"
+    THREAD_SAFE = "ThreadSafe"
+    ISOLATION = "Isolation"
+    MEMOIZE = "Memoize"
+    PERSISTENT_CACHE = "PersistentCache"
+    VECTORIZED = "Vectorized"
+
+
+class NodeIsolation:
+    """Values of :attr:`NodeMeta.ISOLATION` node meta
+
+    :var InProcess: Node is computed in-process. This is default
+    :var Process: Node is computed by :class:`~uflow.Core.ProcessPool.ProcessExecutionBackend` if it is started
+    """
+
+    InProcess = "inprocess"
+    Process = "process"
@@ -0,0 +1,281 @@
+"""
+.. sidebar:: **DiskCache.py**
+
+    Persistent content addressed storage of node outputs.
+
+Nodes which have :attr:`~uflow.Core.NodeBase.NodeBase.bPersistentCache` enabled (function based nodes use
+``meta={NodeMeta.PERSISTENT_CACHE: True}``) store outputs on disk, so later runs with the same inputs
+and unchanged node code load them instead of computing.
+
+Entry key combines node type, package, function library, digest of node source code and digests of input values.
+Outputs made of numpy arrays only are stored as compressed ``.npz`` files, everything else as compressed pickle.
+
+Cache is disabled until configured:
+::
+
+    DiskCache().configure("/tmp/uflowCache", maxBytes=2 * 1024 ** 3)
+
+Files are written to temporary file and moved in place atomically, so several processes can share directory.
+Least recently used entries are removed when directory grows beyond size limit.
+"""
+
+import os
+import gzip
+import pickle
+import inspect
+import hashlib
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from uflow.Core.Common import *
+from uflow.Core.Memoization import contentDigest
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".uflow", "cache")
+PICKLE_EXTENSION = ".pkl.gz"
+NUMPY_EXTENSION = ".npz"
+LOCK_FILE_NAME = ".lock"
+
+_classSourceDigests = {}
+
+
+def nodeSourceDigest(node):
+    """Returns digest of code which computes node
+
+    Python nodes are identified by their code, function based nodes by function source
+    and class based nodes by class source.
+
+    :param node: Node to get digest for
+    :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+    :rtype: str
+    """
+    nodeData = getattr(node, "_nodeData", None)
+    if nodeData is not None:
+        return hashlib.blake2b(nodeData.encode(), digest_size=16).hexdigest()
+
+    code = getattr(node, "_function", None) or node.__class__
+    digest = _classSourceDigests.get(code)
+    if digest is None:
+        try:
+            source = inspect.getsource(code)
+        except (OSError, TypeError):
+            # no source available, identify by name only
+            source = "{0}.{1}".format(code.__module__, code.__qualname__)
+        digest = hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+        _classSourceDigests[code] = digest
+    return digest
+
+
+@contextmanager
+def _directoryLock(directory):
+    """Exclusive lock shared by all processes using cache directory"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, LOCK_FILE_NAME), "a") as lockFile:
+        fcntl.flock(lockFile, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lockFile, fcntl.LOCK_UN)
+
+
+@SingletonDecorator
+class DiskCache(object):
+    """Persistent storage of node outputs"""
+
+    def __init__(self):
+        self.directory = None
+        self.maxBytes = 1024**3
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._approximateBytes = None
+
+    def configure(self, directory=None, maxBytes=None):
+        """Enables cache
+
+        :param directory: Cache directory. Defaults to ``~/.uflow/cache``
+        :type directory: str or None
+        :param maxBytes: Maximum size of cache directory
+        :type maxBytes: int or None
+        """
+        self.directory = os.path.abspath(directory or DEFAULT_CACHE_DIRECTORY)
+        os.makedirs(self.directory, exist_ok=True)
+        if maxBytes is not None:
+            self.maxBytes = maxBytes
+        self._approximateBytes = None
+
+    def disable(self):
+        self.directory = None
+
+    def isEnabled(self):
+        return self.directory is not None
+
+    def key(self, node, inputsKey):
+        """Returns entry key
+
+        :param node: Node being computed
+        :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+        :param inputsKey: Input values fingerprint, see :func:`~uflow.Core.Memoization.inputsFingerprint`
+        :type inputsKey: tuple
+        :rtype: str
+        """
+        return contentDigest(
+            (
+                node.__class__.__name__,
+                node.packageName,
+                getattr(node, "lib", None),
+                nodeSourceDigest(node),
+                inputsKey,
+            )
+        )
+
+    def _entryPaths(self, key):
+        folder = os.path.join(self.directory, key[:2])
+        return (
+            os.path.join(folder, key + NUMPY_EXTENSION),
+            os.path.join(folder, key + PICKLE_EXTENSION),
+        )
+
+    def load(self, key):
+        """Returns outputs stored for key or None
+
+        :rtype: dict or None
+        """
+        for path in self._entryPaths(key):
+            if numpy is None and path.endswith(NUMPY_EXTENSION):
+                continue
+            try:
+                if path.endswith(NUMPY_EXTENSION):
+                    with numpy.load(path, allow_pickle=False) as archive:
+                        outputs = {name: archive[name] for name in archive.files}
+                else:
+                    with gzip.open(path, "rb") as f:
+                        outputs = pickle.load(f)
+            except FileNotFoundError:
+                # not stored or removed by other process
+                continue
+            except Exception as e:
+                print("Failed to load cached outputs {0}. {1}".format(path, e))
+                continue
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            self.hits += 1
+            return outputs
+        self.misses += 1
+        return None
+
+    def store(self, key, outputs):
+        """Stores outputs for key
+
+        :param outputs: Output pin values by pin name
+        :type outputs: dict
+        """
+        numpyPath, picklePath = self._entryPaths(key)
+        folder = os.path.dirname(numpyPath)
+        os.makedirs(folder, exist_ok=True)
+        bArrays = (
+            numpy is not None
+            and len(outputs) > 0
+            and all(
+                isinstance(v, numpy.ndarray) and not v.dtype.hasobject
+                for v in outputs.values()
+            )
+        )
+        fd, tempPath = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                if bArrays:
+                    numpy.savez_compressed(f, **outputs)
+                else:
+                    with gzip.GzipFile(fileobj=f, mode="wb", compresslevel=3) as gz:
+                        pickle.dump(outputs, gz, protocol=pickle.HIGHEST_PROTOCOL)
+            size = os.path.getsize(tempPath)
+            os.replace(tempPath, numpyPath if bArrays else picklePath)
+        except Exception as e:
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+            print("Failed to store outputs in cache. {}".format(e))
+            return
+        self.writes += 1
+
+        if self._approximateBytes is None:
+            self._approximateBytes = self.size()
+        else:
+            self._approximateBytes += size
+        if self._approximateBytes > self.maxBytes:
+            self.evict()
+
+    def _entries(self):
+        """Returns (access time, size, path) of all entries"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for fileName in files:
+                if not fileName.endswith((NUMPY_EXTENSION, PICKLE_EXTENSION)):
+                    continue
+                path = os.path.join(root, fileName)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        """Returns total size of stored entries in bytes
+
+        :rtype: int
+        """
+        return sum(entry[1] for entry in self._entries())
+
+    def evict(self):
+        """Removes least recently used entries until directory fits size limit"""
+        with _directoryLock(self.directory):
+            entries = sorted(self._entries())
+            total = sum(entry[1] for entry in entries)
+            for _, size, path in entries:
+                if total <= self.maxBytes:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            self._approximateBytes = total
+
+    def clear(self):
+        """Removes all stored entries"""
+        with _directoryLock(self.directory):
+            for _, _, path in self._entries():
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        self._approximateBytes = 0
+
+    def stats(self):
+        """Returns cache statistics
+
+        :rtype: dict
+        """
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
@@ -1,15 +1,33 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 from uflow.Core.Common import *
 from uflow.Core.Interfaces import IEvaluationEngine
+from uflow.Core.Tracer import Tracer
 
 
 class DefaultEvaluationEngine_Impl(IEvaluationEngine):
-    """Default evaluation engine implementation"""
+    """Default evaluation engine implementation
+
+    Evaluation orders are compiled once per (node, direction) and cached as
+    evaluation plans. Cache is dropped by :meth:`invalidateEvaluationPlans`,
+    which is called whenever graph topology changes (pins connected,
+    disconnected, created or killed).
+
+    Cache is shared by graphs evaluated from several threads (for example graphs of
+    :class:`~uflow.Core.GraphService.GraphService`), so it is guarded by a lock.
+    """
 
     def __init__(self):
         super(DefaultEvaluationEngine_Impl, self).__init__()
+        self._plans = {}
+        self._planLock = threading.Lock()
+        self._planGeneration = 0
+        self._planHits = 0
+        self._planMisses = 0
+        self._planInvalidations = 0
 
-    @staticmethod
-    def getPinData(pin):
+    def getPinData(self, pin):
         if not pin.hasConnections():
             return pin.currentData()
 
@@ -18,34 +36,71 @@ class DefaultEvaluationEngine_Impl(IEvaluationEngine):
         if not bOwningNodeCallable:
             return pin.currentData()
 
-        order = DefaultEvaluationEngine_Impl.getEvaluationOrderIterative(
-            pin.owningNode()
-        )
+        order = self.getEvaluationPlan(pin.owningNode())
         [node.processNode() for node in order]
 
         if not bOwningNodeCallable:
             pin.owningNode().processNode()
         return pin.currentData()
 
-    @staticmethod
-    def TEST_getPinData(pin):
-        if not pin.hasConnections():
-            return pin.currentData()
-
-        bOwningNodeCallable = pin.owningNode().bCallable
-
-        if not pin.dirty:
-            return pin.currentData()
-
-        order = DefaultEvaluationEngine_Impl.getEvaluationOrderIterative(
-            pin.owningNode()
-        )
-        [node.processNode() for node in order]
-
-        # if pin.dirty:
-        #    pin.owningNode().processNode()
-
-        return pin.currentData()
+    def getEvaluationPlan(self, node, forward=False):
+        """Returns cached evaluation order for node
+
+        :param node: Node to build plan for
+        :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+        :param forward: If True, downstream nodes are collected instead of upstream
+        :type forward: bool
+        :rtype: tuple(:class:`~uflow.Core.NodeBase.NodeBase`)
+        """
+        key = (node, forward)
+        with self._planLock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._planHits += 1
+                return plan
+            self._planMisses += 1
+            generation = self._planGeneration
+
+        tracer = Tracer()
+        start = tracer.begin()
+        plan = tuple(self.getEvaluationOrderIterative(node, forward))
+        if tracer.bEnabled:
+            tracer.complete(
+                "plan {}".format(node.name), "plan", start, {"nodes": len(plan)}
+            )
+        with self._planLock:
+            # plan built while topology changed may be outdated
+            if generation == self._planGeneration:
+                self._plans[key] = plan
+        return plan
+
+    def invalidateEvaluationPlans(self):
+        """Drops all cached evaluation plans"""
+        with self._planLock:
+            self._planGeneration += 1
+            if len(self._plans) > 0:
+                self._plans.clear()
+                self._planInvalidations += 1
+
+    def planCacheStats(self):
+        """Returns evaluation plan cache statistics
+
+        :rtype: dict
+        """
+        with self._planLock:
+            return {
+                "plans": len(self._plans),
+                "hits": self._planHits,
+                "misses": self._planMisses,
+                "invalidations": self._planInvalidations,
+            }
+
+    def resetPlanCacheStats(self):
+        """Resets hit/miss/invalidation counters"""
+        with self._planLock:
+            self._planHits = 0
+            self._planMisses = 0
+            self._planInvalidations = 0
 
     @staticmethod
     def getEvaluationOrderIterative(node, forward=False):
@@ -155,10 +210,276 @@ class DefaultEvaluationEngine_Impl(IEvaluationEngine):
         return nodes
 
 
+class LazyEvaluationEngine_Impl(DefaultEvaluationEngine_Impl):
+    """Dirty-aware evaluation engine
+
+    Walks upstream graph from the requesting node and skips branches which
+    are clean. Dirtiness is tracked by per-pin generation counters
+    (see :attr:`~uflow.Core.PinBase.PinBase.generation`) and propagated
+    downstream by :func:`~uflow.Core.Common.push`, so clean node means its whole
+    upstream cone is clean as well. Nodes with disabled cache are volatile:
+    they and everything downstream of them are always visited.
+
+    Cost of a pull is proportional to the dirty cone instead of to the whole upstream graph.
+    """
+
+    def __init__(self):
+        super(LazyEvaluationEngine_Impl, self).__init__()
+        self._upstream = {}
+        self._volatile = {}
+
+    def getPinData(self, pin):
+        if not pin.hasConnections():
+            return pin.currentData()
+
+        if not pin.owningNode().bCallable:
+            return pin.currentData()
+
+        order = self.getDirtyEvaluationOrder(pin.owningNode())
+        [node.processNode() for node in order]
+        return pin.currentData()
+
+    def invalidateEvaluationPlans(self):
+        super(LazyEvaluationEngine_Impl, self).invalidateEvaluationPlans()
+        self._upstream.clear()
+        self._volatile.clear()
+
+    def getUpstreamNodes(self, node):
+        """Returns cached set of nodes directly feeding supplied node
+
+        :rtype: tuple(:class:`~uflow.Core.NodeBase.NodeBase`)
+        """
+        nodes = self._upstream.get(node)
+        if nodes is None:
+            nodes = tuple(self.getNextLayerNodes(node))
+            self._upstream[node] = nodes
+        return nodes
+
+    def isVolatile(self, node):
+        """Whether node or any node in its upstream cone must always be recomputed
+
+        :rtype: bool
+        """
+        result = self._volatile.get(node)
+        if result is not None:
+            return result
+
+        # iterative post order walk, so long chains do not hit recursion limit
+        stack = [(node, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if current in self._volatile:
+                continue
+            upstream = self.getUpstreamNodes(current)
+            if expanded:
+                self._volatile[current] = not current.bCacheEnabled or any(
+                    self._volatile.get(n, False) for n in upstream
+                )
+            else:
+                stack.append((current, True))
+                for n in upstream:
+                    if n not in self._volatile:
+                        stack.append((n, False))
+        return self._volatile[node]
+
+    def needsEvaluation(self, node):
+        return node.isDirty() or self.isVolatile(node)
+
+    def getDirtyEvaluationOrder(self, node):
+        """Returns evaluation order containing only nodes that need to be computed
+
+        Clean branches are pruned before they are visited.
+
+        :rtype: list(:class:`~uflow.Core.NodeBase.NodeBase`)
+        """
+        visited = {node}
+        order = []
+        stack = [(n, False) for n in self.getUpstreamNodes(node)]
+
+        while stack:
+            current, expanded = stack.pop()
+
+            if expanded:
+                order.append(current)
+                continue
+
+            if current in visited:
+                continue
+            visited.add(current)
+
+            if not self.needsEvaluation(current):
+                continue
+
+            stack.append((current, True))
+            for n in self.getUpstreamNodes(current):
+                if n not in visited:
+                    stack.append((n, False))
+        return order
+
+
+def _computeOnWorker(node):
+    """Computes node on worker thread and returns signals it queued"""
+    takeDeferredSignals()
+    node.computeChecked()
+    return takeDeferredSignals()
+
+
+class ThreadedEvaluationEngine_Impl(LazyEvaluationEngine_Impl):
+    """Parallel evaluation engine
+
+    Dirty upstream nodes are grouped into dependency levels. Nodes of the same level do not
+    depend on each other, so thread safe ones are computed concurrently on a
+    :class:`~concurrent.futures.ThreadPoolExecutor`. Nodes with ``bThreadSafe`` disabled
+    (see :attr:`~uflow.Core.Common.NodeMeta.THREAD_SAFE`) are computed on calling thread.
+
+    Levels are joined before next level starts and every output pin is written by exactly one node,
+    so resulting pin values do not depend on scheduling. :attr:`~uflow.Core.NodeBase.NodeBase.computing`
+    and :attr:`~uflow.Core.NodeBase.NodeBase.computed` signals are sent from calling thread in plan order.
+    Pin signals (:attr:`~uflow.Core.PinBase.PinBase.dataBeenSet`, :attr:`~uflow.Core.PinBase.PinBase.markedAsDirty`)
+    sent while computing on worker thread are queued and sent from calling thread before ``computed`` of their node.
+
+    :param maxWorkers: Number of worker threads. Defaults to :class:`~concurrent.futures.ThreadPoolExecutor` default
+    :type maxWorkers: int or None
+    """
+
+    def __init__(self, maxWorkers=None):
+        super(ThreadedEvaluationEngine_Impl, self).__init__()
+        self._maxWorkers = maxWorkers
+        self._executor = None
+
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._maxWorkers,
+                thread_name_prefix="uflowEvaluation",
+                initializer=markEvaluationWorkerThread,
+            )
+        return self._executor
+
+    def shutdown(self):
+        """Stops worker threads"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def getPinData(self, pin):
+        if not pin.hasConnections():
+            return pin.currentData()
+
+        if not pin.owningNode().bCallable:
+            return pin.currentData()
+
+        # nested pull from worker thread. Upstream is already computed by the level scheduler
+        if isEvaluationWorkerThread():
+            return super(ThreadedEvaluationEngine_Impl, self).getPinData(pin)
+
+        order = self.getDirtyEvaluationOrder(pin.owningNode())
+        for level in self.getEvaluationLevels(order):
+            self.computeLevel(level)
+        return pin.currentData()
+
+    def getEvaluationLevels(self, order):
+        """Splits evaluation order into dependency levels
+
+        :param order: Topologically sorted nodes
+        :type order: list(:class:`~uflow.Core.NodeBase.NodeBase`)
+        :rtype: list(list(:class:`~uflow.Core.NodeBase.NodeBase`))
+        """
+        levelIndices = {}
+        levels = []
+        for node in order:
+            index = 0
+            for upstreamNode in self.getUpstreamNodes(node):
+                if upstreamNode in levelIndices:
+                    index = max(index, levelIndices[upstreamNode] + 1)
+            levelIndices[node] = index
+            if index == len(levels):
+                levels.append([])
+            levels[index].append(node)
+        return levels
+
+    def computeLevel(self, level):
+        """Computes independent nodes
+
+        :param level: Nodes that do not depend on each other
+        :type level: list(:class:`~uflow.Core.NodeBase.NodeBase`)
+        """
+        if len(level) == 1:
+            level[0].processNode()
+            return
+
+        for node in level:
+            node.computing.send()
+
+        futures = {}
+        for node in level:
+            if node.bThreadSafe:
+                futures[node] = self.executor().submit(_computeOnWorker, node)
+        for node in level:
+            if not node.bThreadSafe:
+                node.computeChecked()
+        deferred = {node: future.result() for node, future in futures.items()}
+
+        for node in level:
+            for signal, args in deferred.get(node, ()):
+                signal.send(*args)
+            node.computed.send()
+
+
+EVALUATION_ENGINE_IMPLEMENTATIONS = {
+    "default": DefaultEvaluationEngine_Impl,
+    "lazy": LazyEvaluationEngine_Impl,
+    "threaded": ThreadedEvaluationEngine_Impl,
+}
+
+
 @SingletonDecorator
 class EvaluationEngine(object):
     def __init__(self):
         self._impl = DefaultEvaluationEngine_Impl()
 
+    def getImpl(self):
+        """Returns active evaluation engine implementation"""
+        return self._impl
+
+    def setImpl(self, impl):
+        """Sets evaluation engine implementation
+
+        :param impl: Implementation instance
+        :type impl: :class:`~uflow.Core.Interfaces.IEvaluationEngine`
+        """
+        assert isinstance(impl, IEvaluationEngine)
+        self._impl = impl
+
+    def setMode(self, mode, *args, **kwargs):
+        """Switches implementation by name
+
+        Example:
+
+        >>> EvaluationEngine().setMode("lazy")
+
+        :param mode: One of :data:`EVALUATION_ENGINE_IMPLEMENTATIONS` keys
+        :type mode: str
+        """
+        if mode not in EVALUATION_ENGINE_IMPLEMENTATIONS:
+            raise ValueError(
+                "Unknown evaluation mode: {0}. Available: {1}".format(
+                    mode, list(EVALUATION_ENGINE_IMPLEMENTATIONS)
+                )
+            )
+        self.setImpl(EVALUATION_ENGINE_IMPLEMENTATIONS[mode](*args, **kwargs))
+
     def getPinData(self, pin):
         return self._impl.getPinData(pin)
+
+    def getEvaluationPlan(self, node, forward=False):
+        return self._impl.getEvaluationPlan(node, forward)
+
+    def invalidateEvaluationPlans(self):
+        self._impl.invalidateEvaluationPlans()
+
+    def planCacheStats(self):
+        return self._impl.planCacheStats()
+
+    def resetPlanCacheStats(self):
+        self._impl.resetPlanCacheStats()
@@ -84,6 +84,25 @@ Examples:
         >>> ("Category" : str)
         >>> ("Keywords" : [str])
         >>> ("CacheEnabled" : bool)
+        >>> ("ThreadSafe" : bool)
+        >>> ("Isolation" : str)
+        >>> ("Memoize" : bool)
+        >>> ("PersistentCache" : bool)
+        >>> ("Vectorized" : bool)
+
+        ThreadSafe is True by default. Set it to False for nodes that must not be computed
+        on worker threads of :class:`~uflow.Core.EvaluationEngine.ThreadedEvaluationEngine_Impl`
+
+        Isolation set to ``"process"`` makes node computed in worker process by
+        :class:`~uflow.Core.ProcessPool.ProcessExecutionBackend`. Function must not rely on ``owningNode`` then.
+
+        Memoize makes pure node remember outputs for every combination of input values. See :mod:`~uflow.Core.Memoization`
+
+        PersistentCache makes pure node store outputs on disk when :class:`~uflow.Core.DiskCache.DiskCache` is configured.
+        Outputs are reused by later runs while inputs and function source are unchanged.
+
+        Vectorized means function can be called with numpy arrays instead of scalars. Batch evaluation
+        (see :mod:`~uflow.Core.BatchEvaluation`) calls it once per batch instead of once per row.
 
 """
 
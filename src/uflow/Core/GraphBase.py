@@ -8,6 +8,7 @@ from uflow.Core.NodeBase import NodeBase
 from uflow import getRawNodeInstance
 from uflow import getPinDefaultValueByType
 from uflow.Core.Variable import Variable
+from uflow.Core.BulkLoad import BulkLoader
 from uflow.Core.Interfaces import ISerializable
 
 
@@ -23,6 +24,9 @@ class GraphBase(ISerializable):
     :var categoryChanged: signal emitted after graph category was changed
     :vartype categoryChanged: :class:`~blinker.base.Signal`
 
+    :var killed: signal emitted after graph was removed from graph manager
+    :vartype killed: :class:`~blinker.base.Signal`
+
     :var childGraphs: a set of child graphs
     :vartype childGraphs: :class:`set`
 
@@ -60,6 +64,7 @@ class GraphBase(ISerializable):
 
         self.nameChanged = Signal(str)
         self.categoryChanged = Signal(str)
+        self.killed = Signal()
 
         self.__name = name
         self.__category = category
@@ -71,6 +76,7 @@ class GraphBase(ISerializable):
 
         self._nodes = {}
         self._vars = {}
+        self._pinsByUid = {}  # maintained by graph manager from name registry signals
         self.uid = uuid.uuid4() if uid is None else uid
 
         manager.add(self)
@@ -119,6 +125,8 @@ class GraphBase(ISerializable):
             newParentGraph.childGraphs.add(self)
             # update parent
             self._parentGraph = newParentGraph
+            # paths of nodes depend on graph location
+            self.graphManager.names.moved(self)
 
     def depth(self):
         """Returns depth level of this graph
@@ -165,9 +173,15 @@ class GraphBase(ISerializable):
     def populateFromJson(self, jsonData):
         """Populates itself from serialized data
 
+        Nodes are loaded in bulk, see :mod:`~uflow.Core.BulkLoad`
+
         :param jsonData: serialized graph
         :type jsonData: dict
         """
+        with BulkLoader(self.graphManager) as loader:
+            self._populateFromJson(jsonData, loader.timings)
+
+    def _populateFromJson(self, jsonData, timings):
         self.clear()
         self.name = self.graphManager.getUniqGraphName(jsonData["name"])
         self.category = jsonData["category"]
@@ -178,52 +192,76 @@ class GraphBase(ISerializable):
         for varJson in jsonData["vars"]:
             var = Variable.deserialize(self, varJson)
             self._vars[var.uid] = var
+            self.graphManager.names.addVariable(var)
         # restore nodes
+        # links refer to serialized names, nodes can be renamed before links are restored
+        loadedByName = {}
         for nodeJson in jsonData["nodes"]:
             # check if variable getter or setter and pass variable
             nodeKwargs = {}
             if nodeJson["type"] in ("getVar", "setVar"):
                 nodeKwargs["var"] = self._vars[uuid.UUID(nodeJson["varUid"])]
             nodeJson["owningGraphName"] = self.name
-            node = getRawNodeInstance(
-                nodeJson["type"],
-                packageName=nodeJson["package"],
-                libName=nodeJson["lib"],
-                **nodeKwargs,
-            )
+            with timings.phase("construct"):
+                node = getRawNodeInstance(
+                    nodeJson["type"],
+                    packageName=nodeJson["package"],
+                    libName=nodeJson["lib"],
+                    **nodeKwargs,
+                )
+            loadedByName.setdefault(nodeJson["name"], node)
             self.addNode(node, nodeJson)
 
+        loader = self.graphManager.bulkLoader
+        if loader is not None:
+            with timings.phase("finalize"):
+                loader.makeNamesUnique()
+
         # restore connection
-        for nodeJson in jsonData["nodes"]:
-            for nodeOutputJson in nodeJson["outputs"]:
-                for linkData in nodeOutputJson["linkedTo"]:
-                    try:
-                        lhsNode = self._nodes[uuid.UUID(linkData["lhsNodeUid"])]
-                    except Exception as e:
-                        lhsNode = self.findNode(linkData["lhsNodeName"])
-
-                    try:
-                        lhsPin = lhsNode.orderedOutputs[linkData["outPinId"]]
-                    except Exception as e:
-                        print("lhsPin not found {0}".format(str(linkData)))
-                        continue
-
-                    try:
-                        rhsNode = self._nodes[uuid.UUID(linkData["rhsNodeUid"])]
-                    except Exception as e:
-                        rhsNode = self.findNode(linkData["rhsNodeName"])
-
-                    try:
-                        rhsPin = rhsNode.orderedInputs[linkData["inPinId"]]
-                    except Exception as e:
-                        continue
-
-                    if not arePinsConnected(lhsPin, rhsPin):
-                        connected = connectPins(lhsPin, rhsPin)
-                        # assert(connected is True), "Failed to restore connection"
-                        if not connected:
-                            print("Failed to restore connection", lhsPin, rhsPin)
-                            connectPins(lhsPin, rhsPin)
+        with timings.phase("connect"):
+            # pins by (node uid, pin index), so links do not sort pins of nodes every time
+            outputPins = {}
+            inputPins = {}
+            for node in self._nodes.values():
+                for pin in node.pins:
+                    if pin.direction == PinDirection.Output:
+                        outputPins[(node.uid, pin.pinIndex)] = pin
+                    else:
+                        inputPins[(node.uid, pin.pinIndex)] = pin
+
+            for nodeJson in jsonData["nodes"]:
+                for nodeOutputJson in nodeJson["outputs"]:
+                    for linkData in nodeOutputJson["linkedTo"]:
+                        try:
+                            lhsNode = self._nodes[uuid.UUID(linkData["lhsNodeUid"])]
+                        except Exception as e:
+                            lhsNode = loadedByName.get(linkData["lhsNodeName"])
+
+                        lhsPin = None
+                        if lhsNode is not None:
+                            lhsPin = outputPins.get((lhsNode.uid, linkData["outPinId"]))
+                        if lhsPin is None:
+                            print("lhsPin not found {0}".format(str(linkData)))
+                            continue
+
+                        try:
+                            rhsNode = self._nodes[uuid.UUID(linkData["rhsNodeUid"])]
+                        except Exception as e:
+                            rhsNode = loadedByName.get(linkData["rhsNodeName"])
+
+                        if rhsNode is None:
+                            continue
+                        rhsPin = inputPins.get((rhsNode.uid, linkData["inPinId"]))
+                        if rhsPin is None:
+                            continue
+
+                        if not arePinsConnected(lhsPin, rhsPin):
+                            connected = connectPins(lhsPin, rhsPin)
+                            # assert(connected is True), "Failed to restore connection"
+                            if not connected:
+                                print("Failed to restore connection", lhsPin, rhsPin)
+                                connectPins(lhsPin, rhsPin)
+                            timings.links += 1
 
     def remove(self):
         """Removes this graph as well as child graphs. Deepest graphs will be removed first"""
@@ -279,11 +317,8 @@ class GraphBase(ISerializable):
 
     @property
     def pins(self):
-        result = {}
-        for n in self.getNodesList():
-            for pin in tuple(n.inputs.values()) + tuple(n.outputs.values()):
-                result[pin.uid] = pin
-        return result
+        """Returns pins of all nodes of this graph. Dictionary is a copy of index, so cache it when possible."""
+        return dict(self._pinsByUid)
 
     def createVariable(
         self,
@@ -313,6 +348,7 @@ class GraphBase(ISerializable):
             uid=uid,
         )
         self._vars[var.uid] = var
+        self.graphManager.names.addVariable(var)
         return var
 
     # TODO: add arguments to deal with references of this var
@@ -356,10 +392,7 @@ class GraphBase(ISerializable):
         :param name: Node name
         :type name: str or None
         """
-        for i in self._nodes.values():
-            if i.name == name:
-                return i
-        return None
+        return self.graphManager.names.findNode(name, self)
 
     def getNodesByClassName(self, className):
         """Returns a list of nodes filtered by class name
@@ -380,10 +413,7 @@ class GraphBase(ISerializable):
         :type uid: :class:`~uuid.UUID`
         :rtype: :class:`~uflow.Core.PinBase.PinBase` or None
         """
-        pin = None
-        if uid in self.pins:
-            pin = self.pins[uid]
-        return pin
+        return self._pinsByUid.get(uid)
 
     def findPin(self, pinName):
         """Tries to find pin by name
@@ -392,12 +422,16 @@ class GraphBase(ISerializable):
         :type pinName: str
         :rtype: :class:`~uflow.Core.PinBase.PinBase` or None
         """
-        result = None
-        for pin in self.pins.values():
-            if pinName == pin.getFullName():
-                result = pin
-                break
-        return result
+        # full name is node name and pin name joined with underscore, both can contain underscores too
+        start = pinName.find("_")
+        while start != -1:
+            node = self.findNode(pinName[:start])
+            if node is not None:
+                for pin in node.pins:
+                    if pin.getFullName() == pinName:
+                        return pin
+            start = pinName.find("_", start + 1)
+        return None
 
     def getInputNode(self):
         """Creates and adds to graph :class:`~FlowBasePackage.Nodes.graphNodes.graphInputs` node
@@ -428,8 +462,6 @@ class GraphBase(ISerializable):
         :type jsonTemplate: dict
         :rtype: bool
         """
-        from uflow.Core.PathsRegistry import PathsRegistry
-
         assert node is not None, "failed to add node, None is passed"
         if node.uid in self._nodes:
             return False
@@ -446,6 +478,16 @@ class GraphBase(ISerializable):
                     return False
 
         node.graph = weakref.ref(self)
+        loader = self.graphManager.bulkLoader
+        if loader is not None:
+            # names are made unique once loading is finished
+            self._nodes[node.uid] = node
+            self.graphManager.names.addNode(node)
+            with loader.timings.phase("postCreate"):
+                node.postCreate(jsonTemplate)
+            loader.nodeAdded(node)
+            return True
+
         if jsonTemplate is not None:
             jsonTemplate["name"] = self.graphManager.getUniqNodeName(
                 jsonTemplate["name"]
@@ -454,8 +496,8 @@ class GraphBase(ISerializable):
             node.setName(self.graphManager.getUniqNodeName(node.name))
 
         self._nodes[node.uid] = node
+        self.graphManager.names.addNode(node)
         node.postCreate(jsonTemplate)
-        PathsRegistry().rebuild()
         return True
 
     def location(self):
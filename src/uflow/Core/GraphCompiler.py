@@ -0,0 +1,514 @@
+"""
+.. sidebar:: **GraphCompiler.py**
+
+    Compiles graph data path to standalone python module.
+
+Generated module contains one function. Its parameters are output pins of root graph ``graphInputs`` nodes
+and it returns dictionary of ``graphOutputs`` input pin values. Function library functions are called directly,
+without pins, signals and dirty flags:
+
+* Pure function nodes are computed where their value is first needed and recomputed
+  when callable node they depend on was executed
+* Callable function nodes and ``branch``, ``sequence``, ``forLoop`` nodes become ordinary control flow,
+  starting from exec pins of ``graphInputs``
+* Compound nodes are inlined, reroute nodes are skipped
+
+Other class based nodes can not be compiled and raise :class:`GraphCompilationError`.
+Translation of more class based nodes can be added to :data:`EXEC_NODE_TRANSLATORS`.
+
+Example:
+::
+
+    root = GraphManagerSingleton().get().findRootGraph()
+    with open("myGraph.py", "w") as f:
+        f.write(compileGraph(root))
+
+    from myGraph import run
+    print(run(a=1.0, b=2.0))
+"""
+
+import re
+import ast
+import math
+import pickle
+import base64
+
+from uflow.Core.Common import *
+
+
+class GraphCompilationError(Exception):
+    """Raised when graph contains something compiler can not translate"""
+
+    pass
+
+
+def _isLiteral(value):
+    try:
+        return ast.literal_eval(repr(value)) == value and type(
+            ast.literal_eval(repr(value))
+        ) is type(value)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        return False
+
+
+class _Scope(object):
+    """Pure node outputs computed in block of generated code
+
+    :var values: Expressions of computed output pins
+    :var dependencies: Callable nodes every computed pure node reads
+    """
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.values = {}
+        self.dependencies = {}
+
+    def find(self, pin):
+        scope = self
+        while scope is not None:
+            if pin in scope.values:
+                return scope.values[pin]
+            scope = scope.parent
+        return None
+
+    def findDependencies(self, node):
+        scope = self
+        while scope is not None:
+            if node in scope.dependencies:
+                return scope.dependencies[node]
+            scope = scope.parent
+        return None
+
+    def invalidate(self, callableNode):
+        """Forgets pure nodes which read outputs of executed callable node"""
+        scope = self
+        while scope is not None:
+            for node, dependencies in list(scope.dependencies.items()):
+                if callableNode in dependencies:
+                    scope.dependencies.pop(node)
+                    for pin in node.outputs.values():
+                        scope.values.pop(pin, None)
+            scope = scope.parent
+
+
+class GraphCompiler(object):
+    """Translates graph to python source
+
+    :param graph: Root graph to compile
+    :type graph: :class:`~uflow.Core.GraphBase.GraphBase`
+    :param functionName: Name of generated function
+    :type functionName: str
+    """
+
+    def __init__(self, graph, functionName="run"):
+        self.graph = graph
+        self.functionName = functionName
+        self._functions = {}
+        self._constants = []
+        self._names = set()
+        self._nodeNames = {}
+        self._parameters = {}
+        self._stateVariables = {}
+        self._lines = []
+        self._executing = []
+
+    # naming
+
+    def _uniqueName(self, name):
+        name = re.sub(r"\W", "_", name)
+        if not name or name[0].isdigit():
+            name = "_" + name
+        candidate = name
+        index = 1
+        while candidate in self._names:
+            candidate = "{0}_{1}".format(name, index)
+            index += 1
+        self._names.add(candidate)
+        return candidate
+
+    def nodeVariable(self, node):
+        name = self._nodeNames.get(node)
+        if name is None:
+            name = self._uniqueName(node.getName())
+            self._nodeNames[node] = name
+        return name
+
+    def pinVariable(self, pin):
+        return "{0}_{1}".format(
+            self.nodeVariable(pin.owningNode()), re.sub(r"\W", "_", pin.name)
+        )
+
+    def functionVariable(self, foo):
+        name = self._functions.get(foo)
+        if name is None:
+            name = "_f{0}_{1}".format(len(self._functions), foo.__name__)
+            self._functions[foo] = name
+        return name
+
+    def literal(self, value):
+        """Returns expression producing value
+
+        Values which have no literal form are pickled to module constants.
+        """
+        if isinstance(value, float) and not math.isfinite(value):
+            return 'float("{}")'.format(value)
+        if _isLiteral(value):
+            return repr(value)
+        try:
+            self._constants.append(pickle.dumps(value, protocol=2))
+        except Exception as e:
+            raise GraphCompilationError(
+                "Value {0!r} can not be embedded to compiled graph. {1}".format(
+                    value, e
+                )
+            )
+        return "_CONSTANTS[{}]".format(len(self._constants) - 1)
+
+    # output
+
+    def emit(self, line, indent):
+        self._lines.append("    " * indent + line)
+
+    # data path
+
+    def inputExpression(self, pin, scope, indent):
+        """Returns expression of input pin value, emitting code computing it if needed"""
+        for source in pin.affected_by:
+            return self.outputExpression(source, scope, indent)
+        return self.literal(pin.currentData())
+
+    def outputExpression(self, pin, scope, indent):
+        """Returns expression of output pin value, emitting code computing it if needed"""
+        node = pin.owningNode()
+        className = node.__class__.__name__
+
+        if node.isCompoundNode:
+            return self.inputExpression(node.outputsMap[pin], scope, indent)
+
+        if className == "graphInputs":
+            for compoundPin in pin.affected_by:
+                return self.inputExpression(compoundPin, scope, indent)
+            if pin not in self._parameters:
+                self._parameters[pin] = self._uniqueName(pin.name)
+            return self._parameters[pin]
+
+        if className == "reroute" or className == "rerouteExecs":
+            for inputPin in node.inputs.values():
+                return self.inputExpression(inputPin, scope, indent)
+
+        # value set by executed callable node
+        if node.isCallable():
+            return self.stateVariable(pin)
+
+        expression = scope.find(pin)
+        if expression is None:
+            self.computePureNode(node, scope, indent)
+            expression = scope.find(pin)
+        return expression
+
+    def stateVariable(self, pin):
+        if pin not in self._stateVariables:
+            self._stateVariables[pin] = self.pinVariable(pin)
+        return self._stateVariables[pin]
+
+    def callableDependencies(self, node, scope):
+        """Returns callable nodes pure node reads, directly or through other pure nodes"""
+        dependencies = set()
+        for pin in node.inputs.values():
+            for source in self.dataSources(pin):
+                upstream = source.owningNode()
+                if upstream.isCallable():
+                    dependencies.add(upstream)
+                else:
+                    upstreamDependencies = scope.findDependencies(upstream)
+                    if upstreamDependencies is not None:
+                        dependencies |= upstreamDependencies
+        return dependencies
+
+    def dataSources(self, pin):
+        """Returns output pins pin value comes from, looking through compounds and reroutes"""
+        sources = []
+        stack = list(pin.affected_by)
+        while stack:
+            source = stack.pop()
+            node = source.owningNode()
+            if source.direction == PinDirection.Input:
+                # compound input pin feeding graphInputs of compound
+                stack.extend(source.affected_by)
+            elif node.isCompoundNode:
+                stack.extend(node.outputsMap[source].affected_by)
+            elif node.__class__.__name__ == "graphInputs":
+                stack.extend(source.affected_by)
+            elif node.__class__.__name__ in ("reroute", "rerouteExecs"):
+                for inputPin in node.inputs.values():
+                    stack.extend(inputPin.affected_by)
+            else:
+                sources.append(source)
+        return sources
+
+    def computePureNode(self, node, scope, indent):
+        foo = getattr(node, "_function", None)
+        if foo is None:
+            raise GraphCompilationError(
+                "Node '{0}' of type '{1}' can not be compiled. Only function based pure nodes are supported in data path".format(
+                    node.getName(), node.__class__.__name__
+                )
+            )
+        self.emitFunctionCall(node, foo, scope, indent)
+        scope.dependencies[node] = self.callableDependencies(node, scope)
+        for pin in node.outputs.values():
+            scope.values[pin] = self.pinVariable(pin)
+
+    def emitFunctionCall(self, node, foo, scope, indent):
+        """Emits call of node function. Values are assigned to output pin variables"""
+        arguments = []
+        refs = []
+        for pin in node.orderedInputs.values():
+            if not pin.isExec():
+                arguments.append(
+                    "{0}={1}".format(pin.name, self.inputExpression(pin, scope, indent))
+                )
+        for pin in node.orderedOutputs.values():
+            if not pin.isExec() and pin.name != "out":
+                refs.append(pin)
+                arguments.append("{0}={1}_ref".format(pin.name, self.pinVariable(pin)))
+
+        for pin in refs:
+            self.emit(
+                "{0}_ref = _Ref({1})".format(
+                    self.pinVariable(pin), self.literal(pin.defaultValue())
+                ),
+                indent,
+            )
+        call = "{0}({1})".format(self.functionVariable(foo), ", ".join(arguments))
+        if "out" in node.namePinOutputsMap:
+            self.emit(
+                "{0} = {1}".format(self.pinVariable(node.getPinByName("out")), call),
+                indent,
+            )
+        else:
+            self.emit(call, indent)
+        for pin in refs:
+            self.emit(
+                "{0} = {0}_ref.value".format(self.pinVariable(pin)),
+                indent,
+            )
+
+    # control flow
+
+    def emitExecChain(self, execPin, scope, indent):
+        """Emits code executed when exec output pin is called"""
+        for target in list(execPin.affects):
+            node = target.owningNode()
+            className = node.__class__.__name__
+            if node.isCompoundNode:
+                self.emitExecChain(node.inputsMap[target], scope, indent)
+            elif className == "graphOutputs":
+                # leaving compound
+                for compound in self._compoundsOf(node):
+                    for outPin, innerPin in compound.outputsMap.items():
+                        if innerPin is target:
+                            self.emitExecChain(outPin, scope, indent)
+            elif className == "rerouteExecs":
+                for outPin in node.outputs.values():
+                    self.emitExecChain(outPin, scope, indent)
+            else:
+                self.emitNodeExecution(node, target, scope, indent)
+
+    def _compoundsOf(self, graphOutputsNode):
+        graph = graphOutputsNode.graph()
+        parent = graph.parentGraph
+        if parent is None:
+            return []
+        return [
+            node
+            for node in parent.getNodesList()
+            if node.isCompoundNode and getattr(node, "rawGraph", None) is graph
+        ]
+
+    def emitNodeExecution(self, node, execPin, scope, indent):
+        if node in self._executing:
+            raise GraphCompilationError(
+                "Exec cycle through node '{}' can not be compiled".format(
+                    node.getName()
+                )
+            )
+        self._executing.append(node)
+        try:
+            foo = getattr(node, "_function", None)
+            translator = EXEC_NODE_TRANSLATORS.get(node.__class__.__name__)
+            if foo is not None:
+                self.emitFunctionCall(node, foo, scope, indent)
+                for pin in node.outputs.values():
+                    if not pin.isExec():
+                        self.stateVariable(pin)
+                scope.invalidate(node)
+                for pin in node.orderedOutputs.values():
+                    if pin.isExec():
+                        self.emitExecChain(pin, scope, indent)
+            elif translator is not None:
+                translator(self, node, execPin, scope, indent)
+            else:
+                raise GraphCompilationError(
+                    "Node '{0}' of type '{1}' can not be compiled".format(
+                        node.getName(), node.__class__.__name__
+                    )
+                )
+        finally:
+            self._executing.pop()
+
+    def emitBlock(self, execPin, scope, indent):
+        """Emits nested block, adding pass if it is empty
+
+        :returns: Whether block has any code
+        :rtype: bool
+        """
+        count = len(self._lines)
+        self.emitExecChain(execPin, _Scope(scope), indent)
+        if len(self._lines) == count:
+            self.emit("pass", indent)
+            return False
+        return True
+
+    # module
+
+    def compile(self):
+        """Returns source of python module
+
+        :rtype: str
+        """
+        root = self.graph
+        inputNodes = root.getNodesList(classNameFilters=["graphInputs"])
+        outputNodes = root.getNodesList(classNameFilters=["graphOutputs"])
+        self._names.add(self.functionName)
+        self._lines = []
+        scope = _Scope()
+
+        for node in inputNodes:
+            for pin in node.orderedOutputs.values():
+                if not pin.isExec():
+                    self._parameters[pin] = self._uniqueName(pin.name)
+        for node in inputNodes:
+            for pin in node.orderedOutputs.values():
+                if pin.isExec():
+                    self.emitExecChain(pin, scope, 1)
+
+        results = []
+        for node in outputNodes:
+            for pin in node.orderedInputs.values():
+                if not pin.isExec():
+                    results.append(
+                        "{0!r}: {1}".format(pin.name, self.inputExpression(pin, scope, 1))
+                    )
+        body = self._lines
+        self._lines = []
+
+        parameters = [
+            "{0}={1}".format(name, self.literal(pin.currentData()))
+            for pin, name in self._parameters.items()
+        ]
+        stateLines = [
+            "    {0} = {1}".format(name, self.literal(pin.defaultValue()))
+            for pin, name in self._stateVariables.items()
+        ]
+
+        header = [
+            '"""Generated by uflow graph compiler from graph {!r}. Do not edit."""'.format(
+                root.name
+            ),
+            "",
+            "import pickle as _pickle",
+            "import base64 as _base64",
+            "from importlib import import_module as _importModule",
+            "",
+            "",
+            "def _resolve(moduleName, qualifiedName):",
+            "    obj = _importModule(moduleName)",
+            '    for part in qualifiedName.split("."):',
+            "        obj = getattr(obj, part)",
+            "    return obj",
+            "",
+            "",
+            "class _Ref(object):",
+            '    __slots__ = ("value",)',
+            "",
+            "    def __init__(self, value=None):",
+            "        self.value = value",
+            "",
+            "    def __call__(self, value):",
+            "        self.value = value",
+            "",
+            "",
+        ]
+        for foo, name in self._functions.items():
+            header.append(
+                "{0} = _resolve({1!r}, {2!r})".format(
+                    name, foo.__module__, foo.__qualname__
+                )
+            )
+        header.append(
+            "_CONSTANTS = [{}]".format(
+                ", ".join(
+                    "_pickle.loads(_base64.b64decode({!r}))".format(
+                        base64.b64encode(data)
+                    )
+                    for data in self._constants
+                )
+            )
+        )
+        header.extend(["", ""])
+        header.append(
+            "def {0}({1}):".format(self.functionName, ", ".join(parameters))
+        )
+        footer = ["    return {{{}}}".format(", ".join(results)), ""]
+        return "\n".join(header + stateLines + body + footer)
+
+
+def _translateBranch(compiler, node, execPin, scope, indent):
+    condition = compiler.inputExpression(node.getPinByName("Condition"), scope, indent)
+    compiler.emit("if {}:".format(condition), indent)
+    compiler.emitBlock(node.getPinByName("True"), scope, indent + 1)
+    compiler.emit("else:", indent)
+    if not compiler.emitBlock(node.getPinByName("False"), scope, indent + 1):
+        del compiler._lines[-2:]
+    scope.invalidate(node)
+
+
+def _translateSequence(compiler, node, execPin, scope, indent):
+    for pin in node.orderedOutputs.values():
+        if pin.isExec():
+            compiler.emitExecChain(pin, scope, indent)
+
+
+def _translateForLoop(compiler, node, execPin, scope, indent):
+    start = compiler.inputExpression(node.getPinByName("Start"), scope, indent)
+    stop = compiler.inputExpression(node.getPinByName("Stop"), scope, indent)
+    step = compiler.inputExpression(node.getPinByName("Step"), scope, indent)
+    index = compiler.stateVariable(node.getPinByName("Index"))
+    compiler.emit("for {0} in range({1}, {2}, {3}):".format(index, start, stop, step), indent)
+    scope.invalidate(node)
+    compiler.emitBlock(node.getPinByName("LoopBody"), scope, indent + 1)
+    scope.invalidate(node)
+    compiler.emitExecChain(node.getPinByName("Completed"), scope, indent)
+
+
+#: Translators of class based exec nodes by class name.
+#: Translator is called with compiler, node, exec input pin being called, scope and indentation level
+EXEC_NODE_TRANSLATORS = {
+    "branch": _translateBranch,
+    "sequence": _translateSequence,
+    "forLoop": _translateForLoop,
+}
+
+
+def compileGraph(graph, functionName="run"):
+    """Compiles graph to source of python module
+
+    :param graph: Root graph to compile
+    :type graph: :class:`~uflow.Core.GraphBase.GraphBase`
+    :param functionName: Name of generated function
+    :type functionName: str
+    :raises GraphCompilationError: If graph contains nodes which can not be compiled
+    :rtype: str
+    """
+    return GraphCompiler(graph, functionName).compile()
@@ -0,0 +1,259 @@
+"""
+.. sidebar:: **GraphContainer.py**
+
+    Compact chunked container for serialized graphs.
+
+Alternative to indented json ``.pygraph`` files for large graphs. Data produced by
+:meth:`~uflow.Core.GraphManager.GraphManager.serialize` is split to sections, one for root graph and one
+for every compound subgraph. Sections are stored as compact json compressed with zlib, after table of
+contents which holds their offsets.
+
+Layout:
+::
+
+    MAGIC | table of contents size (uint64) | table of contents (json) | section 0 | section 1 | ...
+
+Reading decodes only root section. Subgraph of compound node is replaced with :class:`LazySection`,
+dictionary which decodes its section when it is accessed first time, usually when compound node restores
+its graph. Tools which inspect only root graph, like command line argument parsing, never decode subgraphs.
+
+:func:`~uflow.Core.BulkLoad.readGraphFile` recognizes container by magic bytes, so files of both formats
+can have any extension. :func:`writeGraphFile` writes container for :data:`CONTAINER_EXTENSION` files.
+
+Example:
+::
+
+    writeGraphFile("big.pygraphc", graphManager.serialize())
+    graphManager.deserialize(readGraphFile("big.pygraphc"))
+"""
+
+import json
+import zlib
+import struct
+import threading
+
+MAGIC = b"UFLOWGC\x01"
+FORMAT_VERSION = 1
+#: Files with this extension are written as container by :func:`writeGraphFile`
+CONTAINER_EXTENSION = ".pygraphc"
+#: zlib level, low levels compress repetitive graph json nearly as well and much faster
+DEFAULT_COMPRESSION = 3
+#: Key of placeholder which replaces subgraph moved to own section
+SECTION_KEY = "$section"
+_SIZE = struct.Struct("<Q")
+
+
+def isContainerFile(filePath):
+    """Returns whether file starts with container magic bytes
+
+    :rtype: bool
+    """
+    with open(filePath, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _splitSections(graphData, sections, name):
+    """Replaces compound subgraphs with section placeholders. Input dictionaries are not modified"""
+    index = len(sections)
+    sections.append(None)
+    entry = {"graph": name}
+    nodes = []
+    for nodeJson in graphData.get("nodes", ()):
+        subgraph = nodeJson.get("graphData")
+        if isinstance(subgraph, dict) and "nodes" in subgraph:
+            nodeJson = dict(nodeJson)
+            subIndex = _splitSections(subgraph, sections, name + "/" + nodeJson["name"])
+            nodeJson["graphData"] = {SECTION_KEY: subIndex}
+        nodes.append(nodeJson)
+    section = dict(graphData)
+    section["nodes"] = nodes
+    sections[index] = (entry, section)
+    return index
+
+
+def writeContainer(filePath, data, compression=DEFAULT_COMPRESSION):
+    """Writes serialized graph to container file
+
+    :param filePath: Target file
+    :type filePath: str
+    :param data: Serialized graph, as returned by :meth:`~uflow.Core.GraphManager.GraphManager.serialize`
+    :type data: dict
+    :param compression: zlib compression level
+    :type compression: int
+    :returns: Number of written bytes
+    :rtype: int
+    """
+    sections = []
+    _splitSections(data, sections, "root")
+    chunks = []
+    toc = {"formatVersion": FORMAT_VERSION, "codec": "zlib", "sections": []}
+    offset = 0
+    for entry, section in sections:
+        raw = json.dumps(section, separators=(",", ":")).encode("utf-8")
+        chunk = zlib.compress(raw, compression)
+        entry["offset"] = offset
+        entry["size"] = len(chunk)
+        entry["rawSize"] = len(raw)
+        toc["sections"].append(entry)
+        chunks.append(chunk)
+        offset += len(chunk)
+    tocBytes = json.dumps(toc, separators=(",", ":")).encode("utf-8")
+    with open(filePath, "wb") as f:
+        f.write(MAGIC)
+        f.write(_SIZE.pack(len(tocBytes)))
+        f.write(tocBytes)
+        for chunk in chunks:
+            f.write(chunk)
+    return len(MAGIC) + _SIZE.size + len(tocBytes) + offset
+
+
+class GraphContainer(object):
+    """Opened container. Whole file is read to memory compressed, sections are decompressed on demand
+
+    :param filePath: Container file
+    :type filePath: str
+    :var sections: Table of contents entries, section index to dict with ``graph``, ``offset``,
+        ``size`` and ``rawSize`` keys
+    """
+
+    def __init__(self, filePath):
+        self.filePath = filePath
+        with open(filePath, "rb") as f:
+            payload = f.read()
+        if payload[: len(MAGIC)] != MAGIC:
+            raise ValueError("{0} is not graph container".format(filePath))
+        tocSize = _SIZE.unpack_from(payload, len(MAGIC))[0]
+        tocStart = len(MAGIC) + _SIZE.size
+        toc = json.loads(payload[tocStart : tocStart + tocSize].decode("utf-8"))
+        if toc["formatVersion"] > FORMAT_VERSION:
+            raise ValueError(
+                "{0} has container format {1}, newest supported is {2}".format(
+                    filePath, toc["formatVersion"], FORMAT_VERSION
+                )
+            )
+        self.sections = toc["sections"]
+        self._payload = memoryview(payload)[tocStart + tocSize :]
+        self._lock = threading.Lock()
+        self.decodedSections = 0
+
+    def section(self, index):
+        """Decodes section. Subgraphs in it are :class:`LazySection` placeholders
+
+        :param index: Section index
+        :type index: int
+        :rtype: dict
+        """
+        entry = self.sections[index]
+        chunk = self._payload[entry["offset"] : entry["offset"] + entry["size"]]
+        data = json.loads(zlib.decompress(chunk).decode("utf-8"))
+        for nodeJson in data.get("nodes", ()):
+            subgraph = nodeJson.get("graphData")
+            if isinstance(subgraph, dict) and SECTION_KEY in subgraph:
+                nodeJson["graphData"] = LazySection(self, subgraph[SECTION_KEY])
+        with self._lock:
+            self.decodedSections += 1
+        return data
+
+    def root(self):
+        """Decodes root section
+
+        :rtype: dict
+        """
+        return self.section(0)
+
+
+def _loading(name):
+    method = getattr(dict, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._load()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+class LazySection(dict):
+    """Subgraph which is decoded from container on first access
+
+    Until then dictionary holds only section placeholder, so json encoders which check size
+    before they list items still see it as not empty.
+    """
+
+    def __init__(self, container, index):
+        dict.__init__(self, {SECTION_KEY: index})
+        self._container = container
+        self._index = index
+
+    @property
+    def bLoaded(self):
+        return self._container is None
+
+    def _load(self):
+        container = self._container
+        if container is None:
+            return
+        data = container.section(self._index)
+        with container._lock:
+            # other thread could load section meanwhile
+            if self._container is not None:
+                dict.clear(self)
+                dict.update(self, data)
+                self._container = None
+
+    for _name in (
+        "__getitem__",
+        "__setitem__",
+        "__delitem__",
+        "__contains__",
+        "__iter__",
+        "__len__",
+        "__eq__",
+        "__ne__",
+        "__repr__",
+        "get",
+        "keys",
+        "items",
+        "values",
+        "copy",
+        "pop",
+        "popitem",
+        "setdefault",
+        "update",
+    ):
+        locals()[_name] = _loading(_name)
+    del _name
+
+    def __reduce__(self):
+        # pickled and deep copied as plain dictionary, container is not shared between processes
+        return dict, (dict(self.items()),)
+
+
+def writeGraphFile(filePath, data, container=None, indent=4, targetPath=None):
+    """Writes serialized graph as json or container
+
+    Blobs referenced by data are copied to blob directory of graph first,
+    see :mod:`~uflow.Core.BlobStore`.
+
+    :param filePath: Target file
+    :type filePath: str
+    :param data: Serialized graph
+    :type data: dict
+    :param container: Write container. Decided by :data:`CONTAINER_EXTENSION` if None
+    :type container: bool or None
+    :param indent: Indentation of json files
+    :type indent: int or None
+    :param targetPath: Final graph path, when file is written to temporary path and moved later.
+        Blob directory belongs to this path
+    :type targetPath: str or None
+    """
+    from uflow.Core.BlobStore import BlobStore
+
+    BlobStore().export(data, targetPath or filePath)
+    if container is None:
+        container = filePath.endswith(CONTAINER_EXTENSION)
+    if container:
+        writeContainer(filePath, data)
+    else:
+        with open(filePath, "w") as f:
+            json.dump(data, f, indent=indent)
@@ -0,0 +1,157 @@
+"""
+.. sidebar:: **GraphExecutor.py**
+
+    Graph loaded once and executed many times with different inputs.
+
+Values are passed to output pins of root graph ``graphInputs`` nodes by pin name,
+exec pins of ``graphInputs`` are called and values of ``graphOutputs`` input pins are returned.
+
+Example:
+::
+
+    INITIALIZE(headless=True)
+    executor = GraphExecutor.fromFile("sum.pygraph")
+    print(executor.execute({"a": 1, "b": 2}))
+"""
+
+import json
+
+from uflow.Core.GraphManager import GraphManager
+from uflow.Core.GraphRunner import GraphRunner
+from uflow.Core.EvaluationEngine import DefaultEvaluationEngine_Impl
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.IntermediateRelease import IntermediateReleaser
+from uflow.Core.BulkLoad import LoadTimings, readGraphFile
+
+
+class GraphExecutionError(Exception):
+    """Raised when some nodes failed while graph was executed"""
+
+    pass
+
+
+class GraphExecutor(object):
+    """Graph instance with own :class:`~uflow.Core.GraphManager.GraphManager`
+
+    :param graphData: Serialized graph
+    :type graphData: dict
+    :param graphManager: Manager to load graph into. New one is created if not specified.
+        Process wide :class:`~uflow.Core.GraphManager.GraphManagerSingleton` manager should be
+        used when executor is the only graph in process, so path lookups of nodes work
+    :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager` or None
+    :param releaseIntermediates: Free intermediate values as soon as they are consumed,
+        see :mod:`~uflow.Core.IntermediateRelease`
+    :type releaseIntermediates: bool
+    :param loadTimings: Loading phases are timed here, see :mod:`~uflow.Core.BulkLoad`
+    :type loadTimings: :class:`~uflow.Core.BulkLoad.LoadTimings` or None
+    """
+
+    def __init__(
+        self, graphData, graphManager=None, releaseIntermediates=False, loadTimings=None
+    ):
+        self.graphData = graphData
+        self.bReleaseIntermediates = releaseIntermediates
+        self.graphManager = graphManager if graphManager is not None else GraphManager()
+        self.graphManager.deserialize(graphData, loadTimings)
+        root = self.graphManager.findRootGraph()
+
+        self.inputPins = {}
+        self.execPins = []
+        for node in root.getNodesList(classNameFilters=["graphInputs"]):
+            for pin in node.orderedOutputs.values():
+                if pin.isExec():
+                    self.execPins.append(pin)
+                else:
+                    self.inputPins[pin.name] = pin
+        self.defaultInputs = {
+            name: pin.currentData() for name, pin in self.inputPins.items()
+        }
+
+        self.outputPins = {}
+        self.outputNodes = root.getNodesList(classNameFilters=["graphOutputs"])
+        for node in self.outputNodes:
+            for pin in node.orderedInputs.values():
+                if not pin.isExec():
+                    self.outputPins[pin.name] = pin
+
+    @classmethod
+    def fromFile(cls, filePath, graphManager=None, releaseIntermediates=False):
+        """Loads graph from ``.pygraph`` file
+
+        :rtype: :class:`GraphExecutor`
+        """
+        timings = LoadTimings()
+        graphData = readGraphFile(filePath, timings)
+        return cls(graphData, graphManager, releaseIntermediates, timings)
+
+    def inputNames(self):
+        return list(self.inputPins.keys())
+
+    def outputNames(self):
+        return list(self.outputPins.keys())
+
+    def execute(self, inputs):
+        """Sets inputs, runs graph until it is idle and returns outputs
+
+        :param inputs: Values by ``graphInputs`` pin name. Missing inputs get values stored in graph
+        :type inputs: dict
+        :raises ValueError: If inputs contain unknown pin names
+        :raises GraphExecutionError: If some nodes failed
+        :returns: Values by ``graphOutputs`` pin name
+        :rtype: dict
+        """
+        unknown = set(inputs) - set(self.inputPins)
+        if unknown:
+            raise ValueError(
+                "Unknown graph inputs: {}".format(", ".join(sorted(unknown)))
+            )
+        for name, pin in self.inputPins.items():
+            pin.setData(inputs.get(name, self.defaultInputs[name]))
+
+        self.graphManager.terminationRequested = False
+        if self.bReleaseIntermediates:
+            with IntermediateReleaser(self.graphManager, self.outputNodes):
+                self._evaluate()
+        else:
+            self._evaluate()
+
+        outputs = {name: pin.getData() for name, pin in self.outputPins.items()}
+        MemoryManager().enforceBudget(self.graphManager)
+        errors = [
+            "{0}: {1}".format(node.getName(), node.getLastErrorMessage())
+            for node in self.graphManager.getAllNodes()
+            if not node.isValid()
+        ]
+        if errors:
+            raise GraphExecutionError("\n".join(errors))
+        return outputs
+
+    def _evaluate(self):
+        # polling nodes must not keep request running
+        runner = GraphRunner(self.graphManager, waitForActive=False)
+        runner.run([pin.call for pin in self.execPins])
+
+        # pure nodes are computed on demand only, nothing pulls graph outputs
+        for outputNode in self.outputNodes:
+            for node in DefaultEvaluationEngine_Impl.getEvaluationOrderIterative(
+                outputNode
+            ):
+                node.processNode()
+
+    def encodeOutputs(self, outputs):
+        """Converts output values to json compatible data using pins encoders
+
+        :param outputs: Values returned by :meth:`execute`
+        :type outputs: dict
+        :rtype: dict
+        """
+        return {
+            name: json.loads(
+                json.dumps(value, cls=self.outputPins[name].jsonEncoderClass())
+            )
+            for name, value in outputs.items()
+        }
+
+    def reload(self):
+        """Recreates graph from serialized data, dropping all state"""
+        self.__init__(self.graphData, self.graphManager, self.bReleaseIntermediates)
@@ -1,6 +1,11 @@
 from blinker import Signal
 
 from uflow.Core.GraphBase import GraphBase
+from uflow.Core.GraphRunner import TickScheduler
+from uflow.Core.Tracer import Tracer
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.BulkLoad import BulkLoader
+from uflow.Core.NameIndex import NameRegistry
 from uflow.Core.Common import *
 from uflow.Core import version
 
@@ -18,6 +23,16 @@ class GraphManager(object):
     def __init__(self):
         super(GraphManager, self).__init__()
         self.terminationRequested = False  #: used by cli only
+        self.tickScheduler = TickScheduler()  #: deadlines requested by nodes, see :class:`~uflow.Core.GraphRunner.GraphRunner`
+        self.intermediateReleaser = None  #: active :class:`~uflow.Core.IntermediateRelease.IntermediateReleaser`
+        self.bulkLoader = None  #: active :class:`~uflow.Core.BulkLoad.BulkLoader`
+        self.lastLoadTimings = None  #: :class:`~uflow.Core.BulkLoad.LoadTimings` of last loaded graph
+        self.names = NameRegistry(self)  #: names of graphs, nodes, variables and pins
+        self._nodesByUid = {}
+        self._pinsByUid = {}
+        self._paths = None
+        self.names.registered.connect(self._onRegistered)
+        self.names.unregistered.connect(self._onUnregistered)
         self.graphChanged = Signal(object)
         self._graphs = {}
         self._activeGraph = None
@@ -63,6 +78,7 @@ class GraphManager(object):
         if graph is not None:
             graph.clear()
             self._graphs.pop(graph.uid)
+            graph.killed.send()
             if graph.parentGraph is not None:
                 if graph in graph.parentGraph.childGraphs:
                     graph.parentGraph.childGraphs.remove(graph)
@@ -77,16 +93,20 @@ class GraphManager(object):
         if graph.uid in self._graphs:
             graph.clear()
             self._graphs.pop(graph.uid)
+            graph.killed.send()
             if graph.parentGraph is not None:
                 if graph in graph.parentGraph.childGraphs:
                     graph.parentGraph.childGraphs.remove(graph)
             del graph
 
-    def deserialize(self, data):
+    def deserialize(self, data, timings=None):
         """Populates itself from serialized data
 
         :param data: Serialized data
         :type data: dict
+        :param timings: Loading phases are timed here, parse time of data can be already counted.
+            Available as :attr:`lastLoadTimings` after loading either way
+        :type timings: :class:`~uflow.Core.BulkLoad.LoadTimings` or None
         """
         if "fileVersion" in data:
             fileVersion = version.Version.fromString(
@@ -97,7 +117,8 @@ class GraphManager(object):
             pass
         self.clear(keepRoot=False)
         self._activeGraph = GraphBase(str("root"), self)
-        self._activeGraph.populateFromJson(data)
+        with BulkLoader(self, timings):
+            self._activeGraph.populateFromJson(data)
         self._activeGraph.setIsRoot(True)
         self.selectGraph(self._activeGraph)
 
@@ -111,6 +132,7 @@ class GraphManager(object):
         self.removeGraphByName(ROOT_GRAPH_NAME)
         self._graphs.clear()
         self._graphs = {}
+        self.names.clear()
         del self._activeGraph
         self._activeGraph = None
         if keepRoot:
@@ -124,8 +146,16 @@ class GraphManager(object):
         :param deltaTime: Elapsed time from last call
         :type deltaTime: float
         """
+        tracer = Tracer()
+        start = tracer.begin()
         for graph in self._graphs.values():
             graph.Tick(deltaTime)
+        # every node has just been ticked, scheduled deadlines are satisfied
+        self.tickScheduler.popDue(time.monotonic())
+        # evaluation triggered by ticks is finished, intermediates can be dropped safely
+        MemoryManager().enforceBudget(self)
+        if tracer.bEnabled:
+            tracer.complete("Tick", "tick", start)
 
     def findVariableRefs(self, variable):
         """Returns a list of variable accessors spawned across all graphs
@@ -173,12 +203,72 @@ class GraphManager(object):
         :type name: str
         :rtype: :class:`~uflow.Core.NodeBase.NodeBase`
         """
-        result = None
-        for graph in self.getAllGraphs():
-            result = graph.findNode(name)
-            if result is not None:
-                break
-        return result
+        return self.names.findNode(name)
+
+    @property
+    def paths(self):
+        """Paths to nodes and pins of this graph manager, built on first access and kept up to date after
+
+        :rtype: :class:`~uflow.Core.PathsRegistry.GraphPaths`
+        """
+        if self._paths is None:
+            from uflow.Core.PathsRegistry import GraphPaths
+
+            self._paths = GraphPaths(self)
+        return self._paths
+
+    def findNodeByUid(self, uid):
+        """Finds a node across all graphs
+
+        :param uid: Node unique identifier
+        :type uid: :class:`~uuid.UUID`
+        :rtype: :class:`~uflow.Core.NodeBase.NodeBase` or None
+        """
+        return self._nodesByUid.get(uid)
+
+    def findPinByUid(self, uid):
+        """Finds a pin across all graphs
+
+        :param uid: Pin unique identifier
+        :type uid: :class:`~uuid.UUID`
+        :rtype: :class:`~uflow.Core.PinBase.PinBase` or None
+        """
+        return self._pinsByUid.get(uid)
+
+    def _onRegistered(self, obj, kind=None, graph=None):
+        if kind == "node":
+            self._nodesByUid[obj.uid] = obj
+        elif kind == "pin":
+            self._pinsByUid[obj.uid] = obj
+            graph._pinsByUid[obj.uid] = obj
+
+    def _onUnregistered(self, obj, kind=None, graph=None):
+        if kind == "node":
+            if self._nodesByUid.get(obj.uid) is obj:
+                del self._nodesByUid[obj.uid]
+        elif kind == "pin":
+            if self._pinsByUid.get(obj.uid) is obj:
+                del self._pinsByUid[obj.uid]
+            if graph._pinsByUid.get(obj.uid) is obj:
+                del graph._pinsByUid[obj.uid]
+
+    def uidChanged(self, entity, oldUid):
+        """Updates uid indexes. Called by node and pin when their uid is changed, usually on deserialization
+
+        :param entity: Node or pin
+        :param oldUid: Previous unique identifier
+        :type oldUid: :class:`~uuid.UUID`
+        """
+        if self._nodesByUid.get(oldUid) is entity:
+            del self._nodesByUid[oldUid]
+            self._nodesByUid[entity.uid] = entity
+        elif self._pinsByUid.get(oldUid) is entity:
+            del self._pinsByUid[oldUid]
+            self._pinsByUid[entity.uid] = entity
+            graphPins = entity.owningNode().graph()._pinsByUid
+            if graphPins.get(oldUid) is entity:
+                del graphPins[oldUid]
+            graphPins[entity.uid] = entity
 
     def findVariableByUid(self, uuid):
         """Finds a variable across all graphs
@@ -234,6 +324,7 @@ class GraphManager(object):
         """
         graph.name = self.getUniqGraphName(graph.name)
         self._graphs[graph.uid] = graph
+        self.names.addGraph(graph)
 
     def activeGraph(self):
         """Returns active graph
@@ -322,12 +413,7 @@ class GraphManager(object):
 
         :rtype: str
         """
-        existingNames = []
-        for node in graph.getNodesList(
-            classNameFilters=["graphInputs", "graphOutputs"]
-        ):
-            existingNames.extend([pin.name for pin in node.pins])
-        return getUniqNameFromList(existingNames, name)
+        return graph.graphManager.names.graphPins(graph).uniqName(name)
 
     def getAllNames(self):
         """Returns list of all registered names
@@ -336,12 +422,7 @@ class GraphManager(object):
 
         :rtype: list(str)
         """
-        existingNames = [g.name for g in self.getAllGraphs()]
-        existingNames.extend([n.name for n in self.getAllNodes()])
-        existingNames.extend([var.name for var in self.getAllVariables()])
-        for node in self.getAllNodes():
-            existingNames.extend([pin.name for pin in node.pins])
-        return existingNames
+        return self.names.all.names()
 
     def getUniqName(self, name):
         """Returns unique name
@@ -350,8 +431,7 @@ class GraphManager(object):
         :type name: str
         :rtype: str
         """
-        existingNames = self.getAllNames()
-        return getUniqNameFromList(existingNames, name)
+        return self.names.all.uniqName(name)
 
     def getUniqGraphName(self, name):
         """Returns unique graph name
@@ -360,8 +440,7 @@ class GraphManager(object):
         :type name: str
         :rtype: str
         """
-        existingNames = [g.name for g in self.getAllGraphs()]
-        return getUniqNameFromList(existingNames, name)
+        return self.names.graphs.uniqName(name)
 
     def getUniqNodeName(self, name):
         """Returns unique node name
@@ -370,8 +449,7 @@ class GraphManager(object):
         :type name: str
         :rtype: str
         """
-        existingNames = [n.name for n in self.getAllNodes()]
-        return getUniqNameFromList(existingNames, name)
+        return self.names.nodes.uniqName(name)
 
     def getUniqVariableName(self, name):
         """Returns unique variable name
@@ -380,8 +458,7 @@ class GraphManager(object):
         :type name: str
         :rtype: str
         """
-        existingNames = [var.name for var in self.getAllVariables()]
-        return getUniqNameFromList(existingNames, name)
+        return self.names.variables.uniqName(name)
 
     def plot(self):
         """Prints all data to console. May be useful for debugging"""
@@ -0,0 +1,215 @@
+"""
+.. sidebar:: **GraphRunner.py**
+
+    Event driven execution of graphs outside of editor.
+
+:class:`GraphRunner` calls entry points (usually exec pins of ``graphInputs`` nodes) and then sleeps
+until something needs time to pass:
+
+* Nodes request single :meth:`~uflow.Core.NodeBase.NodeBase.Tick` call with
+  :meth:`~uflow.Core.NodeBase.NodeBase.scheduleTick`. Deadlines are kept in :class:`TickScheduler` heap
+* Nodes which return True from :meth:`~uflow.Core.NodeBase.NodeBase.isTickActive` are ticked
+  every ``tickInterval`` seconds while active. By default these are nodes overriding ``Tick``
+* Inactive nodes overriding tick methods and nodes whose ``tick`` signal has receivers (ui wrappers of nodes)
+  are ticked whenever runner wakes up, but they do not keep runner awake
+
+Node is ticked at most once per wake up. Scheduled tick replaces regular tick of the same wake up.
+Memory budget is enforced after entry points return and after every tick pass.
+
+Runner exits when no deadlines remain and no node is active, or when
+:attr:`~uflow.Core.GraphManager.GraphManager.terminationRequested` is set.
+With ``waitForActive`` disabled active nodes do not keep it running.
+In keep alive mode it wakes up every ``tickInterval`` seconds until stopped.
+"""
+
+import heapq
+import time
+import weakref
+import threading
+import itertools
+
+from uflow.Core.Tracer import Tracer
+from uflow.Core.MemoryManager import MemoryManager
+
+
+class TickScheduler(object):
+    """Heap of nodes waiting for tick
+
+    :var wakeEvent: Set when new deadline is added, so sleeping runner can recompute its timeout
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self.wakeEvent = threading.Event()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, node, delay=0.0):
+        """Requests node tick after delay seconds
+
+        :param node: Node to tick
+        :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+        :param delay: Delay in seconds
+        :type delay: float
+        """
+        now = time.monotonic()
+        with self._lock:
+            heapq.heappush(
+                self._heap,
+                (now + max(delay, 0.0), next(self._counter), now, weakref.ref(node)),
+            )
+        self.wakeEvent.set()
+
+    def nextDeadline(self):
+        """Returns nearest deadline or None
+
+        :rtype: float or None
+        """
+        with self._lock:
+            while self._heap and self._heap[0][3]() is None:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def popDue(self, now):
+        """Removes deadlines which passed
+
+        :returns: Nodes and time they were scheduled at
+        :rtype: list(tuple(:class:`~uflow.Core.NodeBase.NodeBase`, float))
+        """
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, scheduledAt, nodeRef = heapq.heappop(self._heap)
+                node = nodeRef()
+                if node is not None:
+                    due.append((node, scheduledAt))
+        return due
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+    def wake(self):
+        self.wakeEvent.set()
+
+
+class GraphRunner(object):
+    """Runs graph until its work is done
+
+    :param graphManager: Graph manager holding graphs to run
+    :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager`
+    :param tickInterval: Interval between ticks of active nodes
+    :type tickInterval: float
+    :param keepAlive: If True, runner waits for external events instead of exiting when idle
+    :type keepAlive: bool
+    :param waitForActive: If False, active nodes are ticked but do not keep runner running,
+        only scheduled ticks do. Used when graph is executed per request
+    :type waitForActive: bool
+    """
+
+    def __init__(
+        self, graphManager, tickInterval=0.02, keepAlive=False, waitForActive=True
+    ):
+        self.graphManager = graphManager
+        self.tickInterval = tickInterval
+        self.keepAlive = keepAlive
+        self.waitForActive = waitForActive
+        self.ticks = 0
+        self.wakeups = 0
+        self.wallTime = 0.0
+
+    @property
+    def scheduler(self):
+        return self.graphManager.tickScheduler
+
+    def requestStop(self):
+        """Asks running loop to exit. Can be called from any thread"""
+        self.graphManager.terminationRequested = True
+        self.scheduler.wake()
+
+    def _tickCandidates(self):
+        """Returns nodes which need ticks: nodes overriding tick methods and nodes with tick receivers"""
+        from uflow.Core.NodeBase import NodeBase
+
+        return [
+            node
+            for node in self.graphManager.getAllNodes()
+            if node.tick.receivers
+            or type(node).Tick is not NodeBase.Tick
+            or type(node).isTickActive is not NodeBase.isTickActive
+        ]
+
+    def run(self, entryPoints=()):
+        """Calls entry points and runs until graph is idle
+
+        :param entryPoints: Callables started first, for example exec pins ``call`` methods
+        :type entryPoints: iterable(callable)
+        """
+        start = time.perf_counter()
+        self.ticks = 0
+        self.wakeups = 0
+        for foo in entryPoints:
+            foo()
+        memoryManager = MemoryManager()
+        memoryManager.enforceBudget(self.graphManager)
+
+        lastTick = time.monotonic()
+        while not self.graphManager.terminationRequested:
+            self.scheduler.wakeEvent.clear()
+            now = time.monotonic()
+
+            tracer = Tracer()
+            tickStart = tracer.begin()
+            ticks = self.ticks
+            ticked = set()
+            for node, scheduledAt in self.scheduler.popDue(now):
+                if node not in ticked:
+                    node.Tick(now - scheduledAt)
+                    ticked.add(node)
+                    self.ticks += 1
+
+            candidates = self._tickCandidates()
+            delta = now - lastTick
+            for node in candidates:
+                if node not in ticked:
+                    node.Tick(delta)
+                    self.ticks += 1
+            lastTick = now
+            if self.ticks != ticks:
+                # evaluation triggered by ticks is finished, intermediates can be dropped safely
+                memoryManager.enforceBudget(self.graphManager)
+            bActive = self.waitForActive and any(
+                node.isTickActive() for node in candidates
+            )
+            if tracer.bEnabled and self.ticks != ticks:
+                tracer.complete(
+                    "Tick", "tick", tickStart, {"nodes": self.ticks - ticks}
+                )
+
+            nextDeadline = self.scheduler.nextDeadline()
+            if not bActive and nextDeadline is None and not self.keepAlive:
+                break
+
+            timeout = None
+            if bActive or self.keepAlive:
+                # in keep alive mode nodes can become active by external events
+                timeout = self.tickInterval
+            if nextDeadline is not None:
+                untilDeadline = max(nextDeadline - time.monotonic(), 0.0)
+                timeout = untilDeadline if timeout is None else min(timeout, untilDeadline)
+            self.scheduler.wakeEvent.wait(timeout)
+            self.wakeups += 1
+
+        self.wallTime = time.perf_counter() - start
+
+    def report(self):
+        """Returns human readable run summary
+
+        :rtype: str
+        """
+        return "Finished in {0:.3f} s, {1} ticks, {2} wakeups".format(
+            self.wallTime, self.ticks, self.wakeups
+        )
@@ -0,0 +1,313 @@
+"""
+.. sidebar:: **GraphService.py**
+
+    Long lived http service executing preloaded graphs.
+
+Every served graph is deserialized into several :class:`~uflow.Core.GraphExecutor.GraphExecutor` instances
+once, when service starts. Requests are handled by threads, each request borrows free instance of requested
+graph and returns it when done, so concurrent requests never share graph state.
+
+Endpoints:
+
+* ``POST /run/<graph>`` - body is json object with values of ``graphInputs`` pins.
+  Responds with ``{"outputs": {...}, "elapsed": milliseconds}``
+* ``GET /health`` - service status and served graphs
+* ``GET /stats`` - request counters and latency percentiles per graph
+* ``GET /trace`` - recent events of :class:`~uflow.Core.Tracer.Tracer` in chrome trace format, if tracing is enabled
+
+Graph name is file name without ``.pygraph`` extension.
+
+Service listens on tcp port or on unix socket:
+::
+
+    service = GraphService(["sum.pygraph"], instances=4)
+    service.serve(port=8642)
+    service.serve(socketPath="/tmp/uflow.sock")
+"""
+
+import os
+import copy
+import json
+import time
+import queue
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+from uflow.Core.GraphExecutor import GraphExecutor, GraphExecutionError
+from uflow.Core.BulkLoad import readGraphFile
+from uflow.Core.Tracer import Tracer
+
+DEFAULT_PORT = 8642
+
+
+def _percentile(sortedValues, fraction):
+    if not sortedValues:
+        return 0.0
+    return sortedValues[int(round(fraction * (len(sortedValues) - 1)))]
+
+
+class LatencyStats(object):
+    """Request counters and latencies of recent requests
+
+    :param window: How many recent latencies are used for percentiles
+    :type window: int
+    """
+
+    def __init__(self, window=2048):
+        self.requests = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def add(self, latency, bError=False):
+        with self._lock:
+            self.requests += 1
+            if bError:
+                self.errors += 1
+            self._latencies.append(latency)
+
+    def snapshot(self):
+        """Returns counters and latency percentiles in milliseconds
+
+        :rtype: dict
+        """
+        with self._lock:
+            values = sorted(self._latencies)
+            requests = self.requests
+            errors = self.errors
+        return {
+            "requests": requests,
+            "errors": errors,
+            "p50": round(_percentile(values, 0.5) * 1000.0, 3),
+            "p90": round(_percentile(values, 0.9) * 1000.0, 3),
+            "p99": round(_percentile(values, 0.99) * 1000.0, 3),
+            "max": round(values[-1] * 1000.0, 3) if values else 0.0,
+        }
+
+
+class GraphPool(object):
+    """Warm instances of single graph
+
+    :param filePath: Path to ``.pygraph`` file
+    :type filePath: str
+    :param instances: Number of graph instances, maximum number of concurrent executions
+    :type instances: int
+    """
+
+    def __init__(self, filePath, instances=1):
+        self.filePath = filePath
+        self.name = os.path.splitext(os.path.basename(filePath))[0]
+        data = readGraphFile(filePath)
+        self.executors = [GraphExecutor(copy.deepcopy(data)) for _ in range(instances)]
+        self._free = queue.Queue()
+        for executor in self.executors:
+            self._free.put(executor)
+        self.stats = LatencyStats()
+
+    def available(self):
+        return self._free.qsize()
+
+    def execute(self, inputs, timeout=None):
+        """Executes graph on free instance
+
+        :param inputs: Values by ``graphInputs`` pin name
+        :type inputs: dict
+        :param timeout: How long to wait for free instance. Waits forever if None
+        :type timeout: float or None
+        :raises queue.Empty: If no instance became free in time
+        :returns: Json compatible values by ``graphOutputs`` pin name
+        :rtype: dict
+        """
+        executor = self._free.get(timeout=timeout)
+        try:
+            return executor.encodeOutputs(executor.execute(inputs))
+        except GraphExecutionError:
+            # failed run may leave nodes in any state
+            executor.reload()
+            raise
+        finally:
+            self._free.put(executor)
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def address_string(self):
+        # unix socket clients have no address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return self.server.server_address
+
+    def log_message(self, format, *args):
+        if self.service.bVerbose:
+            super(_RequestHandler, self).log_message(format, *args)
+
+    def _respond(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._respond(200, self.service.health())
+        elif self.path == "/stats":
+            self._respond(200, self.service.stats())
+        elif self.path == "/trace":
+            if Tracer().isEnabled():
+                self._respond(200, {"traceEvents": Tracer().events()})
+            else:
+                self._respond(404, {"error": "Tracing is disabled"})
+        else:
+            self._respond(404, {"error": "Unknown endpoint {}".format(self.path)})
+
+    def do_POST(self):
+        prefix = "/run/"
+        if not self.path.startswith(prefix):
+            self._respond(404, {"error": "Unknown endpoint {}".format(self.path)})
+            return
+        code, payload = self.service.run(
+            self.path[len(prefix) :],
+            self.rfile.read(int(self.headers.get("Content-Length", 0))),
+        )
+        self._respond(code, payload)
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+class GraphService(object):
+    """Serves graphs over http
+
+    :param filePaths: ``.pygraph`` files to serve
+    :type filePaths: list(str)
+    :param instances: Warm instances per graph, maximum number of concurrent executions of one graph
+    :type instances: int
+    :param timeout: Seconds request waits for free graph instance before 503 is returned
+    :type timeout: float
+    """
+
+    def __init__(self, filePaths, instances=4, timeout=30.0):
+        self.timeout = timeout
+        self.bVerbose = False
+        self.startedAt = time.time()
+        self.pools = {}
+        for filePath in filePaths:
+            pool = GraphPool(filePath, instances)
+            if pool.name in self.pools:
+                raise ValueError("Graph name '{}' is served twice".format(pool.name))
+            self.pools[pool.name] = pool
+        self._server = None
+
+    def run(self, graphName, body):
+        """Executes graph for request body
+
+        :param graphName: Name of served graph
+        :type graphName: str
+        :param body: Json encoded inputs
+        :type body: bytes
+        :returns: Http status code and response payload
+        :rtype: tuple(int, dict)
+        """
+        pool = self.pools.get(graphName)
+        if pool is None:
+            return 404, {"error": "Unknown graph '{}'".format(graphName)}
+        try:
+            inputs = json.loads(body.decode("utf-8")) if body else {}
+        except ValueError as e:
+            return 400, {"error": "Invalid json. {}".format(e)}
+        if not isinstance(inputs, dict):
+            return 400, {"error": "Inputs must be json object"}
+
+        start = time.perf_counter()
+        code = 200
+        try:
+            payload = {"outputs": pool.execute(inputs, self.timeout)}
+        except queue.Empty:
+            code, payload = 503, {"error": "No free instance of '{}'".format(graphName)}
+        except ValueError as e:
+            code, payload = 400, {"error": str(e)}
+        except GraphExecutionError as e:
+            code, payload = 500, {"error": str(e)}
+        except Exception as e:
+            code, payload = 500, {"error": "{0}: {1}".format(type(e).__name__, e)}
+        elapsed = time.perf_counter() - start
+        pool.stats.add(elapsed, code != 200)
+        payload["elapsed"] = round(elapsed * 1000.0, 3)
+        return code, payload
+
+    def health(self):
+        """Returns service status
+
+        :rtype: dict
+        """
+        return {
+            "status": "ok",
+            "uptime": round(time.time() - self.startedAt, 3),
+            "graphs": {
+                name: {
+                    "inputs": pool.executors[0].inputNames(),
+                    "outputs": pool.executors[0].outputNames(),
+                }
+                for name, pool in self.pools.items()
+            },
+        }
+
+    def stats(self):
+        """Returns request counters and latency percentiles in milliseconds per graph
+
+        :rtype: dict
+        """
+        result = {}
+        for name, pool in self.pools.items():
+            entry = pool.stats.snapshot()
+            entry["instances"] = len(pool.executors)
+            entry["available"] = pool.available()
+            result[name] = entry
+        return result
+
+    def serve(self, host="127.0.0.1", port=DEFAULT_PORT, socketPath=None):
+        """Handles requests until :meth:`shutdown` is called or process is interrupted
+
+        :param host: Interface to listen on
+        :type host: str
+        :param port: Tcp port
+        :type port: int
+        :param socketPath: Unix socket path. If specified, used instead of tcp
+        :type socketPath: str or None
+        """
+        if socketPath is not None:
+            if os.path.exists(socketPath):
+                os.remove(socketPath)
+            self._server = _UnixHTTPServer(socketPath, _RequestHandler)
+        else:
+            self._server = ThreadingHTTPServer((host, port), _RequestHandler)
+        self._server.service = self
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+            if socketPath is not None and os.path.exists(socketPath):
+                os.remove(socketPath)
+
+    def address(self):
+        """Returns address service listens on, (host, port) tuple or unix socket path"""
+        if self._server is None:
+            return None
+        return self._server.server_address
+
+    def shutdown(self):
+        """Stops :meth:`serve` loop. Can be called from any thread"""
+        if self._server is not None:
+            self._server.shutdown()
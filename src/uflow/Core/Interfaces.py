@@ -311,8 +311,7 @@ class IEvaluationEngine(object):
     def __init__(self):
         super(IEvaluationEngine, self).__init__()
 
-    @staticmethod
-    def getPinData(pin):
+    def getPinData(self, pin):
         raise NotImplementedError(
             "getPinData method of IEvaluationEngine is not implemented"
         )
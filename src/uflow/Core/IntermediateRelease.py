@@ -0,0 +1,193 @@
+"""
+.. sidebar:: **IntermediateRelease.py**
+
+    Freeing intermediate values as soon as every consumer has computed.
+
+Output pins push their values into every connected input pin and keep them until next compute, so by default
+every intermediate value of a pipeline stays in memory. While :class:`IntermediateReleaser` is active, consumers
+of every output pin are counted from evaluation plans. When the last consumer has computed, value is reset to
+default in the output pin and in the connected input pins. Linear pipeline then holds only values of the stage
+being computed and of the one before it.
+
+Released pins stay clean, so nodes are not computed again by later pulls. If consumer has to compute again
+while value of its input is released, producer is computed again first. When releaser is deactivated, released
+pins are marked dirty, so next evaluation computes them.
+
+Values are never released when
+
+* producer is callable, its outputs can not be computed on demand
+* producer has no value inputs, such as ``graphInputs``, its outputs are set from outside
+* any consumer is callable or ``graphOutputs`` node, those read values after evaluation
+* output pin or any connected input pin has :attr:`~uflow.Core.Common.PinOptions.KeepData` option
+
+Bookkeeping is guarded by a lock, since threaded evaluation engine computes nodes and calls
+:meth:`IntermediateReleaser.afterCompute` from worker threads. Nodes are never computed while the lock is held.
+
+Example:
+::
+
+    with IntermediateReleaser(graphManager):
+        runner.run(evalFunctions)
+"""
+
+import threading
+
+from uflow.Core.Common import *
+from uflow.Core.MemoryManager import MemoryManager
+
+#: Consumers which read their inputs after evaluation, values feeding them are kept
+RETAINING_NODE_TYPES = ("graphOutputs",)
+
+
+def evaluatedNodes(graphManager, extraTargets=()):
+    """Returns nodes computed when callable nodes and ``extraTargets`` are evaluated
+
+    :param extraTargets: Pure nodes pulled directly, like ``graphOutputs``
+    :type extraTargets: list(:class:`~uflow.Core.NodeBase.NodeBase`)
+    :rtype: set(:class:`~uflow.Core.NodeBase.NodeBase`)
+    """
+    from uflow.Core.EvaluationEngine import EvaluationEngine
+
+    nodes = set()
+    targets = [node for node in graphManager.getAllNodes() if node.bCallable]
+    targets.extend(extraTargets)
+    for node in targets:
+        nodes.add(node)
+        nodes.update(EvaluationEngine().getEvaluationPlan(node))
+    return nodes
+
+
+class IntermediateReleaser(object):
+    """Releases consumed intermediate values of graph manager while active
+
+    :param graphManager: Graph manager to release values of
+    :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager`
+    :param extraTargets: Pure nodes pulled directly in addition to callable nodes
+    :type extraTargets: list(:class:`~uflow.Core.NodeBase.NodeBase`)
+    :var releases: Number of released output values
+    """
+
+    def __init__(self, graphManager, extraTargets=()):
+        self.graphManager = graphManager
+        self.extraTargets = list(extraTargets)
+        self._consumers = {}
+        self._remaining = {}
+        self._released = set()
+        self._lock = threading.RLock()
+        self.releases = 0
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.deactivate()
+
+    def activate(self):
+        """Counts consumers and starts releasing"""
+        nodes = evaluatedNodes(self.graphManager, self.extraTargets)
+        with self._lock:
+            self._consumers.clear()
+            self._released.clear()
+            for node in nodes:
+                if not self._isReleasableProducer(node):
+                    continue
+                for pin in node.outputs.values():
+                    consumers = self._countConsumers(pin, nodes)
+                    if consumers:
+                        self._consumers[pin] = consumers
+            self._remaining = {pin: set(consumers) for pin, consumers in self._consumers.items()}
+        self.graphManager.intermediateReleaser = self
+
+    def deactivate(self):
+        """Stops releasing. Released pins are marked dirty, so they are computed when pulled next time"""
+        if self.graphManager.intermediateReleaser is self:
+            self.graphManager.intermediateReleaser = None
+        with self._lock:
+            for pin in self._released:
+                # no push, values downstream are still valid
+                pin.dirty = True
+            self._released.clear()
+
+    @staticmethod
+    def _isReleasableProducer(node):
+        if node.bCallable:
+            return False
+        return any(pin.IsValuePin() for pin in node.inputs.values())
+
+    @staticmethod
+    def _countConsumers(pin, nodes):
+        """Returns set of nodes consuming pin, None if value must be kept"""
+        if not pin.IsValuePin() or not pin.affects:
+            return None
+        if pin.optionEnabled(PinOptions.KeepData):
+            return None
+        consumers = set()
+        for target in pin.affects:
+            node = target.owningNode()
+            if target.optionEnabled(PinOptions.KeepData):
+                return None
+            if node.bCallable or node.__class__.__name__ in RETAINING_NODE_TYPES:
+                return None
+            # consumers outside of evaluation plans never compute, so would never release value
+            if node in nodes:
+                consumers.add(node)
+        return consumers
+
+    def isReleased(self, pin):
+        with self._lock:
+            return pin in self._released
+
+    def beforeCompute(self, node):
+        """Computes producers of released input values of node again. Called before node computes"""
+        if not self._released:
+            return
+        with self._lock:
+            sources = [
+                source
+                for inputPin in node.inputs.values()
+                for source in inputPin.affected_by
+                if source in self._released
+            ]
+        for source in sources:
+            self.restore(source)
+
+    def restore(self, pin):
+        """Computes producer of released output pin again"""
+        producer = pin.owningNode()
+        self.beforeCompute(producer)
+        with self._lock:
+            for outputPin in producer.outputs.values():
+                self._released.discard(outputPin)
+        pin.dirty = True
+        # recomputed values are pushed to consumers, which are therefore computed again when pulled
+        producer.processNode()
+
+    def afterCompute(self, node):
+        """Counts node as consumer of its inputs and releases values consumed by all consumers"""
+        sources = set()
+        for inputPin in node.inputs.values():
+            sources.update(inputPin.affected_by)
+        with self._lock:
+            for pin in node.outputs.values():
+                consumers = self._consumers.get(pin)
+                if consumers is not None:
+                    self._remaining[pin] = set(consumers)
+                    self._released.discard(pin)
+            for source in sources:
+                remaining = self._remaining.get(source)
+                if remaining is None or source in self._released:
+                    continue
+                remaining.discard(node)
+                if not remaining:
+                    self.release(source)
+
+    def release(self, pin):
+        """Resets value of output pin and connected input pins to defaults"""
+        memory = MemoryManager()
+        with self._lock:
+            for target in [pin] + list(pin.affects):
+                target._data = target.defaultValue()
+                memory.untrack(target)
+            self._released.add(pin)
+            self.releases += 1
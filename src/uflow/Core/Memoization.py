@@ -0,0 +1,275 @@
+"""
+.. sidebar:: **Memoization.py**
+
+    Input keyed memoization of node outputs.
+
+Node which has :attr:`~uflow.Core.NodeBase.NodeBase.bMemoize` enabled remembers outputs computed for every
+combination of input values in its :attr:`~uflow.Core.NodeBase.NodeBase.cache`. When inputs are changed back
+to values seen before, outputs are restored from cache instead of computing node again.
+
+Function based nodes enable it with
+
+>>> meta={NodeMeta.MEMOIZE: True}
+
+Hashable scalars are used as keys directly, NaN values of all inputs share one key. Arrays, dataframes,
+dictionaries and other containers are replaced by content digest. Digests are stable between processes and runs.
+
+Cache keeps its own copies of mutable outputs and hands out copies on lookup, so nodes modifying
+their inputs in place do not corrupt stored outputs.
+"""
+
+import sys
+import copy
+import pickle
+import hashlib
+from collections import OrderedDict
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from uflow.Core.Common import *
+
+SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+def _feed(hasher, value):
+    """Feeds value content to hasher
+
+    :raises TypeError: If value content can not be hashed
+    """
+    hasher.update(type(value).__qualname__.encode())
+    if isinstance(value, SCALAR_TYPES):
+        hasher.update(value if isinstance(value, bytes) else repr(value).encode())
+    elif numpy is not None and isinstance(value, numpy.ndarray):
+        hasher.update("{0}{1}".format(value.dtype.str, value.shape).encode())
+        if value.dtype.hasobject:
+            for item in value.ravel():
+                _feed(hasher, item)
+        else:
+            hasher.update(numpy.ascontiguousarray(value).view(numpy.uint8).data)
+    elif numpy is not None and isinstance(value, numpy.generic):
+        hasher.update(value.dtype.str.encode())
+        hasher.update(value.tobytes())
+    elif pandas is not None and isinstance(
+        value, (pandas.DataFrame, pandas.Series, pandas.Index)
+    ):
+        if isinstance(value, pandas.DataFrame):
+            _feed(hasher, [str(c) for c in value.columns])
+            _feed(hasher, [str(d) for d in value.dtypes])
+        else:
+            _feed(hasher, str(value.name))
+            _feed(hasher, str(value.dtype))
+        hashes = pandas.util.hash_pandas_object(value, index=True)
+        hasher.update(hashes.to_numpy().data)
+    elif isinstance(value, dict):
+        if isinstance(value, PFDict):
+            _feed(hasher, (value.keyType, value.valueType))
+        # key order does not matter for equality
+        items = sorted(
+            (contentDigest(k), contentDigest(v)) for k, v in value.items()
+        )
+        for keyDigest, valueDigest in items:
+            hasher.update(keyDigest.encode())
+            hasher.update(valueDigest.encode())
+    elif isinstance(value, (set, frozenset)):
+        for itemDigest in sorted(contentDigest(item) for item in value):
+            hasher.update(itemDigest.encode())
+    elif isinstance(value, (list, tuple)):
+        hasher.update(str(len(value)).encode())
+        for item in value:
+            _feed(hasher, item)
+    else:
+        try:
+            hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            raise TypeError(
+                "Can not fingerprint value of type {}: {}".format(
+                    type(value).__name__, e
+                )
+            )
+
+
+def contentDigest(value):
+    """Returns digest of value content
+
+    :raises TypeError: If value content can not be hashed
+    :rtype: str
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    _feed(hasher, value)
+    return hasher.hexdigest()
+
+
+def fingerprint(value):
+    """Returns hashable key identifying value content
+
+    :raises TypeError: If value content can not be hashed
+    """
+    if isinstance(value, SCALAR_TYPES):
+        # nan is not equal to itself, keys containing it would never match
+        if value != value:
+            return type(value), repr(value)
+        return type(value), value
+    return type(value), contentDigest(value)
+
+
+def inputsFingerprint(node):
+    """Returns key identifying values of all node value inputs or None if some of them can not be hashed
+
+    :param node: Node to compute key for
+    :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+    """
+    key = []
+    for pin in node.orderedInputs.values():
+        if pin.isExec():
+            continue
+        try:
+            key.append((pin.name, fingerprint(pin.getData())))
+        except TypeError:
+            return None
+    return tuple(key)
+
+
+def isImmutable(value):
+    """Whether value can be shared without copying
+
+    :rtype: bool
+    """
+    if isinstance(value, SCALAR_TYPES):
+        return True
+    if numpy is not None and isinstance(value, numpy.generic):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(isImmutable(item) for item in value)
+    return False
+
+
+def snapshot(value):
+    """Returns value itself if it is immutable, deep copy otherwise
+
+    :raises TypeError: If value can not be copied
+    """
+    if isImmutable(value):
+        return value
+    try:
+        return copy.deepcopy(value)
+    except Exception as e:
+        raise TypeError(
+            "Can not copy value of type {}: {}".format(type(value).__name__, e)
+        )
+
+
+def estimateSize(value):
+    """Returns rough estimate of value size in bytes
+
+    :rtype: int
+    """
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        return value.nbytes
+    if pandas is not None and isinstance(value, (pandas.DataFrame, pandas.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(value, pandas.DataFrame) else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimateSize(k) + estimateSize(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimateSize(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class MemoCache(object):
+    """Least recently used storage of node outputs bounded by entries count and estimated size
+
+    :var hits: Number of lookups which found outputs
+    :var misses: Number of lookups which found nothing
+    :var evictions: Number of entries removed to stay within bounds
+    """
+
+    def __init__(self, maxEntries=1000, maxBytes=256 * 1024 * 1024):
+        self._entries = OrderedDict()
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def lookup(self, key):
+        """Returns copy of outputs stored for key or None
+
+        :rtype: dict or None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return {name: snapshot(value) for name, value in entry[0].items()}
+
+    def store(self, key, outputs):
+        """Stores copy of outputs for key
+
+        Outputs bigger than whole cache and outputs which can not be copied are not stored.
+
+        :param outputs: Output pin values by pin name
+        :type outputs: dict
+        """
+        size = estimateSize(outputs)
+        if size > self.maxBytes or self.maxEntries <= 0:
+            return
+        try:
+            outputs = {name: snapshot(value) for name, value in outputs.items()}
+        except TypeError:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= previous[1]
+        self._entries[key] = (outputs, size)
+        self.bytes += size
+        self.shrink()
+
+    def shrink(self):
+        """Evicts least recently used entries until cache fits its bounds"""
+        while self._entries and (
+            len(self._entries) > self.maxEntries or self.bytes > self.maxBytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """Returns cache statistics
+
+        :rtype: dict
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
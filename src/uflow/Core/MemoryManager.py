@@ -0,0 +1,309 @@
+"""
+.. sidebar:: **MemoryManager.py**
+
+    Estimated memory held by pins and graph wide memory budget.
+
+While enabled, every value set to pin is measured with :func:`~uflow.Core.Memoization.estimateSize`
+(``DataFrame.memory_usage(deep=True)``, ``ndarray.nbytes``, :func:`sys.getsizeof` otherwise).
+Output pins push their value into every connected input pin, so the same object is usually held by several
+pins. Objects are counted once in totals and such pins are reported as shared.
+
+When total exceeds configured budget, the largest clean intermediate values are handed to memory policy
+until total fits again. Intermediate is value of pure node output pin which is connected to other pins.
+Nodes without value inputs are skipped, their outputs are usually set from outside and can not be
+computed again.
+Budget is enforced between evaluations, by :meth:`~uflow.Core.GraphManager.GraphManager.Tick` and
+:meth:`~uflow.Core.GraphExecutor.GraphExecutor.execute`, because values can not be dropped while
+evaluation which already computed their producers is still running.
+
+Example:
+::
+
+    MemoryManager().enable(budget=2 * 1024 ** 3)
+    ...
+    for row in MemoryManager().nodeStats():
+        print(row["node"], row["bytes"])
+
+Built in ``release`` policy drops value and marks producer dirty, so it is computed again when needed.
+Other policies can be added with :meth:`MemoryManager.registerPolicy`.
+"""
+
+import weakref
+import threading
+
+from uflow.Core.Common import *
+from uflow.Core.Memoization import estimateSize
+
+#: Columns of pin statistics rows
+MEMORY_PIN_COLUMNS = ("node", "pin", "direction", "bytes", "shared")
+#: Columns of node statistics rows
+MEMORY_NODE_COLUMNS = ("node", "type", "pins", "bytes")
+
+
+def releasePin(pin):
+    """Drops value of output pin and copies of it held by connected input pins
+
+    Pins are marked dirty, so the producer is computed again when value is pulled next time.
+
+    :param pin: Output pin
+    :type pin: :class:`~uflow.Core.PinBase.PinBase`
+    :returns: True
+    :rtype: bool
+    """
+    manager = MemoryManager()
+    for target in [pin] + list(pin.affects):
+        target._data = target.defaultValue()
+        # no push, nodes downstream keep their valid outputs
+        target.dirty = True
+        manager.untrack(target)
+    return True
+
+
+@SingletonDecorator
+class MemoryManager(object):
+    """Accounts memory held by pin values and enforces memory budget
+
+    :var budget: Budget in bytes, None means unlimited
+    :var policy: Name of policy applied to values over budget
+    """
+
+    def __init__(self):
+        self.bEnabled = False
+        self.budget = None
+        self.policy = "release"
+        self.policies = {"release": releasePin}
+        self._pins = {}
+        self._objects = {}
+        self._lock = threading.RLock()
+        self.totalBytes = 0
+        self.releases = 0
+        self.releasedBytes = 0
+
+    def enable(self, budget=None, policy=None):
+        """Starts accounting
+
+        :param budget: Budget in bytes. Kept unchanged if None
+        :type budget: int or None
+        :param policy: Name of registered policy. Kept unchanged if None
+        :type policy: str or None
+        """
+        if budget is not None:
+            self.setBudget(budget)
+        if policy is not None:
+            self.setPolicy(policy)
+        self.bEnabled = True
+
+    def disable(self):
+        self.bEnabled = False
+
+    def isEnabled(self):
+        return self.bEnabled
+
+    def setBudget(self, budget):
+        """Sets budget in bytes. Zero or None disables budget
+
+        :type budget: int or None
+        """
+        self.budget = budget or None
+
+    def setPolicy(self, name):
+        if name not in self.policies:
+            raise ValueError(
+                "Unknown memory policy {0}. Available: {1}".format(
+                    name, ", ".join(sorted(self.policies))
+                )
+            )
+        self.policy = name
+
+    def registerPolicy(self, name, function):
+        """Registers function which frees value of clean intermediate output pin
+
+        Function receives pin, must call :meth:`untrack` for every pin it has dropped value of
+        and return whether value was freed.
+
+        :param name: Policy name
+        :type name: str
+        :param function: Policy implementation
+        :type function: callable
+        """
+        self.policies[name] = function
+
+    def clear(self):
+        """Forgets all tracked values"""
+        with self._lock:
+            self._pins.clear()
+            self._objects.clear()
+            self.totalBytes = 0
+        self.releases = 0
+        self.releasedBytes = 0
+
+    def destroy(self):
+        self.disable()
+        self.clear()
+
+    def track(self, pin):
+        """Measures current value of pin. Called by :meth:`~uflow.Core.PinBase.PinBase.setData`
+
+        Objects already held by other pins are not measured again.
+        """
+        value = pin._data
+        objectId = id(value)
+        with self._lock:
+            previous = self._pins.get(pin.uid)
+            if previous is not None:
+                if previous[1] == objectId:
+                    return
+                self._unref(previous[1])
+            entry = self._objects.get(objectId)
+            if entry is None:
+                entry = [estimateSize(value), 0]
+                self._objects[objectId] = entry
+                self.totalBytes += entry[0]
+            entry[1] += 1
+            self._pins[pin.uid] = (weakref.ref(pin), objectId)
+
+    def untrack(self, pin):
+        """Forgets value of pin, when it was dropped or pin was killed"""
+        with self._lock:
+            previous = self._pins.pop(pin.uid, None)
+            if previous is not None:
+                self._unref(previous[1])
+
+    def _unref(self, objectId):
+        entry = self._objects[objectId]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._objects[objectId]
+            self.totalBytes -= entry[0]
+
+    def _trackedPins(self, graphManager=None):
+        with self._lock:
+            items = list(self._pins.values())
+        for pinRef, objectId in items:
+            pin = pinRef()
+            if pin is None:
+                continue
+            if graphManager is not None and pin.owningNode().graph().graphManager is not graphManager:
+                continue
+            yield pin, objectId
+
+    def pinBytes(self, pin):
+        """Returns estimated size of pin value, zero if it is not tracked
+
+        :rtype: int
+        """
+        with self._lock:
+            entry = self._pins.get(pin.uid)
+            if entry is None:
+                return 0
+            return self._objects[entry[1]][0]
+
+    def pinStats(self, graphManager=None):
+        """Returns row per tracked pin
+
+        :param graphManager: Only pins of this graph manager if given
+        :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager` or None
+        :rtype: list(dict)
+        """
+        rows = []
+        with self._lock:
+            for pin, objectId in self._trackedPins(graphManager):
+                size, refs = self._objects[objectId]
+                rows.append(
+                    {
+                        "node": pin.owningNode().getName(),
+                        "pin": pin.name,
+                        "direction": pin.direction.name,
+                        "bytes": size,
+                        "shared": refs > 1,
+                    }
+                )
+        return rows
+
+    def nodeStats(self, graphManager=None):
+        """Returns row per node holding tracked values. Objects held by several pins of node are counted once
+
+        :rtype: list(dict)
+        """
+        nodes = {}
+        with self._lock:
+            for pin, objectId in self._trackedPins(graphManager):
+                node = pin.owningNode()
+                row = nodes.get(node.uid)
+                if row is None:
+                    row = nodes[node.uid] = {
+                        "node": node.getName(),
+                        "type": node.__class__.__name__,
+                        "pins": 0,
+                        "objects": set(),
+                    }
+                row["pins"] += 1
+                row["objects"].add(objectId)
+            for row in nodes.values():
+                row["bytes"] = sum(self._objects[o][0] for o in row.pop("objects"))
+        return list(nodes.values())
+
+    def candidates(self, graphManager=None):
+        """Returns clean intermediate output pins, largest first
+
+        :rtype: list(:class:`~uflow.Core.PinBase.PinBase`)
+        """
+        sizes = []
+        with self._lock:
+            for pin, objectId in self._trackedPins(graphManager):
+                if pin.direction != PinDirection.Output or pin.dirty:
+                    continue
+                if not pin.affects or not pin.IsValuePin():
+                    continue
+                if pin.optionEnabled(PinOptions.KeepData):
+                    continue
+                node = pin.owningNode()
+                # outputs of callable nodes are produced by execution, they can not be pulled again
+                if node.bCallable:
+                    continue
+                # nodes without inputs (graph inputs, for example) hold values set from outside
+                if not any(p.IsValuePin() for p in node.inputs.values()):
+                    continue
+                sizes.append((self._objects[objectId][0], pin))
+        sizes.sort(key=lambda item: item[0], reverse=True)
+        return [pin for size, pin in sizes if size > 0]
+
+    def isOverBudget(self):
+        return self.budget is not None and self.totalBytes > self.budget
+
+    def enforceBudget(self, graphManager=None):
+        """Applies policy to the largest clean intermediates until total fits budget
+
+        :param graphManager: Only values of this graph manager are freed if given
+        :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager` or None
+        :returns: Number of bytes freed
+        :rtype: int
+        """
+        if not self.bEnabled or not self.isOverBudget():
+            return 0
+        policy = self.policies[self.policy]
+        before = self.totalBytes
+        for pin in self.candidates(graphManager):
+            if not self.isOverBudget():
+                break
+            if policy(pin):
+                self.releases += 1
+        freed = before - self.totalBytes
+        self.releasedBytes += freed
+        return freed
+
+    def stats(self):
+        """Returns totals
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "pins": len(self._pins),
+                "objects": len(self._objects),
+                "bytes": self.totalBytes,
+                "budget": self.budget,
+                "policy": self.policy,
+                "releases": self.releases,
+                "releasedBytes": self.releasedBytes,
+            }
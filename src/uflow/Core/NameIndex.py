@@ -0,0 +1,320 @@
+"""
+.. sidebar:: **NameIndex.py**
+
+    Incrementally maintained names of graphs, nodes, variables and pins.
+
+Unique names used to be generated from full lists of names collected from every graph, so adding many
+nodes was quadratic. :class:`NameRegistry` of every :class:`~uflow.Core.GraphManager.GraphManager` keeps
+names in :class:`NameIndex` sets instead. Index maps base names, names without digits in the end, to
+numeric suffixes in use, so unique name is found without scanning other names.
+
+Registry follows objects through their ``nameChanged`` and ``killed`` signals. Graphs, nodes, pins
+and variables are registered by graph manager, :meth:`~uflow.Core.GraphBase.GraphBase.addNode`,
+pin constructor and variable creation. Other indexes, such as uid indexes of graph manager and
+:class:`~uflow.Core.PathsRegistry.GraphPaths`, follow registry signals instead of scanning graphs.
+
+Example:
+::
+
+    index = NameIndex(["node", "node1", "node3"])
+    index.uniqName("node")  # node2
+"""
+
+import weakref
+
+from blinker import Signal
+
+from uflow.Core.Common import *
+
+#: Nodes which expose their pins on compound node, their pin names are unique per graph
+GRAPH_PIN_NODE_TYPES = ("graphInputs", "graphOutputs")
+
+
+def splitName(name):
+    """Splits name to base name and numeric suffix
+
+    >>> splitName("node12")
+    ('node', 12)
+
+    :rtype: tuple(str, int or None)
+    """
+    suffix = extractDigitsFromEndOfString(name)
+    if suffix is None:
+        return name, None
+    return removeDigitsFromEndOfString(name), suffix
+
+
+class NameIndex(object):
+    """Multiset of names with numeric suffixes in use grouped by base name
+
+    :param names: Initial names
+    :type names: iterable(str)
+    """
+
+    def __init__(self, names=()):
+        self._counts = {}
+        self._suffixes = {}
+        self._hints = {}
+        for name in names:
+            self.add(name)
+
+    def copy(self):
+        """Returns independent copy, used to reserve names which are not created yet
+
+        :rtype: :class:`NameIndex`
+        """
+        result = NameIndex()
+        result._counts = dict(self._counts)
+        result._suffixes = {base: dict(used) for base, used in self._suffixes.items()}
+        result._hints = dict(self._hints)
+        return result
+
+    def add(self, name):
+        count = self._counts.get(name, 0)
+        self._counts[name] = count + 1
+        if count:
+            return
+        base, suffix = splitName(name)
+        if suffix is not None:
+            used = self._suffixes.setdefault(base, {})
+            used[suffix] = used.get(suffix, 0) + 1
+
+    def remove(self, name):
+        count = self._counts.get(name, 0)
+        if count > 1:
+            self._counts[name] = count - 1
+            return
+        if count == 0:
+            return
+        del self._counts[name]
+        base, suffix = splitName(name)
+        if suffix is None:
+            return
+        used = self._suffixes[base]
+        used[suffix] -= 1
+        if used[suffix] == 0:
+            del used[suffix]
+            if suffix < self._hints.get(base, 1):
+                self._hints[base] = suffix
+            if not used:
+                del self._suffixes[base]
+
+    def rename(self, oldName, newName):
+        self.remove(oldName)
+        self.add(newName)
+
+    def count(self, name):
+        """Returns how many objects use name
+
+        :rtype: int
+        """
+        return self._counts.get(name, 0)
+
+    def names(self):
+        """Returns distinct names
+
+        :rtype: list(str)
+        """
+        return list(self._counts)
+
+    def __contains__(self, name):
+        return name in self._counts
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __iter__(self):
+        return iter(self._counts)
+
+    def uniqName(self, name):
+        """Returns name if it is free, otherwise base name with the smallest free suffix
+
+        Behaves like :func:`~uflow.Core.Common.getUniqNameFromList`, except suffixes are looked up only
+        among names sharing base name.
+
+        :param name: Source name
+        :type name: str
+        :rtype: str
+        """
+        if name not in self._counts:
+            return name
+        base = removeDigitsFromEndOfString(name)
+        used = self._suffixes.get(base, {})
+        suffix = self._hints.get(base, 1)
+        # zero padded names like "node01" use suffix 1 but not name "node1", so check both
+        while suffix in used or base + str(suffix) in self._counts:
+            suffix += 1
+        self._hints[base] = suffix
+        return base + str(suffix)
+
+
+class _Entry(object):
+    __slots__ = ("kind", "name", "ref", "graph", "scope", "onRenamed", "onKilled")
+
+
+class NameRegistry(object):
+    """Names of everything owned by graph manager
+
+    :param graphManager: Owning graph manager
+    :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager`
+    :var graphs: Graph names
+    :var nodes: Node names
+    :var variables: Variable names
+    :var pins: Pin names
+    :var all: Names of all above together
+    :var registered: Sent with object and ``kind``, ``graph`` arguments when object is registered
+    :var unregistered: Sent with object and ``kind``, ``graph`` arguments when object was killed
+    :var renamed: Sent with object and ``kind``, ``graph`` arguments when name or location of object changed
+    """
+
+    def __init__(self, graphManager):
+        self.graphManager = weakref.ref(graphManager)
+        self.graphs = NameIndex()
+        self.nodes = NameIndex()
+        self.variables = NameIndex()
+        self.pins = NameIndex()
+        self.all = NameIndex()
+        self._indexes = {
+            "graph": self.graphs,
+            "node": self.nodes,
+            "variable": self.variables,
+            "pin": self.pins,
+        }
+        self.registered = Signal(object)
+        self.unregistered = Signal(object)
+        self.renamed = Signal(object)
+        self._entries = {}
+        self._nodesByName = {}
+        self._graphPins = {}
+
+    def clear(self):
+        """Forgets everything and disconnects from signals of registered objects"""
+        for key in list(self._entries):
+            self._untrack(key)
+        for index in self._indexes.values():
+            index.__init__()
+        self.all.__init__()
+        self._nodesByName.clear()
+        self._graphPins.clear()
+
+    def isRegistered(self, obj):
+        return id(obj) in self._entries
+
+    def _track(self, kind, obj, graph=None, scope=None):
+        key = id(obj)
+        previous = self._entries.get(key)
+        if previous is not None:
+            if previous.ref() is obj:
+                return False
+            # object was collected without being killed and its id is reused
+            self._untrack(key)
+        entry = _Entry()
+        entry.kind = kind
+        entry.name = obj.name
+        entry.ref = weakref.ref(obj)
+        entry.graph = graph
+        entry.scope = scope
+        entry.onRenamed = lambda *args, **kwargs: self._renamed(key)
+        entry.onKilled = lambda *args, **kwargs: self._untrack(key)
+        # receivers are lambdas, they must be referenced strongly by signals
+        obj.nameChanged.connect(entry.onRenamed, weak=False)
+        obj.killed.connect(entry.onKilled, weak=False)
+        self._entries[key] = entry
+        self._nameAdded(entry, obj)
+        self.registered.send(obj, kind=kind, graph=graph)
+        return True
+
+    def _untrack(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        obj = entry.ref()
+        if obj is not None:
+            obj.nameChanged.disconnect(entry.onRenamed)
+            obj.killed.disconnect(entry.onKilled)
+        self._nameRemoved(entry, obj)
+        if obj is None:
+            return
+        self.unregistered.send(obj, kind=entry.kind, graph=entry.graph)
+        if entry.kind == "node":
+            for pin in obj.pins:
+                self._untrack(id(pin))
+        elif entry.kind == "graph":
+            self._graphPins.pop(obj.uid, None)
+
+    def _renamed(self, key):
+        entry = self._entries.get(key)
+        obj = entry.ref() if entry is not None else None
+        if obj is None or obj.name == entry.name:
+            return
+        self._nameRemoved(entry, obj)
+        entry.name = obj.name
+        self._nameAdded(entry, obj)
+        self.renamed.send(obj, kind=entry.kind, graph=entry.graph)
+
+    def moved(self, obj):
+        """Notifies followers of registry that location of registered object changed, like parent of graph"""
+        entry = self._entries.get(id(obj))
+        if entry is not None and entry.ref() is obj:
+            self.renamed.send(obj, kind=entry.kind, graph=entry.graph)
+
+    def _nameAdded(self, entry, obj):
+        self._indexes[entry.kind].add(entry.name)
+        self.all.add(entry.name)
+        if entry.kind == "node":
+            self._nodesByName.setdefault(entry.name, []).append(obj)
+        elif entry.scope is not None:
+            self._graphPins.setdefault(entry.scope, NameIndex()).add(entry.name)
+
+    def _nameRemoved(self, entry, obj):
+        self._indexes[entry.kind].remove(entry.name)
+        self.all.remove(entry.name)
+        if entry.kind == "node":
+            nodes = self._nodesByName.get(entry.name, [])
+            nodes[:] = [n for n in nodes if n is not obj]
+            if not nodes:
+                self._nodesByName.pop(entry.name, None)
+        elif entry.scope is not None:
+            self._graphPins[entry.scope].remove(entry.name)
+
+    def addGraph(self, graph):
+        self._track("graph", graph)
+
+    def addVariable(self, var):
+        self._track("variable", var)
+
+    def addNode(self, node):
+        """Registers node and its pins. Node registered in other graph before is moved"""
+        if self.isRegistered(node):
+            self._untrack(id(node))
+        self._track("node", node, node.graph())
+        for pin in node.pins:
+            self.addPin(pin)
+
+    def addPin(self, pin):
+        """Registers pin of registered node"""
+        node = pin.owningNode()
+        if not self.isRegistered(node):
+            return
+        graph = node.graph()
+        scope = None
+        if node.__class__.__name__ in GRAPH_PIN_NODE_TYPES:
+            scope = graph.uid
+        self._track("pin", pin, graph, scope)
+
+    def findNode(self, name, graph=None):
+        """Returns node with name, optionally only from given graph
+
+        :rtype: :class:`~uflow.Core.NodeBase.NodeBase` or None
+        """
+        for node in self._nodesByName.get(name, ()):
+            if graph is None or node.graph() is graph:
+                return node
+        return None
+
+    def graphPins(self, graph):
+        """Returns names of pins exposed on compound node of graph
+
+        :rtype: :class:`NameIndex`
+        """
+        return self._graphPins.get(graph.uid) or NameIndex()
@@ -10,8 +10,13 @@ from uflow import getPinDefaultValueByType
 from uflow.Core.Common import *
 from uflow.Core.Interfaces import INode
 from uflow import CreateRawPin
+from uflow.Core.ProcessPool import ProcessExecutionBackend
+from uflow.Core.Memoization import MemoCache, inputsFingerprint
+from uflow.Core.DiskCache import DiskCache
+from uflow.Core.Profiler import Profiler
+from uflow.Core.Tracer import Tracer
 
-from datetime import datetime
+from datetime import timedelta
 
 
 class NodePinsSuggestionsHelper(object):
@@ -43,16 +48,49 @@ class NodePinsSuggestionsHelper(object):
         self.outputStructs.add(struct)
 
 
+def _instrumentedCallback(node, pin, callback):
+    """Wraps exec pin callback, so calls are timed while :class:`~uflow.Core.Profiler.Profiler` is enabled
+    and recorded while :class:`~uflow.Core.Tracer.Tracer` is enabled
+    """
+
+    def execute(*args, **kwargs):
+        profiler = Profiler()
+        tracer = Tracer()
+        if not profiler.bEnabled and not tracer.bEnabled:
+            return callback(*args, **kwargs)
+        bProfile = profiler.bEnabled
+        if bProfile:
+            start = profiler.enterFrame()
+        traceStart = tracer.begin()
+        try:
+            return callback(*args, **kwargs)
+        finally:
+            if bProfile:
+                elapsed, nested = profiler.exitFrame(start)
+                profiler.recordCompute(node, elapsed, nested)
+            if tracer.bEnabled:
+                tracer.complete(
+                    "{0}.{1}".format(node.name, pin.name), "exec", traceStart
+                )
+
+    return execute
+
+
 class NodeBase(INode):
     _packageName = ""
 
     def __init__(self, name, uid=None):
         super(NodeBase, self).__init__()
         self.bCacheEnabled = True
+        self.bThreadSafe = True
+        self.bMemoize = False
+        self.bPersistentCache = False
+        self.bVectorized = False
+        self.cache = MemoCache()
         self.cacheMaxSize = 1000
-        self.cache = {}
 
         self.killed = Signal()
+        self.nameChanged = Signal(str)
         self.tick = Signal(float)
         self.setDirty = Signal()
         self.computing = Signal()
@@ -146,7 +184,7 @@ class NodeBase(INode):
         else:
             self.clearError()
         wrapper = self.getWrapper()
-        if wrapper:
+        if wrapper and not isEvaluationWorkerThread():
             wrapper.update()
 
     @property
@@ -263,9 +301,12 @@ class NodeBase(INode):
 
     @uid.setter
     def uid(self, value):
+        oldUid = self._uid
         if self.graph is not None:
             self.graph().getNodes()[value] = self.graph().getNodes().pop(self._uid)
         self._uid = value
+        if self.graph is not None:
+            self.graph().graphManager.uidChanged(self, oldUid)
 
     @staticmethod
     def jsonTemplate():
@@ -311,8 +352,6 @@ class NodeBase(INode):
         return self.graph() == self.graph().graphManager.activeGraph()
 
     def kill(self, *args, **kwargs):
-        from uflow.Core.PathsRegistry import PathsRegistry
-
         if self.uid not in self.graph().getNodes():
             return
 
@@ -324,11 +363,31 @@ class NodeBase(INode):
             pin.kill()
         self.graph().getNodes().pop(self.uid)
 
-        PathsRegistry().rebuild()
-
     def Tick(self, delta):
         self.tick.send(delta)
 
+    def scheduleTick(self, delay=0.0):
+        """Requests :meth:`Tick` call after delay seconds
+
+        Nodes which wait for time to pass (timers, delays) should use this and return False
+        from :meth:`isTickActive`, so :class:`~uflow.Core.GraphRunner.GraphRunner` can sleep in between.
+
+        :param delay: Delay in seconds
+        :type delay: float
+        """
+        self.graph().graphManager.tickScheduler.schedule(self, delay)
+
+    def isTickActive(self):
+        """Whether node must be ticked continuously by :class:`~uflow.Core.GraphRunner.GraphRunner`
+
+        Runner keeps running while some node is active. True for nodes which override :meth:`Tick`,
+        so nodes polling something on every tick keep working. Nodes which only wait for time to pass
+        should use :meth:`scheduleTick` and return False here once they have nothing to poll.
+
+        :rtype: bool
+        """
+        return type(self).Tick is not NodeBase.Tick
+
     @staticmethod
     def category():
         return "Default"
@@ -350,32 +409,83 @@ class NodeBase(INode):
 
     def setName(self, name):
         self.name = str(name)
+        self.nameChanged.send(self.name)
+
+    @property
+    def cacheMaxSize(self):
+        """Maximum number of entries in memoization :attr:`cache`"""
+        return self.cache.maxEntries
+
+    @cacheMaxSize.setter
+    def cacheMaxSize(self, value):
+        self.cache.maxEntries = value
+        self.cache.shrink()
+
+    @property
+    def cacheMaxBytes(self):
+        """Maximum estimated size of values in memoization :attr:`cache`"""
+        return self.cache.maxBytes
+
+    @cacheMaxBytes.setter
+    def cacheMaxBytes(self, value):
+        self.cache.maxBytes = value
+        self.cache.shrink()
+
+    def memoizationStats(self):
+        """Returns hits, misses and evictions of memoization :attr:`cache`
+
+        :rtype: dict
+        """
+        return self.cache.stats()
+
+    def clearMemoizationCache(self):
+        self.cache.clear()
 
     def isDirty(self):
-        inpDirty = any([pin.dirty for pin in self.inputs.values() if pin.IsValuePin()])
-        outDirty = any([pin.dirty for pin in self.outputs.values() if pin.IsValuePin()])
-        return inpDirty or outDirty
+        for pin in self._pins:
+            if pin.dirty and pin.IsValuePin():
+                return True
+        return False
 
     def afterCompute(self):
-        for pin in self.inputs.values():
-            pin.setClean()
-        for pin in self.outputs.values():
+        for pin in self._pins:
             pin.setClean()
 
     def processNode(self, *args, **kwargs):
-        start = datetime.now()
         # if not self.isValid():
         #    return
         self.computing.send()
+        self.computeChecked(*args, **kwargs)
+        self.computed.send()
+
+    def computeChecked(self, *args, **kwargs):
+        """Computes node if needed and handles errors, without firing
+        :attr:`computing` and :attr:`computed` signals.
+
+        Used by evaluation engines which compute nodes on worker threads and
+        send signals on owning thread themselves.
+        """
+        profiler = Profiler()
+        bProfile = profiler.bEnabled
+        if bProfile:
+            profileStart = profiler.enterFrame()
+        tracer = Tracer()
+        releaser = self.graph().graphManager.intermediateReleaser
+        if releaser is not None and (not self.bCacheEnabled or self.isDirty()):
+            releaser.beforeCompute(self)
+        start = time.perf_counter_ns()
+        bComputed = True
         if self.bCacheEnabled:
             if self.isDirty():
                 try:
-                    self.compute()
+                    self.computeMemoized()
                     self.clearError()
                     self.checkForErrors()
                     self.afterCompute()
                 except Exception as e:
                     self.setError(traceback.format_exc())
+            else:
+                bComputed = False
         else:
             try:
                 self.compute()
@@ -383,9 +493,60 @@ class NodeBase(INode):
                 self.checkForErrors()
             except Exception as e:
                 self.setError(traceback.format_exc())
-        delta = datetime.now() - start
-        self._computingTime = delta
-        self.computed.send()
+        self._computingTime = timedelta(
+            microseconds=(time.perf_counter_ns() - start) / 1000.0
+        )
+
+        if bProfile:
+            elapsed, nested = profiler.exitFrame(profileStart)
+            if bComputed:
+                profiler.recordCompute(self, elapsed, nested)
+            else:
+                profiler.recordSkip(self)
+        if bComputed and tracer.bEnabled:
+            tracer.complete(self.name, "compute", start)
+        if bComputed and releaser is not None:
+            releaser.afterCompute(self)
+
+    def computeMemoized(self):
+        """Computes node or restores outputs computed earlier for the same input values
+
+        Outputs are looked up in memoization :attr:`cache` if :attr:`bMemoize` is enabled
+        and in :class:`~uflow.Core.DiskCache.DiskCache` if :attr:`bPersistentCache` is enabled.
+        Callable nodes are always computed.
+        """
+        bPersistent = self.bPersistentCache and DiskCache().isEnabled()
+        key = None
+        if (self.bMemoize or bPersistent) and not self.isCallable():
+            key = inputsFingerprint(self)
+        if key is None:
+            self.compute()
+            return
+
+        outputs = None
+        if self.bMemoize:
+            outputs = self.cache.lookup(key)
+        if outputs is None and bPersistent:
+            diskKey = DiskCache().key(self, key)
+            outputs = DiskCache().load(diskKey)
+            if outputs is not None and self.bMemoize:
+                self.cache.store(key, outputs)
+        if outputs is not None:
+            for pin in self.outputs.values():
+                if pin.name in outputs:
+                    pin.setData(outputs[pin.name])
+            return
+
+        self.compute()
+        outputs = {
+            pin.name: pin.currentData()
+            for pin in self.outputs.values()
+            if not pin.isExec()
+        }
+        if self.bMemoize:
+            self.cache.store(key, outputs)
+        if bPersistent:
+            DiskCache().store(diskKey, outputs)
 
     # INode interface
 
@@ -496,7 +657,7 @@ class NodeBase(INode):
             p.enableOptions(PinOptions.ArraySupported)
 
         if callback:
-            p.onExecute.connect(callback, weak=False)
+            p.onExecute.connect(_instrumentedCallback(self, p, callback), weak=False)
 
         if defaultValue is not None or dataType == "AnyPin":
             p.setDefaultValue(defaultValue)
@@ -699,29 +860,14 @@ class NodeBase(INode):
             self.y = jsonTemplate["y"]
 
             # set pins data
-            sortedInputs = sorted(
-                jsonTemplate["inputs"], key=lambda pinDict: pinDict["pinIndex"]
-            )
-            for inpJson in sortedInputs:
-                dynamicEnabled = PinOptions.Dynamic.value in inpJson["options"]
-                if dynamicEnabled or inpJson["name"] not in self.namePinInputsMap:
-                    # create custom dynamically created pins in derived classes
-                    continue
-
-                pin = self.getPinSG(str(inpJson["name"]), PinSelectionGroup.Inputs)
-                pin.deserialize(inpJson)
-
-            sortedOutputs = sorted(
-                jsonTemplate["outputs"], key=lambda pinDict: pinDict["pinIndex"]
-            )
-            for outJson in sortedOutputs:
-                dynamicEnabled = PinOptions.Dynamic.value in outJson["options"]
-                if dynamicEnabled or outJson["name"] not in self.namePinOutputsMap:
-                    # create custom dynamically created pins in derived classes
-                    continue
-
-                pin = self.getPinSG(str(outJson["name"]), PinSelectionGroup.Outputs)
-                pin.deserialize(outJson)
+            loader = None
+            if self.graph is not None:
+                loader = self.graph().graphManager.bulkLoader
+            if loader is not None:
+                with loader.timings.phase("pinRestore"):
+                    self._restorePins(jsonTemplate)
+            else:
+                self._restorePins(jsonTemplate)
 
             # store data for wrapper
             if "wrapper" in jsonTemplate:
@@ -737,6 +883,22 @@ class NodeBase(INode):
         self.autoAffectPins()
         self.checkForErrors()
 
+    def _restorePins(self, jsonTemplate):
+        """Restores data of static pins from serialized node"""
+        # maps are generated every time properties are called, build them once per node
+        pinMaps = (
+            ("inputs", self.namePinInputsMap),
+            ("outputs", self.namePinOutputsMap),
+        )
+        for key, pinsMap in pinMaps:
+            sortedPins = sorted(jsonTemplate[key], key=lambda pinDict: pinDict["pinIndex"])
+            for pinJson in sortedPins:
+                dynamicEnabled = PinOptions.Dynamic.value in pinJson["options"]
+                if dynamicEnabled or pinJson["name"] not in pinsMap:
+                    # create custom dynamically created pins in derived classes
+                    continue
+                pinsMap[pinJson["name"]].deserialize(pinJson)
+
     @staticmethod
     def initializeFromFunction(foo):
         """Constructs node from annotated function
@@ -820,11 +982,14 @@ class NodeBase(INode):
 
         raw_inst = nodeClass(foo.__name__)
         raw_inst.lib = libName
+        raw_inst._function = foo
 
         # this is list of 'references' outputs will be created for
         refs = []
         outExec = None
 
+        bProcessIsolated = meta.get(NodeMeta.ISOLATION) == NodeIsolation.Process
+
         # generate compute method from function
         def compute(self, *args, **kwargs):
             # arguments will be taken from inputs
@@ -832,11 +997,24 @@ class NodeBase(INode):
             for i in list(self.inputs.values()):
                 if not i.isExec():
                     kwds[i.name] = i.getData()
-            for ref in refs:
-                if not ref.isExec():
-                    kwds[ref.name] = ref.setData
-            foo.owningNode = self
-            result = foo(**kwds)
+
+            outcome = None
+            if bProcessIsolated and ProcessExecutionBackend().isEnabled():
+                refNames = [ref.name for ref in refs if not ref.isExec()]
+                outcome = ProcessExecutionBackend().execute(self, foo, kwds, refNames)
+
+            if outcome is None:
+                for ref in refs:
+                    if not ref.isExec():
+                        kwds[ref.name] = ref.setData
+                foo.owningNode = self
+                result = foo(**kwds)
+            else:
+                result, refValues = outcome
+                for ref in refs:
+                    if ref.name in refValues:
+                        ref.setData(refValues[ref.name])
+
             if returnType is not None:
                 self.setData(str("out"), result)
             if nodeType == NodeTypes.Callable:
@@ -847,6 +1025,14 @@ class NodeBase(INode):
         raw_inst._nodeMetaData = meta
         if "CacheEnabled" in meta:
             raw_inst.bCacheEnabled = meta["CacheEnabled"]
+        if NodeMeta.THREAD_SAFE in meta:
+            raw_inst.bThreadSafe = meta[NodeMeta.THREAD_SAFE]
+        if NodeMeta.MEMOIZE in meta:
+            raw_inst.bMemoize = meta[NodeMeta.MEMOIZE]
+        if NodeMeta.PERSISTENT_CACHE in meta:
+            raw_inst.bPersistentCache = meta[NodeMeta.PERSISTENT_CACHE]
+        if NodeMeta.VECTORIZED in meta:
+            raw_inst.bVectorized = meta[NodeMeta.VECTORIZED]
 
         # create execs if callable
         if nodeType == NodeTypes.Callable:
@@ -20,15 +20,15 @@ import inspect
 from uflow.Core import PinBase
 from uflow.Core import NodeBase
 from uflow.Core import FunctionLibraryBase
-from uflow.UI.UIInterfaces import IDataExporter
-from uflow.UI.Widgets.PreferencesWindow import CategoryWidgetBase
-from uflow.UI.Tool.Tool import ToolBase
 
 
 class PackageBase(object):
     """Class that describes a set of modules that can be plugged into the editor.
 
     Will be instantiated and used to create registered entities.
+
+    Tools, exporters, preferences widgets and ui factories found by :meth:`analyzePackage`
+    are imported on first request, so packages can be used without Qt in headless mode.
     """
 
     def __init__(self):
@@ -44,88 +44,93 @@ class PackageBase(object):
         self._UINodesFactory = None
         self._UIPinsFactory = None
 
-    def analyzePackage(self, packagePath):
-        def import_subclasses(directory, base_class):
-            subclasses = []
-            for filename in os.listdir(directory):
-                if filename.endswith(".py") and not filename.startswith("__"):
-                    # The module path is derived from the package's own __module__ attribute.
-                    # This works for both built-in packages (e.g., 'FlowBasePackage')
-                    # and external entry-point packages (e.g., 'demopack'), making the discovery
-                    # mechanism universal and robust.
-                    base_module_path = self.__class__.__module__
-                    module_name = f"{base_module_path}.{os.path.basename(directory)}.{filename[:-3]}"
-
-                    file_path = os.path.join(directory, filename)
-                    # Dynamically load the module
-                    spec = importlib.util.spec_from_file_location(
-                        module_name, file_path
+        self._uiElementsPath = None
+
+    def _importSubclasses(self, directory, base_class):
+        subclasses = []
+        for filename in os.listdir(directory):
+            if filename.endswith(".py") and not filename.startswith("__"):
+                # The module path is derived from the package's own __module__ attribute.
+                # This works for both built-in packages (e.g., 'FlowBasePackage')
+                # and external entry-point packages (e.g., 'demopack'), making the discovery
+                # mechanism universal and robust.
+                base_module_path = self.__class__.__module__
+                module_name = f"{base_module_path}.{os.path.basename(directory)}.{filename[:-3]}"
+
+                file_path = os.path.join(directory, filename)
+                # Dynamically load the module
+                spec = importlib.util.spec_from_file_location(module_name, file_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                for name, obj in inspect.getmembers(module, inspect.isclass):
+                    # Ensure that the class is defined in this module to avoid imported classes from elsewhere
+                    # if inspect.getmodule(obj) == None or inspect.getmodule(obj) == module:
+                    if issubclass(obj, base_class) and obj is not base_class:
+                        subclasses.append(obj)
+        return subclasses
+
+    def _loadPackageElements(self, packagePath, element, elementDict, classType):
+        packageFolders = os.listdir(packagePath)
+        if element in packageFolders:
+            directory = os.path.join(packagePath, element)
+            found_subclasses = self._importSubclasses(directory, classType)
+            for subclass in found_subclasses:
+                if classType == FunctionLibraryBase:
+                    elementDict[subclass.__name__] = subclass(
+                        self.__class__.__name__,
                     )
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    for name, obj in inspect.getmembers(module, inspect.isclass):
-                        # Ensure that the class is defined in this module to avoid imported classes from elsewhere
-                        # if inspect.getmodule(obj) == None or inspect.getmodule(obj) == module:
-                        if issubclass(obj, base_class) and obj is not base_class:
-                            subclasses.append(obj)
-            return subclasses
-
-        def loadPackageElements(packagePath, element, elementDict, classType):
-            packageFolders = os.listdir(packagePath)
-            if element in packageFolders:
-                directory = os.path.join(packagePath, element)
-                found_subclasses = import_subclasses(directory, classType)
-                for subclass in found_subclasses:
-                    if classType == FunctionLibraryBase:
-                        elementDict[subclass.__name__] = subclass(
-                            self.__class__.__name__,
-                        )
-                    else:
-                        elementDict[subclass.__name__] = subclass
-
-        # Load all elements from the package
+                else:
+                    elementDict[subclass.__name__] = subclass
+
+    def _loadFactory(self, packagePath, moduleName):
+        # The prefix for factory modules is also derived from the package's __module__ attribute,
+        # ensuring consistent pathing for all package types.
+        modPrefix = f"{self.__class__.__module__}.Factories."
+        filePath = os.path.join(packagePath, "Factories", moduleName + ".py")
+        if not os.path.exists(filePath):
+            return None
+        spec = importlib.util.spec_from_file_location(modPrefix + moduleName, filePath)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def analyzePackage(self, packagePath):
+        # Load core elements of the package
         for element in [
             ("FunctionLibraries", self._FOO_LIBS, FunctionLibraryBase),
             ("Nodes", self._NODES, NodeBase),
             ("Pins", self._PINS, PinBase),
+        ]:
+            self._loadPackageElements(packagePath, element[0], element[1], element[2])
+
+        # ui elements import Qt, they are loaded when requested first time
+        self._uiElementsPath = packagePath
+
+    def _loadUIElements(self):
+        if self._uiElementsPath is None:
+            return
+        packagePath = self._uiElementsPath
+        self._uiElementsPath = None
+
+        from uflow.UI.UIInterfaces import IDataExporter
+        from uflow.UI.Widgets.PreferencesWindow import CategoryWidgetBase
+        from uflow.UI.Tool.Tool import ToolBase
+
+        for element in [
             ("Tools", self._TOOLS, ToolBase),
             ("Exporters", self._EXPORTERS, IDataExporter),
             ("PrefsWidgets", self._PREFS_WIDGETS, CategoryWidgetBase),
         ]:
-            loadPackageElements(packagePath, element[0], element[1], element[2])
+            self._loadPackageElements(packagePath, element[0], element[1], element[2])
         if os.path.exists(os.path.join(packagePath, "Factories")):
-            # The prefix for factory modules is also derived from the package's __module__ attribute,
-            # ensuring consistent pathing for all package types.
-            modPrefix = f"{self.__class__.__module__}.Factories."
-            if os.path.exists(
-                os.path.join(packagePath, "Factories", "UIPinFactory.py")
-            ):
-                spec = importlib.util.spec_from_file_location(
-                    modPrefix + "UIPinFactory",
-                    os.path.join(packagePath, "Factories", "UIPinFactory.py"),
-                )
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+            module = self._loadFactory(packagePath, "UIPinFactory")
+            if module is not None:
                 self._UIPinsFactory = module.createUIPin
-            if os.path.exists(
-                os.path.join(packagePath, "Factories", "UINodeFactory.py")
-            ):
-                spec = importlib.util.spec_from_file_location(
-                    modPrefix + "UINodeFactory",
-                    os.path.join(packagePath, "Factories", "UINodeFactory.py"),
-                )
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+            module = self._loadFactory(packagePath, "UINodeFactory")
+            if module is not None:
                 self._UINodesFactory = module.createUINode
-            if os.path.exists(
-                os.path.join(packagePath, "Factories", "PinInputWidgetFactory.py")
-            ):
-                spec = importlib.util.spec_from_file_location(
-                    modPrefix + "PinInputWidgetFactory",
-                    os.path.join(packagePath, "Factories", "PinInputWidgetFactory.py"),
-                )
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+            module = self._loadFactory(packagePath, "PinInputWidgetFactory")
+            if module is not None:
                 self._PinsInputWidgetFactory = module.getInputWidget
 
     def GetExporters(self):
@@ -133,6 +138,7 @@ class PackageBase(object):
 
         :rtype: dict(str, class)
         """
+        self._loadUIElements()
         return self._EXPORTERS
 
     def GetFunctionLibraries(self):
@@ -161,6 +167,7 @@ class PackageBase(object):
 
         :rtype: dict(str, class)
         """
+        self._loadUIElements()
         return self._TOOLS
 
     def PrefsWidgets(self):
@@ -168,6 +175,7 @@ class PackageBase(object):
 
         :rtype: dict(str, class)
         """
+        self._loadUIElements()
         return self._PREFS_WIDGETS
 
     def UIPinsFactory(self):
@@ -175,6 +183,7 @@ class PackageBase(object):
 
         :rtype: function
         """
+        self._loadUIElements()
         return self._UIPinsFactory
 
     def UINodesFactory(self):
@@ -182,6 +191,7 @@ class PackageBase(object):
 
         :rtype: function
         """
+        self._loadUIElements()
         return self._UINodesFactory
 
     def PinsInputWidgetFactory(self):
@@ -189,4 +199,5 @@ class PackageBase(object):
 
         :rtype: function
         """
+        self._loadUIElements()
         return self._PinsInputWidgetFactory
@@ -2,21 +2,82 @@ from uflow.Core.Common import *
 from uflow.Core.GraphManager import GraphManagerSingleton
 
 
-@SingletonDecorator
-class PathsRegistry(object):
-    """Holds paths to nodes and pins. Can rebuild paths and return entities by paths."""
+class GraphPaths(object):
+    """Paths to nodes and pins of single graph manager
+
+    Paths are built once, when object is created. After that it follows
+    :class:`~uflow.Core.NameIndex.NameRegistry` of graph manager and updates only paths of nodes and pins
+    which were added, killed, renamed or moved together with their graph.
+    Created on demand by :attr:`~uflow.Core.GraphManager.GraphManager.paths`.
+
+    :param graphManager: Graph manager to follow
+    :type graphManager: :class:`~uflow.Core.GraphManager.GraphManager`
+    """
 
-    def __init__(self):
+    def __init__(self, graphManager):
         self._data = {}
+        self._paths = {}
+        self.graphManager = graphManager
+        names = graphManager.names
+        names.registered.connect(self._onRegistered)
+        names.unregistered.connect(self._onUnregistered)
+        names.renamed.connect(self._onRenamed)
+        self.rebuild()
 
     def rebuild(self):
-        man = GraphManagerSingleton().get()
-        allNodes = man.getAllNodes()
         self._data.clear()
-        for node in allNodes:
-            self._data[node.path()] = node
+        self._paths.clear()
+        for node in self.graphManager.getAllNodes():
+            self._add(node)
             for pin in node.pins:
-                self._data[pin.path()] = pin
+                self._add(pin)
+
+    def _add(self, entity):
+        path = entity.path()
+        # several entities can share path for a moment, while names are made unique after bulk load
+        self._data.setdefault(path, []).append(entity)
+        self._paths[id(entity)] = path
+
+    def _remove(self, entity):
+        path = self._paths.pop(id(entity), None)
+        if path is None:
+            return
+        entities = self._data.get(path, [])
+        entities[:] = [e for e in entities if e is not entity]
+        if not entities:
+            self._data.pop(path, None)
+
+    def _update(self, entity):
+        self._remove(entity)
+        self._add(entity)
+
+    def _updateNode(self, node):
+        self._update(node)
+        for pin in node.pins:
+            if id(pin) in self._paths:
+                self._update(pin)
+
+    def _updateGraph(self, graph):
+        for node in graph.getNodes().values():
+            self._updateNode(node)
+        for child in graph.childGraphs:
+            self._updateGraph(child)
+
+    def _onRegistered(self, entity, kind=None, graph=None):
+        if kind in ("node", "pin"):
+            self._add(entity)
+
+    def _onUnregistered(self, entity, kind=None, graph=None):
+        if kind in ("node", "pin"):
+            self._remove(entity)
+
+    def _onRenamed(self, entity, kind=None, graph=None):
+        if kind == "node":
+            self._updateNode(entity)
+        elif kind == "pin":
+            self._update(entity)
+        elif kind == "graph":
+            self._updateGraph(entity)
 
     def getAllPaths(self):
         return list(self._data)
@@ -24,11 +85,39 @@ class PathsRegistry(object):
     def contains(self, path):
         return path in self._data
 
+    def getEntity(self, path):
+        if self.contains(path):
+            return self._data[path][0]
+        return None
+
+
+@SingletonDecorator
+class PathsRegistry(object):
+    """Holds paths to nodes and pins. Can rebuild paths and return entities by paths.
+
+    Paths are kept by every graph manager, see :attr:`~uflow.Core.GraphManager.GraphManager.paths`.
+    Registry looks them up in graph manager passed to its methods, in main graph manager of
+    :class:`~uflow.Core.GraphManager.GraphManagerSingleton` by default.
+    """
+
+    @staticmethod
+    def _paths(graphManager=None):
+        if graphManager is None:
+            graphManager = GraphManagerSingleton().get()
+        return graphManager.paths
+
+    def rebuild(self, graphManager=None):
+        self._paths(graphManager).rebuild()
+
+    def getAllPaths(self, graphManager=None):
+        return self._paths(graphManager).getAllPaths()
+
+    def contains(self, path, graphManager=None):
+        return self._paths(graphManager).contains(path)
+
     # def resolvePath(self, base, path):
     #     temp = os.path.normpath(os.path.join(base, path))
     #     res = "/".join(temp.split(os.sep))
 
-    def getEntity(self, path):
-        if self.contains(path):
-            return self._data[path]
-        return None
+    def getEntity(self, path, graphManager=None):
+        return self._paths(graphManager).getEntity(path)
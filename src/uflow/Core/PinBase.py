@@ -1,13 +1,20 @@
 import json
 import uuid
+import logging
 from copy import copy
 
 from blinker import Signal
 
 from uflow.Core.Common import *
 from uflow.Core.EvaluationEngine import EvaluationEngine
+from uflow.Core.Profiler import Profiler
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.SpillManager import SpilledValue
+from uflow.Core.BlobStore import encodeValue, decodeValue
 from uflow.Core.Interfaces import IPin
 
+logger = logging.getLogger(__name__)
+
 
 class PinBase(IPin):
     """
@@ -36,7 +43,7 @@ class PinBase(IPin):
 
     :ivar owningNode: Weak reference to owning node
     :ivar reconnectionPolicy: What to do if connect with busy pin. Used when :attr:`~uflow.Core.Common.PinOptions.AllowMultipleConnections` flag is disabled
-    :ivar dirty: This flag for lazy evaluation
+    :ivar dirty: This flag for lazy evaluation. Backed by generation counters, see :attr:`generation`
     :ivar affects: List of pins this pin affects to
     :ivar affected_by: List of pins that affects to this pin
     :ivar name: Pin name
@@ -77,6 +84,8 @@ class PinBase(IPin):
         self._data = None
         self._defaultValue = None
         self.reconnectionPolicy = PinReconnectionPolicy.DisconnectIfHasConnections
+        self._dirtyGeneration = 0
+        self._cleanGeneration = 0
         self.dirty = True
         self.affects = set()
         self.affected_by = set()
@@ -121,6 +130,8 @@ class PinBase(IPin):
         # registration
         self.owningNode().pins.add(self)
         self.owningNode().pinsCreationOrder[self.uid] = self
+        if self.owningNode().graph is not None:
+            self.owningNode().graph().graphManager.names.addPin(self)
 
         # This is for to be able to connect pins by location on node
         self.pinIndex = 0
@@ -131,6 +142,8 @@ class PinBase(IPin):
 
         self.description = "{} instance".format(self.dataType)
 
+        invalidateEvaluationPlans()
+
     @property
     def wrapperJsonData(self):
         try:
@@ -384,7 +397,12 @@ class PinBase(IPin):
         self._alwaysDict = jsonData["alwaysDict"]
 
         try:
-            self.setData(json.loads(jsonData["value"], cls=self.jsonDecoderClass()))
+            self.setData(decodeValue(jsonData["value"], self.jsonDecoderClass()))
+        except FileNotFoundError as e:
+            # blob of large value is missing, graph is loaded anyway and pin reports the problem
+            self.setData(self.defaultValue())
+            self.setError(str(e))
+            logger.warning("Value of pin %s is not restored. %s", self.getFullName(), e)
         except Exception as e:
             self.setData(self.defaultValue())
 
@@ -401,9 +419,8 @@ class PinBase(IPin):
         serializedData = None
         if not self.dataType == "AnyPin":
             if storable:
-                serializedData = json.dumps(
-                    self.currentData(), cls=self.jsonEncoderClass()
-                )
+                # large values are stored as blobs and referenced by hash
+                serializedData = encodeValue(self.currentData(), self.jsonEncoderClass())
             # else:
             #    serializedData = json.dumps(self.defaultValue(), cls=self.jsonEncoderClass())
 
@@ -441,7 +458,11 @@ class PinBase(IPin):
     @uid.setter
     def uid(self, value):
         if not value == self._uid:
+            oldUid = self._uid
             self._uid = value
+            graph = self.owningNode().graph
+            if graph is not None:
+                graph().graphManager.uidChanged(self, oldUid)
 
     def setName(self, name, force=False):
         """Sets pin name and fires events
@@ -496,7 +517,15 @@ class PinBase(IPin):
 
         .. seealso:: :class:`~uflow.Core.EvaluationEngine.DefaultEvaluationEngine_Impl`
         """
-        return EvaluationEngine().getPinData(self)
+        profiler = Profiler()
+        if not profiler.bEnabled or not self.affected_by:
+            return EvaluationEngine().getPinData(self)
+        start = profiler.enterFrame()
+        try:
+            return EvaluationEngine().getPinData(self)
+        finally:
+            elapsed, _ = profiler.exitFrame(start)
+            profiler.recordPull(self.owningNode(), elapsed)
 
     def clearError(self):
         """Clears any last error on this pin and fires event"""
@@ -530,61 +559,68 @@ class PinBase(IPin):
         """
         if self.super is None:
             return
-        try:
-            self.setDirty()
-            if isinstance(data, DictElement) and not self.optionEnabled(
-                PinOptions.DictElementSupported
-            ):
-                data = data[1]
-            if not self.isArray() and not self.isDict():
-                if isinstance(data, DictElement):
-                    self._data = DictElement(data[0], self.super.processData(data[1]))
-                else:
+        # nested setData calls of affected pins share one invalidation pass
+        with invalidationPass():
+            try:
+                self.setDirty()
+                if isinstance(data, DictElement) and not self.optionEnabled(
+                    PinOptions.DictElementSupported
+                ):
+                    data = data[1]
+                if not self.isArray() and not self.isDict():
+                    if isinstance(data, DictElement):
+                        self._data = DictElement(
+                            data[0], self.super.processData(data[1])
+                        )
+                    else:
+                        if isinstance(data, list):
+                            self._data = data
+                        else:
+                            self._data = self.super.processData(data)
+                elif self.isArray():
                     if isinstance(data, list):
+                        # if self.validateArray(data, self.super.processData):
                         self._data = data
+                        # else:
+                        #    raise Exception("Some Array Input is not valid Data")
                     else:
-                        self._data = self.super.processData(data)
-            elif self.isArray():
-                if isinstance(data, list):
-                    # if self.validateArray(data, self.super.processData):
-                    self._data = data
-                    # else:
-                    #    raise Exception("Some Array Input is not valid Data")
-                else:
-                    self._data = [self.super.processData(data)]
-            elif self.isDict():
-                if isinstance(data, PFDict):
-                    self._data = PFDict(data.keyType, data.valueType)
-                    for key, value in data.items():
-                        self._data[key] = self.super.processData(value)
-                elif isinstance(data, DictElement) and len(data) == 2:
-                    self._data.clear()
-                    self._data[data[0]] = self.super.processData(data[1])
-
-            if self.direction == PinDirection.Output:
-                for i in self.affects:
-                    i.setData(self.currentData())
-
-            elif (
-                self.direction == PinDirection.Input
-                and self.owningNode().__class__.__name__ == "compound"
-            ):
-                for i in self.affects:
-                    i.setData(self.currentData())
+                        self._data = [self.super.processData(data)]
+                elif self.isDict():
+                    if isinstance(data, PFDict):
+                        self._data = PFDict(data.keyType, data.valueType)
+                        for key, value in data.items():
+                            self._data[key] = self.super.processData(value)
+                    elif isinstance(data, DictElement) and len(data) == 2:
+                        self._data.clear()
+                        self._data[data[0]] = self.super.processData(data[1])
+
+                if self.direction == PinDirection.Output:
+                    for i in self.affects:
+                        i.setData(self.currentData())
+
+                elif (
+                    self.direction == PinDirection.Input
+                    and self.owningNode().__class__.__name__ == "compound"
+                ):
+                    for i in self.affects:
+                        i.setData(self.currentData())
 
-            if self.direction == PinDirection.Input or self.optionEnabled(
-                PinOptions.AlwaysPushDirty
-            ):
-                push(self)
-            self.clearError()
-            self.dataBeenSet.send(self)
-        except Exception as exc:
-            self.setError(exc)
-            self.setDirty()
+                if self.direction == PinDirection.Input or self.optionEnabled(
+                    PinOptions.AlwaysPushDirty
+                ):
+                    push(self)
+                self.clearError()
+                sendSignal(self.dataBeenSet, self)
+            except Exception as exc:
+                self.setError(exc)
+                self.setDirty()
+        memory = MemoryManager()
+        if memory.bEnabled:
+            memory.track(self)
         if self._lastError is not None:
             self.owningNode().setError(self._lastError)
         wrapper = self.owningNode().getWrapper()
-        if wrapper:
+        if wrapper and not isEvaluationWorkerThread():
             wrapper.update()
 
     def call(self, *args, **kwargs):
@@ -650,6 +686,8 @@ class PinBase(IPin):
                         continue
                     outputPin.pinIndex = index
                     index += 1
+        invalidateEvaluationPlans()
+        MemoryManager().untrack(self)
         self.killed.send(self)
         clearSignal(self.killed)
 
@@ -660,6 +698,11 @@ class PinBase(IPin):
         """
         if self._data is None:
             return self._defaultValue
+        if self._data.__class__ is SpilledValue:
+            self._data = self._data.load()
+            memory = MemoryManager()
+            if memory.bEnabled:
+                memory.track(self)
         return self._data
 
     def aboutToConnect(self, other):
@@ -1041,21 +1084,58 @@ class PinBase(IPin):
                     port.getWrapper()().update()
                 port.updateConnectedDicts(checked, keyType)
 
+    @property
+    def dirty(self):
+        """Whether pin data is outdated
+
+        Pin is dirty when it has been invalidated more times than it was cleaned.
+
+        :rtype: bool
+        """
+        return self._dirtyGeneration != self._cleanGeneration
+
+    @dirty.setter
+    def dirty(self, value):
+        if value:
+            self._dirtyGeneration += 1
+        else:
+            self._cleanGeneration = self._dirtyGeneration
+
+    @property
+    def generation(self):
+        """Number of times this pin has been invalidated
+
+        Can be compared with previously stored value to find out if pin changed since then.
+
+        :rtype: int
+        """
+        return self._dirtyGeneration
+
     def setClean(self):
-        """Sets dirty flag to True"""
+        """Sets dirty flag to False"""
         self.dirty = False
         # if self.direction == PinDirection.Output:
         #    for i in self.affects:
         #        i.dirty = False
 
     def setDirty(self):
-        """Sets dirty flag to True"""
+        """Sets dirty flag to True
+
+        :attr:`markedAsDirty` is sent once per :func:`~uflow.Core.Common.invalidationPass`,
+        from owning thread when called by evaluation worker thread (see :func:`~uflow.Core.Common.sendSignal`)
+        """
         if self.isExec():
             return
+        bWasDirty = self.dirty
         self.dirty = True
         for i in self.affects:
             i.dirty = True
-        self.markedAsDirty.send()
+        invalidation = currentInvalidationPass()
+        if invalidation is not None:
+            if bWasDirty and self in invalidation.notified:
+                return
+            invalidation.notified.add(self)
+        sendSignal(self.markedAsDirty)
 
     def hasConnections(self):
         """Return the number of connections this pin has
@@ -1118,6 +1198,17 @@ class PinBase(IPin):
     def supportedDataTypes():
         return ()
 
+    @staticmethod
+    def supportsSharedMemoryTransport():
+        """Whether values of this pin can be sent to worker processes through shared memory
+
+        Pins holding numeric :class:`numpy.ndarray` or :class:`pandas.DataFrame` values should return True.
+        See :mod:`~uflow.Core.SharedMemoryTransport`
+
+        :rtype: bool
+        """
+        return False
+
     @staticmethod
     def jsonEncoderClass():
         """Returns json encoder class for this pin"""
@@ -0,0 +1,333 @@
+"""
+.. sidebar:: **ProcessPool.py**
+
+    Process pool execution backend for function based nodes.
+
+Function based nodes (see :mod:`~uflow.Core.FunctionLibrary`) which declare
+
+>>> meta={NodeMeta.ISOLATION: NodeIsolation.Process}
+
+are computed in a warm pool of worker processes when backend is started. Only function identity
+(package, library and function name) and pickled keyword arguments are sent to worker.
+Worker resolves the same function from its own registered packages.
+
+Example:
+::
+
+    ProcessExecutionBackend().start(maxWorkers=4)
+    ...
+    print(ProcessExecutionBackend().report())
+    ProcessExecutionBackend().shutdown()
+
+If arguments or results can not be pickled, node is computed in-process.
+
+Numeric arrays and dataframes of pins which support it are passed through shared memory instead of pickle.
+See :mod:`~uflow.Core.SharedMemoryTransport`.
+"""
+
+import pickle
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from uflow import GET_PACKAGES
+from uflow.Core.Common import *
+from uflow.Core.SharedMemoryTransport import (
+    SharedMemoryRegistry,
+    canTransport,
+    closeSegment,
+    decode,
+    encode,
+    isSharedMemoryDescriptor,
+)
+
+
+def _initializeWorker(additionalPackageLocations):
+    """Runs once in every worker process"""
+    # forked workers inherit registered packages
+    if len(GET_PACKAGES()) == 0:
+        from uflow import INITIALIZE
+
+        INITIALIZE(additionalPackageLocations, headless=True)
+
+
+def _executeFunction(payload):
+    """Worker side entry point
+
+    :param payload: Pickled (packageName, libName, functionName, kwargs, refNames, sharedOutputs) tuple
+    :type payload: bytes
+    :returns: Computing time in nanoseconds and pickled (result, refValues) or None if result can not be pickled
+    :rtype: tuple(int, bytes or None)
+    """
+    packageName, libName, functionName, kwargs, refNames, sharedOutputs = pickle.loads(
+        payload
+    )
+    foo = (
+        GET_PACKAGES()[packageName]
+        .GetFunctionLibraries()[libName]
+        .getFunctions()[functionName]
+    )
+    refValues = {}
+
+    def makeRefSetter(name):
+        def setter(value):
+            refValues[name] = value
+
+        return setter
+
+    for refName in refNames:
+        kwargs[refName] = makeRefSetter(refName)
+
+    # shared inputs are used in place, without copying
+    inputSegments = []
+    for name, value in kwargs.items():
+        if isSharedMemoryDescriptor(value):
+            shm, kwargs[name] = decode(value, copy=False)
+            inputSegments.append(shm)
+
+    try:
+        start = time.perf_counter_ns()
+        foo.owningNode = None
+        result = foo(**kwargs)
+        computeTime = time.perf_counter_ns() - start
+
+        # receiving side copies shared outputs and unlinks segments
+        if "out" in sharedOutputs:
+            result = _shareOutput(result)
+        for name in sharedOutputs:
+            if name in refValues:
+                refValues[name] = _shareOutput(refValues[name])
+
+        try:
+            return computeTime, pickle.dumps(
+                (result, refValues), protocol=pickle.HIGHEST_PROTOCOL
+            )
+        except Exception:
+            return computeTime, None
+    finally:
+        kwargs = result = refValues = None
+        for shm in inputSegments:
+            closeSegment(shm)
+
+
+def _shareOutput(value):
+    if not canTransport(value):
+        return value
+    try:
+        shm, descriptor = encode(value)
+    except OSError:
+        return value
+    closeSegment(shm)
+    return descriptor
+
+
+def _receiveOutput(value):
+    if not isSharedMemoryDescriptor(value):
+        return value, 0
+    shm, restored = decode(value, copy=True)
+    closeSegment(shm, unlink=True)
+    return restored, value["nbytes"]
+
+
+class ProcessExecutionStats(object):
+    """Accumulated per node statistics of process isolated execution"""
+
+    def __init__(self, nodeName):
+        self.nodeName = nodeName
+        self.calls = 0
+        self.fallbacks = 0
+        self.transferNs = 0
+        self.computeNs = 0
+        self.bytesSent = 0
+        self.bytesReceived = 0
+        self.bytesShared = 0
+
+    def serialize(self):
+        return {
+            "node": self.nodeName,
+            "calls": self.calls,
+            "fallbacks": self.fallbacks,
+            "transferMs": self.transferNs / 1e6,
+            "computeMs": self.computeNs / 1e6,
+            "bytesSent": self.bytesSent,
+            "bytesReceived": self.bytesReceived,
+            "bytesShared": self.bytesShared,
+        }
+
+
+@SingletonDecorator
+class ProcessExecutionBackend(object):
+    """Warm process pool used to compute function based nodes out of process"""
+
+    def __init__(self):
+        self._executor = None
+        self._stats = {}
+
+    def start(self, maxWorkers=None, additionalPackageLocations=None, context="spawn"):
+        """Starts worker processes
+
+        :param maxWorkers: Number of worker processes. Defaults to number of processors
+        :type maxWorkers: int or None
+        :param additionalPackageLocations: Package locations passed to :func:`~uflow.INITIALIZE` in workers
+        :type additionalPackageLocations: list(str) or None
+        :param context: Multiprocessing start method
+        :type context: str
+        """
+        if self._executor is not None:
+            return
+        if additionalPackageLocations is None:
+            additionalPackageLocations = []
+        self._executor = ProcessPoolExecutor(
+            max_workers=maxWorkers,
+            mp_context=multiprocessing.get_context(context),
+            initializer=_initializeWorker,
+            initargs=(additionalPackageLocations,),
+        )
+
+    def shutdown(self):
+        """Stops worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        SharedMemoryRegistry().clear()
+
+    def destroy(self):
+        self.shutdown()
+
+    def isEnabled(self):
+        return self._executor is not None
+
+    def _nodeStats(self, node):
+        stats = self._stats.get(node.uid)
+        if stats is None:
+            stats = ProcessExecutionStats(node.getName())
+            self._stats[node.uid] = stats
+        return stats
+
+    def execute(self, node, foo, kwargs, refNames):
+        """Computes function in worker process
+
+        :param node: Node being computed
+        :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+        :param foo: Annotated function node was created from
+        :type foo: function
+        :param kwargs: Values of input pins
+        :type kwargs: dict
+        :param refNames: Names of reference (output) arguments
+        :type refNames: list(str)
+        :returns: Function result and reference values or None if node should be computed in-process
+        :rtype: tuple(object, dict) or None
+        """
+        stats = self._nodeStats(node)
+        start = time.perf_counter_ns()
+        registry = SharedMemoryRegistry()
+        registry.collect()
+
+        sentKwargs = dict(kwargs)
+        shared = []
+        for pin in node.inputs.values():
+            value = sentKwargs.get(pin.name)
+            if pin.supportsSharedMemoryTransport() and canTransport(value):
+                try:
+                    sentKwargs[pin.name] = registry.acquire(value, self._consumers(pin))
+                    stats.bytesShared += sentKwargs[pin.name]["nbytes"]
+                    shared.append((value, pin))
+                except OSError:
+                    pass
+        try:
+            return self._execute(node, foo, sentKwargs, refNames, stats, start)
+        finally:
+            # worker is done with inputs, segments are kept only for other consumers of the same values
+            for value, pin in shared:
+                registry.release(value, pin)
+
+    def _execute(self, node, foo, sentKwargs, refNames, stats, start):
+        sharedOutputs = [
+            pin.name
+            for pin in node.outputs.values()
+            if pin.supportsSharedMemoryTransport()
+        ]
+
+        try:
+            payload = pickle.dumps(
+                (
+                    foo.__annotations__["packageName"],
+                    foo.__annotations__["lib"],
+                    foo.__name__,
+                    sentKwargs,
+                    refNames,
+                    sharedOutputs,
+                ),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        except Exception:
+            stats.fallbacks += 1
+            return None
+
+        computeTime, result = self._executor.submit(_executeFunction, payload).result()
+        if result is None:
+            stats.fallbacks += 1
+            return None
+
+        returnValue, refValues = pickle.loads(result)
+        returnValue, sharedBytes = _receiveOutput(returnValue)
+        stats.bytesShared += sharedBytes
+        for name, value in refValues.items():
+            refValues[name], sharedBytes = _receiveOutput(value)
+            stats.bytesShared += sharedBytes
+
+        stats.calls += 1
+        stats.computeNs += computeTime
+        stats.transferNs += time.perf_counter_ns() - start - computeTime
+        stats.bytesSent += len(payload)
+        stats.bytesReceived += len(result)
+        return returnValue, refValues
+
+    @staticmethod
+    def _consumers(pin):
+        """Input pins of process isolated nodes reading the same value as given pin
+
+        Other nodes read value in-process, segment does not need to wait for them.
+        """
+        consumers = {pin}
+        for source in pin.affected_by:
+            for consumer in source.affects:
+                meta = consumer.owningNode().getMetaData() or {}
+                if (
+                    consumer.supportsSharedMemoryTransport()
+                    and meta.get(NodeMeta.ISOLATION) == NodeIsolation.Process
+                ):
+                    consumers.add(consumer)
+        return consumers
+
+    def stats(self):
+        """Returns per node statistics
+
+        :rtype: dict(:class:`uuid.UUID`, dict)
+        """
+        return {uid: stats.serialize() for uid, stats in self._stats.items()}
+
+    def resetStats(self):
+        self._stats.clear()
+
+    def report(self):
+        """Returns human readable transfer versus compute time table
+
+        :rtype: str
+        """
+        lines = [
+            "{0:<32}{1:>8}{2:>12}{3:>14}{4:>14}".format(
+                "node", "calls", "fallbacks", "transfer ms", "compute ms"
+            )
+        ]
+        for stats in self._stats.values():
+            lines.append(
+                "{0:<32}{1:>8}{2:>12}{3:>14.3f}{4:>14.3f}".format(
+                    stats.nodeName,
+                    stats.calls,
+                    stats.fallbacks,
+                    stats.transferNs / 1e6,
+                    stats.computeNs / 1e6,
+                )
+            )
+        return "\n".join(lines)
@@ -0,0 +1,311 @@
+"""
+.. sidebar:: **Profiler.py**
+
+    Per node and per node type execution statistics.
+
+When profiler is enabled every :meth:`~uflow.Core.NodeBase.NodeBase.computeChecked` call and every call of
+input exec pin is timed with :func:`time.perf_counter_ns`. Calls skipped because node was clean are counted
+as dirty skips. Time spent in :meth:`~uflow.Core.PinBase.PinBase.getData` of connected input pins (pulling
+upstream values) is measured separately. Node self time excludes pulls and nested calls of downstream exec pins.
+
+Example:
+::
+
+    Profiler().enable()
+    ...
+    print(Profiler().report(top=10))
+    Profiler().exportCsv("profile.csv")
+
+Percentiles are computed over the most recent :attr:`Profiler.maxSamples` calls of every node.
+"""
+
+import csv
+import json
+import time
+import threading
+from collections import deque
+
+from uflow.Core.Common import *
+
+#: Columns of statistics rows, in report order
+PROFILE_COLUMNS = (
+    "name",
+    "type",
+    "calls",
+    "skips",
+    "totalMs",
+    "meanMs",
+    "p50Ms",
+    "p95Ms",
+    "maxMs",
+    "pulls",
+    "pullMs",
+    "selfMs",
+)
+
+
+def nodeTypeName(node):
+    """Returns profiler type key of node. Function based nodes are keyed by library and function name
+
+    :param node: Node to get type of
+    :type node: :class:`~uflow.Core.NodeBase.NodeBase`
+    :rtype: str
+    """
+    function = getattr(node, "_function", None)
+    if function is not None:
+        return "{0}.{1}".format(node.lib, function.__name__)
+    return node.__class__.__name__
+
+
+def _percentile(sortedValues, fraction):
+    if not sortedValues:
+        return 0
+    return sortedValues[int(round(fraction * (len(sortedValues) - 1)))]
+
+
+class NodeProfile(object):
+    """Counters of single node
+
+    :param maxSamples: How many recent compute times are kept for percentiles
+    :type maxSamples: int
+    """
+
+    def __init__(self, name, typeName, maxSamples):
+        self.name = name
+        self.typeName = typeName
+        self.calls = 0
+        self.skips = 0
+        self.totalNs = 0
+        self.maxNs = 0
+        self.pulls = 0
+        self.pullNs = 0
+        self.selfNs = 0
+        self.samples = deque(maxlen=maxSamples)
+
+    def addCompute(self, elapsedNs, nestedNs):
+        self.calls += 1
+        self.totalNs += elapsedNs
+        self.selfNs += elapsedNs - nestedNs
+        if elapsedNs > self.maxNs:
+            self.maxNs = elapsedNs
+        self.samples.append(elapsedNs)
+
+    def merge(self, other):
+        self.calls += other.calls
+        self.skips += other.skips
+        self.totalNs += other.totalNs
+        self.maxNs = max(self.maxNs, other.maxNs)
+        self.pulls += other.pulls
+        self.pullNs += other.pullNs
+        self.selfNs += other.selfNs
+        self.samples.extend(other.samples)
+
+    def row(self):
+        """Returns statistics in milliseconds
+
+        :rtype: dict
+        """
+        values = sorted(self.samples)
+        ms = 1e-6
+        return {
+            "name": self.name,
+            "type": self.typeName,
+            "calls": self.calls,
+            "skips": self.skips,
+            "totalMs": self.totalNs * ms,
+            "meanMs": self.totalNs * ms / self.calls if self.calls else 0.0,
+            "p50Ms": _percentile(values, 0.5) * ms,
+            "p95Ms": _percentile(values, 0.95) * ms,
+            "maxMs": self.maxNs * ms,
+            "pulls": self.pulls,
+            "pullMs": self.pullNs * ms,
+            "selfMs": self.selfNs * ms,
+        }
+
+
+@SingletonDecorator
+class Profiler(object):
+    """Collects node execution statistics while enabled"""
+
+    def __init__(self):
+        self.bEnabled = False
+        self.maxSamples = 4096
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._frames = threading.local()
+        self.startedAt = None
+        self.elapsed = 0.0
+
+    def enable(self):
+        if not self.bEnabled:
+            self.bEnabled = True
+            self.startedAt = time.perf_counter()
+
+    def disable(self):
+        if self.bEnabled:
+            self.bEnabled = False
+            self.elapsed += time.perf_counter() - self.startedAt
+
+    def isEnabled(self):
+        return self.bEnabled
+
+    def reset(self):
+        """Drops collected statistics"""
+        with self._lock:
+            self._profiles.clear()
+        self.elapsed = 0.0
+        if self.bEnabled:
+            self.startedAt = time.perf_counter()
+
+    def destroy(self):
+        self.disable()
+        self.reset()
+
+    def _profile(self, node):
+        profile = self._profiles.get(node.uid)
+        if profile is None:
+            profile = NodeProfile(node.getName(), nodeTypeName(node), self.maxSamples)
+            self._profiles[node.uid] = profile
+        return profile
+
+    def _stack(self):
+        stack = getattr(self._frames, "stack", None)
+        if stack is None:
+            stack = self._frames.stack = []
+        return stack
+
+    def enterFrame(self):
+        """Starts measured call. Time of calls nested into it is accumulated separately
+
+        :returns: Start time in nanoseconds
+        :rtype: int
+        """
+        self._stack().append(0)
+        return time.perf_counter_ns()
+
+    def exitFrame(self, start):
+        """Finishes measured call started by :meth:`enterFrame`
+
+        :returns: Call duration and duration of nested calls in nanoseconds
+        :rtype: tuple(int, int)
+        """
+        elapsedNs = time.perf_counter_ns() - start
+        stack = self._stack()
+        nestedNs = stack.pop() if stack else 0
+        if stack:
+            stack[-1] += elapsedNs
+        return elapsedNs, nestedNs
+
+    def recordCompute(self, node, elapsedNs, nestedNs=0):
+        """Records compute call of node
+
+        :param elapsedNs: Call duration in nanoseconds
+        :type elapsedNs: int
+        :param nestedNs: Duration of pulls and exec calls made during this call
+        :type nestedNs: int
+        """
+        with self._lock:
+            self._profile(node).addCompute(elapsedNs, nestedNs)
+
+    def recordSkip(self, node):
+        """Records compute call which was skipped because node was not dirty"""
+        with self._lock:
+            self._profile(node).skips += 1
+
+    def recordPull(self, node, elapsedNs):
+        """Records time node spent pulling upstream value through input pin"""
+        with self._lock:
+            profile = self._profile(node)
+            profile.pulls += 1
+            profile.pullNs += elapsedNs
+
+    def nodeStats(self):
+        """Returns statistics row per profiled node
+
+        :rtype: list(dict)
+        """
+        with self._lock:
+            return [profile.row() for profile in self._profiles.values()]
+
+    def typeStats(self):
+        """Returns statistics row per node type
+
+        :rtype: list(dict)
+        """
+        types = {}
+        with self._lock:
+            for profile in self._profiles.values():
+                total = types.get(profile.typeName)
+                if total is None:
+                    total = NodeProfile(profile.typeName, profile.typeName, None)
+                    types[profile.typeName] = total
+                total.merge(profile)
+        return [profile.row() for profile in types.values()]
+
+    def report(self, top=20, sortKey="totalMs", byType=False):
+        """Returns human readable table of most expensive nodes
+
+        :param top: Number of rows
+        :type top: int
+        :param sortKey: One of :data:`PROFILE_COLUMNS`
+        :type sortKey: str
+        :param byType: Aggregate by node type instead of node
+        :type byType: bool
+        :rtype: str
+        """
+        rows = self.typeStats() if byType else self.nodeStats()
+        rows.sort(key=lambda row: row[sortKey], reverse=True)
+        rows = rows[:top]
+
+        header = "{0:<32} {1:<24} {2:>8} {3:>8} {4:>11} {5:>10} {6:>10} {7:>10} {8:>10} {9:>11} {10:>11}"
+        line = "{0:<32} {1:<24} {2:>8} {3:>8} {4:>11.3f} {5:>10.3f} {6:>10.3f} {7:>10.3f} {8:>10.3f} {9:>11.3f} {10:>11.3f}"
+        lines = [
+            header.format(
+                "name", "type", "calls", "skips", "totalMs", "meanMs", "p50Ms", "p95Ms", "maxMs", "pullMs", "selfMs"
+            )
+        ]
+        for row in rows:
+            lines.append(
+                line.format(
+                    row["name"][:32],
+                    row["type"][:24],
+                    row["calls"],
+                    row["skips"],
+                    row["totalMs"],
+                    row["meanMs"],
+                    row["p50Ms"],
+                    row["p95Ms"],
+                    row["maxMs"],
+                    row["pullMs"],
+                    row["selfMs"],
+                )
+            )
+        return "\n".join(lines)
+
+    def exportCsv(self, filePath, byType=False):
+        """Writes statistics rows to csv file
+
+        :param byType: Aggregate by node type instead of node
+        :type byType: bool
+        """
+        rows = self.typeStats() if byType else self.nodeStats()
+        with open(filePath, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=PROFILE_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def exportJson(self, filePath):
+        """Writes node and type statistics to json file"""
+        elapsed = self.elapsed
+        if self.bEnabled:
+            elapsed += time.perf_counter() - self.startedAt
+        with open(filePath, "w") as f:
+            json.dump(
+                {
+                    "elapsed": elapsed,
+                    "nodes": self.nodeStats(),
+                    "types": self.typeStats(),
+                },
+                f,
+                indent=2,
+            )
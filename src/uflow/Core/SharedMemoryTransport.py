@@ -0,0 +1,263 @@
+"""
+.. sidebar:: **SharedMemoryTransport.py**
+
+    Moves large numeric pin values between processes through :mod:`multiprocessing.shared_memory`.
+
+Numeric :class:`numpy.ndarray` buffers and numeric column blocks of :class:`pandas.DataFrame` are copied into
+shared memory segment once. Only small descriptor (segment name, dtypes, shapes and offsets) goes through pickle channel.
+
+Pin classes opt in by overriding :meth:`~uflow.Core.PinBase.PinBase.supportsSharedMemoryTransport`.
+
+Segments created for values sent to worker processes are reference counted by consuming pins. Consumer is released
+as soon as worker returned its result and segment is freed when no other consumer waits for it. Segments created by
+worker for returned values are copied out and freed by receiving side right away.
+"""
+
+import weakref
+from multiprocessing import shared_memory
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from uflow.Core.Common import *
+
+SHM_DESCRIPTOR_KEY = "__uflowSharedMemory__"
+SEGMENT_ALIGNMENT = 64
+
+
+def isSharedMemoryDescriptor(value):
+    return isinstance(value, dict) and SHM_DESCRIPTOR_KEY in value
+
+
+def _isNumericArray(value):
+    return (
+        numpy is not None
+        and isinstance(value, numpy.ndarray)
+        and not value.dtype.hasobject
+    )
+
+
+def _isNumericColumn(column):
+    return (
+        isinstance(column, numpy.ndarray)
+        and column.dtype.kind in "biufcmM"
+        and not column.dtype.hasobject
+    )
+
+
+def canTransport(value):
+    """Whether value can be moved through shared memory
+
+    :rtype: bool
+    """
+    if _isNumericArray(value):
+        return value.nbytes > 0
+    if pandas is not None and isinstance(value, pandas.DataFrame):
+        return any(
+            _isNumericColumn(value.iloc[:, i].to_numpy(copy=False))
+            for i in range(value.shape[1])
+        )
+    return False
+
+
+def _layout(arrays):
+    """Computes aligned offsets for arrays placed in one segment"""
+    offsets = []
+    size = 0
+    for array in arrays:
+        offsets.append(size)
+        size += roundup(max(array.nbytes, 1), SEGMENT_ALIGNMENT)
+    return offsets, max(size, 1)
+
+
+def _view(shm, dtype, shape, offset):
+    return numpy.ndarray(shape, dtype=numpy.dtype(dtype), buffer=shm.buf, offset=offset)
+
+
+def encode(value):
+    """Copies value to new shared memory segment
+
+    :returns: Opened segment and descriptor
+    :rtype: tuple(:class:`~multiprocessing.shared_memory.SharedMemory`, dict)
+    """
+    if _isNumericArray(value):
+        array = numpy.ascontiguousarray(value)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        _view(shm, array.dtype.str, array.shape, 0)[...] = array
+        descriptor = {
+            SHM_DESCRIPTOR_KEY: True,
+            "segment": shm.name,
+            "kind": "ndarray",
+            "dtype": array.dtype.str,
+            "shape": array.shape,
+            "offset": 0,
+            "nbytes": array.nbytes,
+        }
+        return shm, descriptor
+
+    # dataframe. Numeric columns are stored in segment, others travel inline
+    columns = [value.iloc[:, i].to_numpy(copy=False) for i in range(value.shape[1])]
+    numericIds = [i for i, c in enumerate(columns) if _isNumericColumn(c)]
+    blocks = [numpy.ascontiguousarray(columns[i]) for i in numericIds]
+    offsets, size = _layout(blocks)
+    shm = shared_memory.SharedMemory(create=True, size=size)
+    blockDescriptors = {}
+    for columnId, block, offset in zip(numericIds, blocks, offsets):
+        _view(shm, block.dtype.str, block.shape, offset)[...] = block
+        blockDescriptors[columnId] = (block.dtype.str, block.shape, offset)
+    descriptor = {
+        SHM_DESCRIPTOR_KEY: True,
+        "segment": shm.name,
+        "kind": "dataframe",
+        "columns": list(value.columns),
+        "blocks": blockDescriptors,
+        "objects": {
+            i: value.iloc[:, i] for i in range(value.shape[1]) if i not in blockDescriptors
+        },
+        "index": value.index,
+        "nbytes": sum(b.nbytes for b in blocks),
+    }
+    return shm, descriptor
+
+
+def decode(descriptor, copy=True):
+    """Restores value from descriptor
+
+    :param descriptor: Descriptor returned by :func:`encode`
+    :type descriptor: dict
+    :param copy: If False, returned arrays are views of shared memory and segment must stay opened while they are in use
+    :type copy: bool
+    :returns: Attached segment and restored value
+    :rtype: tuple(:class:`~multiprocessing.shared_memory.SharedMemory`, object)
+    """
+    shm = shared_memory.SharedMemory(name=descriptor["segment"])
+
+    def read(dtype, shape, offset):
+        array = _view(shm, dtype, shape, offset)
+        return array.copy() if copy else array
+
+    if descriptor["kind"] == "ndarray":
+        return shm, read(descriptor["dtype"], descriptor["shape"], descriptor["offset"])
+
+    data = {}
+    for i in range(len(descriptor["columns"])):
+        if i in descriptor["blocks"]:
+            data[i] = read(*descriptor["blocks"][i])
+        else:
+            data[i] = descriptor["objects"][i].to_numpy()
+    frame = pandas.DataFrame(data, index=descriptor["index"], copy=False)
+    frame.columns = descriptor["columns"]
+    return shm, frame
+
+
+def closeSegment(shm, unlink=False):
+    """Closes segment handle. Views still exported by caller keep mapping alive"""
+    try:
+        shm.close()
+    except BufferError:
+        pass
+    if unlink:
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedSegment(object):
+    """Shared memory segment holding value sent to consuming pins"""
+
+    def __init__(self, value):
+        self.value = value
+        self.shm, self.descriptor = encode(value)
+        self._consumers = []
+
+    def addConsumer(self, pin):
+        self._consumers.append((weakref.ref(pin), pin.generation))
+
+    def removeConsumer(self, pin):
+        self._consumers = [
+            (consumerRef, generation)
+            for consumerRef, generation in self._consumers
+            if consumerRef() is not pin
+        ]
+
+    def consumed(self):
+        """Whether all consuming pins are clean, invalidated again or gone"""
+        for consumerRef, generation in self._consumers:
+            pin = consumerRef()
+            if pin is not None and pin.dirty and pin.generation == generation:
+                return False
+        return True
+
+    def free(self):
+        closeSegment(self.shm, unlink=True)
+        self.value = None
+
+
+@SingletonDecorator
+class SharedMemoryRegistry(object):
+    """Reference counted storage of segments created for values sent to worker processes"""
+
+    def __init__(self):
+        self._segments = {}
+        self.bytesShared = 0
+
+    def acquire(self, value, consumerPins):
+        """Returns descriptor of segment holding value
+
+        Same value sent to several consumers is copied to shared memory once.
+
+        :param value: Array or dataframe
+        :param consumerPins: Pins that read this value. Segment lives until all of them are clean or released
+        :type consumerPins: iterable(:class:`~uflow.Core.PinBase.PinBase`)
+        :rtype: dict
+        """
+        segment = self._segments.get(id(value))
+        if segment is None or segment.value is not value:
+            segment = SharedSegment(value)
+            self._segments[id(value)] = segment
+            self.bytesShared += segment.descriptor["nbytes"]
+        for pin in consumerPins:
+            segment.addConsumer(pin)
+        return segment.descriptor
+
+    def release(self, value, pin):
+        """Tells that pin does not need value anymore. Segment is freed if nothing else waits for it
+
+        :param value: Value passed to :meth:`acquire`
+        :param pin: Consuming pin
+        :type pin: :class:`~uflow.Core.PinBase.PinBase`
+        """
+        segment = self._segments.get(id(value))
+        if segment is None or segment.value is not value:
+            return
+        segment.removeConsumer(pin)
+        if segment.consumed():
+            segment.free()
+            self._segments.pop(id(value))
+
+    def collect(self):
+        """Frees segments whose consuming pins are all clean"""
+        for key, segment in list(self._segments.items()):
+            if segment.consumed():
+                segment.free()
+                self._segments.pop(key)
+
+    def clear(self):
+        """Frees all segments"""
+        for segment in self._segments.values():
+            segment.free()
+        self._segments.clear()
+
+    def destroy(self):
+        self.clear()
+
+    def count(self):
+        return len(self._segments)
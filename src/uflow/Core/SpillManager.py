@@ -0,0 +1,278 @@
+"""
+.. sidebar:: **SpillManager.py**
+
+    Moving large clean pin values to disk under memory pressure.
+
+Registers ``spill`` policy of :class:`~uflow.Core.MemoryManager.MemoryManager`. Instead of dropping values over
+memory budget, policy writes them to temporary directory and replaces them in pins with :class:`SpilledValue`
+handle. Handle is loaded back transparently by :meth:`~uflow.Core.PinBase.PinBase.currentData`, so values can be
+inspected again without computing anything.
+
+Numpy arrays are stored with :func:`numpy.save` and loaded memory mapped in copy on write mode. Other values,
+including dataframes, are pickled with protocol 5 and their buffers are written out of band, next to pickle data.
+
+Example:
+::
+
+    MemoryManager().enable(budget=4 * 1024 ** 3, policy="spill")
+
+Spill files are removed when no pin refers to their handle and when process exits.
+"""
+
+import os
+import mmap
+import atexit
+import pickle
+import shutil
+import struct
+import weakref
+import tempfile
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from uflow.Core.Common import *
+from uflow.Core.Memoization import estimateSize
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.Tracer import Tracer
+
+NUMPY_EXTENSION = ".npy"
+PICKLE_EXTENSION = ".pkl"
+_LENGTH = struct.Struct("<Q")
+
+
+def _isPlainArray(value):
+    return (
+        numpy is not None
+        and type(value) in (numpy.ndarray, numpy.memmap)
+        and not value.dtype.hasobject
+    )
+
+
+def _pickleParts(value):
+    """Pickles value with protocol 5, returns payload and out of band buffers"""
+    buffers = []
+    payload = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    return payload, [buffer.raw() for buffer in buffers]
+
+
+def _writePickle(filePath, value, parts=None):
+    payload, buffers = parts if parts is not None else _pickleParts(value)
+    with open(filePath, "wb") as f:
+        f.write(_LENGTH.pack(len(buffers)))
+        f.write(_LENGTH.pack(len(payload)))
+        f.write(payload)
+        for raw in buffers:
+            f.write(_LENGTH.pack(raw.nbytes))
+            f.write(raw)
+
+
+def _readPickle(filePath, bMapped=False):
+    with open(filePath, "rb") as f:
+        if bMapped:
+            # copy on write mapping, buffers are paged in when they are touched
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        else:
+            # read straight into writable buffer, reloaded arrays do not share it with file cache
+            data = bytearray(os.fstat(f.fileno()).st_size)
+            f.readinto(data)
+    view = memoryview(data)
+    count = _LENGTH.unpack_from(view, 0)[0]
+    offset = _LENGTH.size
+    chunks = []
+    for _ in range(count + 1):
+        length = _LENGTH.unpack_from(view, offset)[0]
+        offset += _LENGTH.size
+        # buffers are slices of one buffer, file data is copied at most once
+        chunks.append(view[offset : offset + length])
+        offset += length
+    return pickle.loads(chunks[0], buffers=chunks[1:])
+
+
+class SpilledValue(object):
+    """Handle of pin value stored on disk
+
+    :var filePath: Spill file path
+    :var nbytes: Estimated size of value in memory
+    :var diskBytes: Spill file size
+    """
+
+    __slots__ = ("filePath", "nbytes", "diskBytes", "_loaded", "__weakref__")
+
+    def __init__(self, filePath, nbytes, diskBytes):
+        self.filePath = filePath
+        self.nbytes = nbytes
+        self.diskBytes = diskBytes
+        self._loaded = None
+
+    def load(self):
+        """Returns stored value. Pins sharing handle get the same object while it is alive
+
+        :rtype: object
+        """
+        if self._loaded is not None:
+            value = self._loaded()
+            if value is not None:
+                return value
+        value = SpillManager().reload(self)
+        try:
+            self._loaded = weakref.ref(value)
+        except TypeError:
+            self._loaded = None
+        return value
+
+    def __del__(self):
+        try:
+            os.remove(self.filePath)
+        except OSError:
+            # memory mapped files can not be removed on windows, directory is removed on exit
+            pass
+        SpillManager().fileRemoved(self)
+
+    def __repr__(self):
+        return "<SpilledValue {0} bytes at {1}>".format(self.nbytes, self.filePath)
+
+
+@SingletonDecorator
+class SpillManager(object):
+    """Writes values to spill directory and loads them back
+
+    :var minBytes: Smaller values are not spilled, writing them would not save much
+    """
+
+    def __init__(self):
+        self.directory = None
+        self.minBytes = 1024 * 1024
+        self._counter = 0
+        self._lock = threading.Lock()
+        self.spills = 0
+        self.spilledBytes = 0
+        self.reloads = 0
+        self.reloadedBytes = 0
+        self.files = 0
+        self.diskBytes = 0
+
+    def configure(self, directory=None, minBytes=None):
+        """Sets spill directory. Temporary directory is created on first spill if not set
+
+        :param directory: Directory for spill files
+        :type directory: str or None
+        :param minBytes: Smallest spilled value size
+        :type minBytes: int or None
+        """
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.directory = directory
+        if minBytes is not None:
+            self.minBytes = minBytes
+
+    def _newPath(self, extension):
+        with self._lock:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix="uflowSpill")
+                atexit.register(shutil.rmtree, self.directory, True)
+            self._counter += 1
+            return os.path.join(
+                self.directory,
+                "{0}_{1}{2}".format(os.getpid(), self._counter, extension),
+            )
+
+    def spill(self, value, nbytes=None):
+        """Writes value to disk
+
+        :param nbytes: Known size of value, estimated if not given
+        :type nbytes: int or None
+        :rtype: :class:`SpilledValue`
+        """
+        tracer = Tracer()
+        start = tracer.begin()
+        if nbytes is None:
+            nbytes = estimateSize(value)
+        if _isPlainArray(value):
+            filePath = self._newPath(NUMPY_EXTENSION)
+            numpy.save(filePath, value, allow_pickle=False)
+        else:
+            filePath = self._newPath(PICKLE_EXTENSION)
+            _writePickle(filePath, value)
+        diskBytes = os.path.getsize(filePath)
+        with self._lock:
+            self.spills += 1
+            self.spilledBytes += nbytes
+            self.files += 1
+            self.diskBytes += diskBytes
+        if tracer.bEnabled:
+            tracer.complete("spill", "memory", start, {"bytes": nbytes})
+        return SpilledValue(filePath, nbytes, diskBytes)
+
+    def reload(self, handle):
+        """Loads value of handle from disk
+
+        :type handle: :class:`SpilledValue`
+        :rtype: object
+        """
+        tracer = Tracer()
+        start = tracer.begin()
+        if handle.filePath.endswith(NUMPY_EXTENSION):
+            value = numpy.load(handle.filePath, mmap_mode="c")
+        else:
+            value = _readPickle(handle.filePath)
+        with self._lock:
+            self.reloads += 1
+            self.reloadedBytes += handle.nbytes
+        if tracer.bEnabled:
+            tracer.complete("reload", "memory", start, {"bytes": handle.nbytes})
+        return value
+
+    def fileRemoved(self, handle):
+        with self._lock:
+            self.files -= 1
+            self.diskBytes -= handle.diskBytes
+
+    def stats(self):
+        """Returns spill counters
+
+        :rtype: dict
+        """
+        return {
+            "spills": self.spills,
+            "spilledBytes": self.spilledBytes,
+            "reloads": self.reloads,
+            "reloadedBytes": self.reloadedBytes,
+            "files": self.files,
+            "diskBytes": self.diskBytes,
+        }
+
+    def resetStats(self):
+        self.spills = 0
+        self.spilledBytes = 0
+        self.reloads = 0
+        self.reloadedBytes = 0
+
+
+def spillPin(pin):
+    """Memory policy replacing value of output pin and its copies in connected input pins with spill handle
+
+    :param pin: Output pin
+    :type pin: :class:`~uflow.Core.PinBase.PinBase`
+    :returns: Whether value was spilled
+    :rtype: bool
+    """
+    value = pin._data
+    if value is None or isinstance(value, SpilledValue) or pin.isDict():
+        return False
+    memory = MemoryManager()
+    nbytes = memory.pinBytes(pin)
+    if nbytes < SpillManager().minBytes:
+        return False
+    handle = SpillManager().spill(value, nbytes)
+    for target in [pin] + list(pin.affects):
+        if target._data is value:
+            target._data = handle
+            memory.untrack(target)
+    return True
+
+
+MemoryManager().registerPolicy("spill", spillPin)
@@ -0,0 +1,165 @@
+"""
+.. sidebar:: **Tracer.py**
+
+    Timeline of graph execution in Chrome trace event format.
+
+While enabled, tracer records node computations, exec pin calls, evaluation plan building and ticks
+together with thread ids. Every record is a complete event (``"ph": "X"``) holding begin time and duration,
+so evicted records never leave unmatched begin/end pairs.
+
+Records are kept in bounded ring buffer, oldest are dropped first. This keeps memory constant,
+so tracer can stay enabled in long running processes and be dumped when something looks wrong.
+
+Example:
+::
+
+    Tracer().enable(capacity=200000)
+    ...
+    Tracer().dump("trace.json")
+
+Dumped file can be opened in https://ui.perfetto.dev or ``chrome://tracing``.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+
+from uflow.Core.Common import *
+
+DEFAULT_CAPACITY = 100000
+
+
+@SingletonDecorator
+class Tracer(object):
+    """Ring buffer of trace events"""
+
+    def __init__(self):
+        self.bEnabled = False
+        self._events = deque(maxlen=DEFAULT_CAPACITY)
+        self._origin = time.perf_counter_ns()
+        self._threadNames = {}
+        self.dropped = 0
+
+    def enable(self, capacity=None):
+        """Starts recording
+
+        :param capacity: Maximum number of kept events
+        :type capacity: int or None
+        """
+        if capacity is not None and capacity != self._events.maxlen:
+            self._events = deque(self._events, maxlen=capacity)
+        self.bEnabled = True
+
+    def disable(self):
+        self.bEnabled = False
+
+    def isEnabled(self):
+        return self.bEnabled
+
+    def capacity(self):
+        return self._events.maxlen
+
+    def clear(self):
+        self._events.clear()
+        self.dropped = 0
+
+    def destroy(self):
+        self.disable()
+        self.clear()
+
+    def begin(self):
+        """Returns timestamp to pass to :meth:`complete`
+
+        :rtype: int
+        """
+        return time.perf_counter_ns()
+
+    def complete(self, name, category, start, args=None):
+        """Records event which started at ``start`` and ends now
+
+        :param name: Event name
+        :type name: str
+        :param category: Event category, used for filtering in trace viewers
+        :type category: str
+        :param start: Value returned by :meth:`begin`
+        :type start: int
+        :param args: Additional json compatible data shown for event
+        :type args: dict or None
+        """
+        end = time.perf_counter_ns()
+        thread = threading.current_thread()
+        if thread.ident not in self._threadNames:
+            self._threadNames[thread.ident] = thread.name
+        if len(self._events) == self._events.maxlen:
+            self.dropped += 1
+        # deque append is atomic, no lock needed for worker threads
+        self._events.append((name, category, start, end - start, thread.ident, args))
+
+    def events(self):
+        """Returns recorded events in trace event format
+
+        :rtype: list(dict)
+        """
+        pid = os.getpid()
+        result = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self._threadNames.items())
+        ]
+        for name, category, start, duration, tid, args in list(self._events):
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin) / 1000.0,
+                "dur": duration / 1000.0,
+                "pid": pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            result.append(event)
+        return result
+
+    def dump(self, filePath):
+        """Writes recorded events to json file
+
+        :returns: Number of written events
+        :rtype: int
+        """
+        events = self.events()
+        with open(filePath, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": events,
+                    "displayTimeUnit": "ms",
+                    "otherData": {"droppedEvents": self.dropped},
+                },
+                f,
+            )
+        return len(events)
+
+    def dumpOnSignal(self, filePath):
+        """Dumps events to file every time process receives ``SIGUSR1``. Not available on Windows
+
+        :returns: Whether handler was installed
+        :rtype: bool
+        """
+        import signal
+
+        if not hasattr(signal, "SIGUSR1"):
+            return False
+
+        def handler(signum, frame):
+            count = self.dump(filePath)
+            print("Trace with {0} events written to {1}".format(count, filePath))
+
+        signal.signal(signal.SIGUSR1, handler)
+        return True
@@ -1,10 +1,13 @@
 from blinker import Signal
-import json
+import logging
 import uuid
 
 from uflow import getPinDefaultValueByType
 from uflow.Core.Common import *
 from uflow.Core.Interfaces import IItemBase
+from uflow.Core.BlobStore import encodeValue, decodeValue
+
+logger = logging.getLogger(__name__)
 
 
 class Variable(IItemBase):
@@ -216,7 +219,7 @@ class Variable(IItemBase):
         if self.dataType == "AnyPin":
             template["value"] = None
         else:
-            template["value"] = json.dumps(self.value, cls=pinClass.jsonEncoderClass())
+            template["value"] = encodeValue(self.value, pinClass.jsonEncoderClass())
         if self.structure == StructureType.Dict:
             template["dictKeyType"] = self.value.keyType
             template["dictValueType"] = self.value.valueType
@@ -244,7 +247,12 @@ class Variable(IItemBase):
 
             if dataType != "AnyPin":
                 pinClass = findPinClassByType(dataType)
-                value = json.loads(jsonData["value"], cls=pinClass.jsonDecoderClass())
+                try:
+                    value = decodeValue(jsonData["value"], pinClass.jsonDecoderClass())
+                except FileNotFoundError as e:
+                    # blob of large value is missing, graph is loaded anyway
+                    value = getPinDefaultValueByType(dataType)
+                    logger.warning("Value of variable %s is not restored. %s", name, e)
             else:
                 value = getPinDefaultValueByType("AnyPin")
 
@@ -1,15 +1,23 @@
 import argparse
 import os
-import json
-import threading
 
-from uflow.App import uflow
-from uflow import graphUiParser
-from qtpy.QtWidgets import QApplication
 from uflow import INITIALIZE
 from uflow.Core.Common import *
 from uflow.Core.version import currentVersion
 from uflow.Core.GraphManager import GraphManagerSingleton
+from uflow.Core.GraphRunner import GraphRunner
+from uflow.Core.DiskCache import DiskCache
+from uflow.Core.GraphCompiler import compileGraph, GraphCompilationError
+from uflow.Core.BatchJobs import runBatch
+from uflow.Core.GraphService import GraphService, DEFAULT_PORT
+from uflow.Core.Profiler import Profiler
+from uflow.Core.ProcessPool import ProcessExecutionBackend
+from uflow.Core.Tracer import Tracer, DEFAULT_CAPACITY
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.SpillManager import SpillManager
+from uflow.Core.IntermediateRelease import IntermediateReleaser
+from uflow.Core.BulkLoad import LoadTimings, readGraphFile
+from uflow.Core.GraphContainer import CONTAINER_EXTENSION, writeGraphFile
 
 
 def getGraphArguments(data, parser):
@@ -37,20 +45,176 @@ def getGraphArguments(data, parser):
 
 
 def main():
-    parser = argparse.ArgumentParser(description="uflow CLI")
+    # graph inputs become flags, so prefixes must not match other options
+    parser = argparse.ArgumentParser(description="uflow CLI", allow_abbrev=False)
     parser.add_argument(
-        "-m", "--mode", type=str, default="edit", choices=["edit", "run", "runui"]
+        "-m",
+        "--mode",
+        type=str,
+        default="edit",
+        choices=["edit", "run", "runui", "compile", "serve", "convert"],
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Compiled python module path in compile mode, defaults to graph file path with .py extension. "
+        "Results file in batch run, .csv or .jsonl, defaults to stdout. "
+        "Converted graph in convert mode, {0} files are written as container, other as json".format(
+            CONTAINER_EXTENSION
+        ),
     )
     parser.add_argument("-f", "--filePath", type=str, default="untitled.pygraph")
     parser.add_argument("--version", action="version", version=str(currentVersion()))
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Store outputs of nodes with persistent cache enabled on disk",
+    )
+    parser.add_argument(
+        "--cacheDir",
+        type=str,
+        default=None,
+        help="Disk cache directory. Implies --cache",
+    )
+    parser.add_argument(
+        "--cacheSize", type=int, default=1024, help="Disk cache size limit in megabytes"
+    )
+    parser.add_argument(
+        "--noCache", action="store_true", help="Bypass disk cache for this run"
+    )
+    parser.add_argument(
+        "--clearCache", action="store_true", help="Remove all disk cache entries"
+    )
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        help="Run graph for every record of .jsonl or .csv file",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of batch worker processes. Defaults to number of processors",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=1, help="Retries of failed batch records"
+    )
+    parser.add_argument(
+        "--graphs",
+        type=str,
+        nargs="+",
+        default=None,
+        help="Graph files served in serve mode. Defaults to --filePath",
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--socket", type=str, default=None, help="Serve on unix socket instead of tcp"
+    )
+    parser.add_argument(
+        "--instances",
+        type=int,
+        default=4,
+        help="Warm instances of every served graph, maximum concurrent executions per graph",
+    )
+    parser.add_argument(
+        "--processPool",
+        type=int,
+        nargs="?",
+        const=0,
+        default=None,
+        metavar="N",
+        help="Compute process isolated nodes in run mode in pool of N worker processes. "
+        "N defaults to number of processors",
+    )
+    parser.add_argument(
+        "--profile",
+        type=int,
+        nargs="?",
+        const=20,
+        default=None,
+        metavar="N",
+        help="Profile nodes in run mode and print N most expensive ones and graph loading phases",
+    )
+    parser.add_argument(
+        "--profileOutput",
+        type=str,
+        default=None,
+        help="Export profile statistics to .csv or .json file",
+    )
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        help="Record execution timeline and write it to chrome trace json file on exit or SIGUSR1",
+    )
+    parser.add_argument(
+        "--traceCapacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Number of most recent trace events kept in memory",
+    )
+    parser.add_argument(
+        "--releaseIntermediates",
+        action="store_true",
+        help="Free intermediate values in run mode as soon as all consumers computed",
+    )
+    parser.add_argument(
+        "--memoryBudget",
+        type=int,
+        default=None,
+        help="Memory budget of pin values in megabytes. Largest intermediates are freed above it",
+    )
+    parser.add_argument(
+        "--spillDir",
+        type=str,
+        default=None,
+        help="Directory for values spilled to disk. Temporary directory by default",
+    )
+    parser.add_argument(
+        "--memoryPolicy",
+        type=str,
+        default="release",
+        help="How intermediates over memory budget are freed: release or spill",
+    )
     parsedArguments, unknown = parser.parse_known_args(sys.argv[1:])
 
     filePath = parsedArguments.filePath
 
-    if not filePath.endswith(".pygraph"):
+    if parsedArguments.clearCache:
+        DiskCache().configure(parsedArguments.cacheDir)
+        DiskCache().clear()
+        DiskCache().disable()
+    if (
+        parsedArguments.cache or parsedArguments.cacheDir
+    ) and not parsedArguments.noCache:
+        DiskCache().configure(
+            parsedArguments.cacheDir, maxBytes=parsedArguments.cacheSize * 1024**2
+        )
+
+    if not filePath.endswith((".pygraph", CONTAINER_EXTENSION)):
         filePath += ".pygraph"
 
+    tracePath = parsedArguments.trace
+    if tracePath is not None:
+        Tracer().enable(parsedArguments.traceCapacity)
+        # long running processes can be asked for trace at any moment
+        Tracer().dumpOnSignal(tracePath)
+    if parsedArguments.spillDir is not None:
+        SpillManager().configure(parsedArguments.spillDir)
+    if parsedArguments.memoryBudget is not None:
+        MemoryManager().enable(
+            parsedArguments.memoryBudget * 1024**2, parsedArguments.memoryPolicy
+        )
+
     if parsedArguments.mode == "edit":
+        # gui modules are imported only by gui modes, so headless modes work without Qt
+        from qtpy.QtWidgets import QApplication
+        from uflow.App import uflow
+
         app = QApplication(sys.argv)
 
         instance = uflow.instance(software="standalone")
@@ -58,10 +222,8 @@ def main():
             app.setActiveWindow(instance)
             instance.show()
             if os.path.exists(filePath):
-                with open(filePath, "r") as f:
-                    data = json.load(f)
-                    instance.loadFromData(data)
-                    instance.currentFileName = filePath
+                instance.loadFromData(readGraphFile(filePath))
+                instance.currentFileName = filePath
 
             try:
                 sys.exit(app.exec_())
@@ -72,23 +234,27 @@ def main():
         if not os.path.exists(filePath):
             print("No such file. {}".format(filePath))
             return
-        with open(filePath, "r") as f:
-            data = json.load(f)
+        if parsedArguments.batch is not None:
+            summary = runBatch(
+                filePath,
+                parsedArguments.batch,
+                parsedArguments.output,
+                parsedArguments.workers,
+                parsedArguments.retries,
+                releaseIntermediates=parsedArguments.releaseIntermediates,
+            )
+            # keep stdout clean when results are streamed to it
+            sys.stderr.write(summary.report() + "\n")
+            return
+        loadTimings = LoadTimings()
+        data = readGraphFile(filePath, loadTimings)
         getGraphArguments(data, parser)
         parsedArguments = parser.parse_args()
 
         # load updated data
-        INITIALIZE()
+        INITIALIZE(headless=True)
         GM = GraphManagerSingleton().get()
-        GM.deserialize(data)
-
-        # fake main loop
-        def programLoop():
-            while True:
-                GM.Tick(deltaTime=0.02)
-                time.sleep(0.02)
-                if GM.terminationRequested:
-                    break
+        GM.deserialize(data, loadTimings)
 
         # call graph inputs nodes
         root = GM.findRootGraph()
@@ -104,12 +270,131 @@ def main():
                     if cliValue is not None:
                         outPin.setData(cliValue)
 
-        for foo in evalFunctions:
-            foo()
-
-        loopThread = threading.Thread(target=programLoop)
-        loopThread.start()
-        loopThread.join()
+        bProfile = (
+            parsedArguments.profile is not None
+            or parsedArguments.profileOutput is not None
+        )
+        if bProfile:
+            Profiler().enable()
+        if parsedArguments.processPool is not None:
+            ProcessExecutionBackend().start(parsedArguments.processPool or None)
+        runner = GraphRunner(GM)
+        try:
+            if parsedArguments.releaseIntermediates:
+                with IntermediateReleaser(GM):
+                    runner.run(evalFunctions)
+            else:
+                runner.run(evalFunctions)
+        finally:
+            if ProcessExecutionBackend().isEnabled():
+                print(ProcessExecutionBackend().report())
+                ProcessExecutionBackend().shutdown()
+        print(runner.report())
+        if MemoryManager().isEnabled():
+            memoryStats = MemoryManager().stats()
+            print(
+                "Memory: {0} bytes held, {1} bytes released in {2} releases".format(
+                    memoryStats["bytes"],
+                    memoryStats["releasedBytes"],
+                    memoryStats["releases"],
+                )
+            )
+            spillStats = SpillManager().stats()
+            if spillStats["spills"]:
+                print(
+                    "Spilled {0} values ({1} bytes), reloaded {2} values ({3} bytes)".format(
+                        spillStats["spills"],
+                        spillStats["spilledBytes"],
+                        spillStats["reloads"],
+                        spillStats["reloadedBytes"],
+                    )
+                )
+        if bProfile:
+            Profiler().disable()
+            print(loadTimings.report())
+            print(Profiler().report(top=parsedArguments.profile or 20))
+            print(Profiler().report(top=parsedArguments.profile or 20, byType=True))
+            profileOutput = parsedArguments.profileOutput
+            if profileOutput is not None:
+                if profileOutput.lower().endswith(".json"):
+                    Profiler().exportJson(profileOutput)
+                else:
+                    Profiler().exportCsv(profileOutput)
+        if tracePath is not None:
+            print(
+                "Trace with {0} events written to {1}".format(
+                    Tracer().dump(tracePath), tracePath
+                )
+            )
 
     if parsedArguments.mode == "runui":
+        from uflow import graphUiParser
+
         graphUiParser.run(filePath)
+
+    if parsedArguments.mode == "compile":
+        if not os.path.exists(filePath):
+            print("No such file. {}".format(filePath))
+            return
+        data = readGraphFile(filePath)
+
+        INITIALIZE(headless=True)
+        GM = GraphManagerSingleton().get()
+        GM.deserialize(data)
+
+        outputPath = parsedArguments.output
+        if outputPath is None:
+            outputPath = os.path.splitext(filePath)[0] + ".py"
+        try:
+            source = compileGraph(GM.findRootGraph())
+        except GraphCompilationError as e:
+            print("Failed to compile {0}. {1}".format(filePath, e))
+            return
+        with open(outputPath, "w") as f:
+            f.write(source)
+        print("Compiled {0} to {1}".format(filePath, outputPath))
+
+    if parsedArguments.mode == "serve":
+        filePaths = parsedArguments.graphs or [filePath]
+        for graphPath in filePaths:
+            if not os.path.exists(graphPath):
+                print("No such file. {}".format(graphPath))
+                return
+
+        INITIALIZE(headless=True)
+        service = GraphService(filePaths, instances=parsedArguments.instances)
+        if parsedArguments.socket is not None:
+            print(
+                "Serving {0} on {1}".format(
+                    ", ".join(service.pools), parsedArguments.socket
+                )
+            )
+        else:
+            print(
+                "Serving {0} on http://{1}:{2}".format(
+                    ", ".join(service.pools), parsedArguments.host, parsedArguments.port
+                )
+            )
+        service.serve(
+            parsedArguments.host, parsedArguments.port, parsedArguments.socket
+        )
+        if tracePath is not None:
+            print(
+                "Trace with {0} events written to {1}".format(
+                    Tracer().dump(tracePath), tracePath
+                )
+            )
+
+    if parsedArguments.mode == "convert":
+        if not os.path.exists(filePath):
+            print("No such file. {}".format(filePath))
+            return
+        outputPath = parsedArguments.output
+        if outputPath is None:
+            base, extension = os.path.splitext(filePath)
+            outputPath = base + (
+                ".pygraph" if extension == CONTAINER_EXTENSION else CONTAINER_EXTENSION
+            )
+        # graph is not deserialized, so packages are not needed
+        writeGraphFile(outputPath, readGraphFile(filePath))
+        print("Converted {0} to {1}".format(filePath, outputPath))
@@ -116,7 +116,10 @@ class UIPinBase(QGraphicsWidget):
         if self.watchWidget is not None:
             self.scene().removeItem(self.watchWidget)
             self.watchWidget = None
+            self._rawPin.disableOptions(PinOptions.KeepData)
         else:
+            # watched value must stay available
+            self._rawPin.enableOptions(PinOptions.KeepData)
             scene = self.owningNode().canvasRef().scene()
             self.watchWidget = WatchItem()
             scene.addItem(self.watchWidget)
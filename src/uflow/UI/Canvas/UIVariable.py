@@ -1,5 +1,3 @@
-import json
-
 from qtpy import QtCore
 from qtpy import QtGui
 from qtpy.QtWidgets import QWidget
@@ -14,6 +12,7 @@ from qtpy.QtWidgets import QInputDialog
 
 from uflow import getHashableDataTypes
 from uflow.Core.Common import *
+from uflow.Core.BlobStore import encodeValue, decodeValue
 from uflow.UI.EditorHistory import EditorHistory
 from uflow.UI.UIInterfaces import IPropertiesViewSupport
 from uflow.UI.Widgets.InputWidgets import createInputWidget
@@ -346,8 +345,8 @@ class UIVariable(QWidget, IPropertiesViewSupport):
             # value will be calculated for this type of variables
             template["value"] = None
         else:
-            template["value"] = json.dumps(
-                self._rawVariable.value, cls=pinClass.jsonEncoderClass()
+            template["value"] = encodeValue(
+                self._rawVariable.value, pinClass.jsonEncoderClass()
             )
 
         template["type"] = self._rawVariable.dataType
@@ -371,7 +370,7 @@ class UIVariable(QWidget, IPropertiesViewSupport):
         if data["dataType"] == "AnyPin":
             var.value = getPinDefaultValueByType("AnyPin")
         else:
-            var.value = json.loads(data["value"], cls=pinClass.jsonDecoderClass())
+            var.value = decodeValue(data["value"], pinClass.jsonDecoderClass())
 
         return var
 
@@ -0,0 +1,158 @@
+from qtpy import QtWidgets
+from qtpy import QtCore
+
+from uflow.UI.Tool.Tool import DockTool
+from uflow.UI.Tool.ProfilerTool import _NumericItem
+from uflow.Core.MemoryManager import (
+    MemoryManager,
+    MEMORY_PIN_COLUMNS,
+    MEMORY_NODE_COLUMNS,
+)
+from uflow.Core.SpillManager import SpillManager
+
+
+def _formatBytes(value):
+    if value < 1024:
+        return "{0} B".format(value)
+    for unit in ("KB", "MB", "GB"):
+        value /= 1024.0
+        if value < 1024 or unit == "GB":
+            return "{0:.1f} {1}".format(value, unit)
+
+
+class MemoryTool(DockTool):
+    """Shows estimated memory held by pins and nodes and configures memory budget of
+    :class:`~uflow.Core.MemoryManager.MemoryManager`
+    """
+
+    def __init__(self):
+        super(MemoryTool, self).__init__()
+        self.content = QtWidgets.QWidget()
+        self.setWidget(self.content)
+        layout = QtWidgets.QVBoxLayout(self.content)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        controls = QtWidgets.QHBoxLayout()
+        self.enabledCheckBox = QtWidgets.QCheckBox("Enabled")
+        self.enabledCheckBox.setChecked(MemoryManager().isEnabled())
+        self.enabledCheckBox.toggled.connect(self.onEnabledToggled)
+        controls.addWidget(self.enabledCheckBox)
+        self.byNodeCheckBox = QtWidgets.QCheckBox("By node")
+        self.byNodeCheckBox.setChecked(True)
+        self.byNodeCheckBox.toggled.connect(self.refresh)
+        controls.addWidget(self.byNodeCheckBox)
+
+        controls.addWidget(QtWidgets.QLabel("Budget"))
+        self.budgetSpinBox = QtWidgets.QSpinBox()
+        self.budgetSpinBox.setRange(0, 1024 * 1024)
+        self.budgetSpinBox.setSuffix(" MB")
+        self.budgetSpinBox.setSpecialValueText("Unlimited")
+        self.budgetSpinBox.setValue((MemoryManager().budget or 0) // 1024**2)
+        self.budgetSpinBox.valueChanged.connect(self.onBudgetChanged)
+        controls.addWidget(self.budgetSpinBox)
+        self.policyComboBox = QtWidgets.QComboBox()
+        self.policyComboBox.addItems(sorted(MemoryManager().policies))
+        self.policyComboBox.setCurrentText(MemoryManager().policy)
+        self.policyComboBox.currentTextChanged.connect(MemoryManager().setPolicy)
+        controls.addWidget(self.policyComboBox)
+
+        controls.addStretch()
+        self.totalLabel = QtWidgets.QLabel()
+        controls.addWidget(self.totalLabel)
+        for text, slot in (("Refresh", self.refresh), ("Enforce", self.onEnforce)):
+            button = QtWidgets.QPushButton(text)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        layout.addLayout(controls)
+
+        self.table = QtWidgets.QTableWidget()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.refreshTimer = QtCore.QTimer(self)
+        self.refreshTimer.timeout.connect(self.refresh)
+        self.refreshTimer.start(1000)
+
+    def onEnabledToggled(self, bEnabled):
+        if bEnabled:
+            MemoryManager().enable()
+        else:
+            MemoryManager().disable()
+
+    def onBudgetChanged(self, megabytes):
+        MemoryManager().setBudget(megabytes * 1024**2)
+
+    def onEnforce(self):
+        MemoryManager().enforceBudget(self.uflowInstance.graphManager.get())
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        memory = MemoryManager()
+        stats = memory.stats()
+        spillStats = SpillManager().stats()
+        self.totalLabel.setText(
+            "{0} in {1} objects, spilled {2} ({3} files), reloaded {4} times".format(
+                _formatBytes(stats["bytes"]),
+                stats["objects"],
+                _formatBytes(spillStats["spilledBytes"]),
+                spillStats["files"],
+                spillStats["reloads"],
+            )
+        )
+        if self.byNodeCheckBox.isChecked():
+            columns = MEMORY_NODE_COLUMNS
+            rows = memory.nodeStats()
+        else:
+            columns = MEMORY_PIN_COLUMNS
+            rows = memory.pinStats()
+
+        header = self.table.horizontalHeader()
+        sortColumn = header.sortIndicatorSection()
+        sortOrder = header.sortIndicatorOrder()
+        self.table.setSortingEnabled(False)
+        self.table.setColumnCount(len(columns))
+        self.table.setHorizontalHeaderLabels(columns)
+        self.table.setRowCount(len(rows))
+        for rowIndex, row in enumerate(rows):
+            for columnIndex, column in enumerate(columns):
+                value = row[column]
+                if column == "bytes":
+                    item = _NumericItem(value, _formatBytes(value))
+                elif isinstance(value, bool):
+                    item = QtWidgets.QTableWidgetItem("yes" if value else "")
+                elif isinstance(value, int):
+                    item = _NumericItem(value, str(value))
+                else:
+                    item = QtWidgets.QTableWidgetItem(value)
+                self.table.setItem(rowIndex, columnIndex, item)
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(sortColumn, sortOrder)
+
+    def onShow(self):
+        super(MemoryTool, self).onShow()
+        self.enabledCheckBox.setChecked(MemoryManager().isEnabled())
+        self.refresh()
+
+    def onDestroy(self):
+        self.refreshTimer.stop()
+
+    @staticmethod
+    def isSingleton():
+        return True
+
+    @staticmethod
+    def defaultDockArea():
+        return QtCore.Qt.BottomDockWidgetArea
+
+    @staticmethod
+    def toolTip():
+        return "Estimated memory held by pins"
+
+    @staticmethod
+    def name():
+        return "Memory"
@@ -0,0 +1,136 @@
+from qtpy import QtWidgets
+from qtpy import QtCore
+
+from uflow.UI.Tool.Tool import DockTool
+from uflow.Core.Profiler import Profiler, PROFILE_COLUMNS
+
+
+class _NumericItem(QtWidgets.QTableWidgetItem):
+    """Table item sorted by value instead of text"""
+
+    def __init__(self, value, text):
+        super(_NumericItem, self).__init__(text)
+        self.value = value
+
+    def __lt__(self, other):
+        if isinstance(other, _NumericItem):
+            return self.value < other.value
+        return super(_NumericItem, self).__lt__(other)
+
+
+class ProfilerTool(DockTool):
+    """Shows per node and per node type execution statistics collected by
+    :class:`~uflow.Core.Profiler.Profiler`
+    """
+
+    def __init__(self):
+        super(ProfilerTool, self).__init__()
+        self.content = QtWidgets.QWidget()
+        self.setWidget(self.content)
+        layout = QtWidgets.QVBoxLayout(self.content)
+        layout.setContentsMargins(2, 2, 2, 2)
+
+        controls = QtWidgets.QHBoxLayout()
+        self.enabledCheckBox = QtWidgets.QCheckBox("Enabled")
+        self.enabledCheckBox.setChecked(Profiler().isEnabled())
+        self.enabledCheckBox.toggled.connect(self.onEnabledToggled)
+        controls.addWidget(self.enabledCheckBox)
+        self.byTypeCheckBox = QtWidgets.QCheckBox("By type")
+        self.byTypeCheckBox.toggled.connect(self.refresh)
+        controls.addWidget(self.byTypeCheckBox)
+        controls.addStretch()
+        for text, slot in (
+            ("Refresh", self.refresh),
+            ("Reset", self.onReset),
+            ("Export", self.onExport),
+        ):
+            button = QtWidgets.QPushButton(text)
+            button.clicked.connect(slot)
+            controls.addWidget(button)
+        layout.addLayout(controls)
+
+        self.table = QtWidgets.QTableWidget()
+        self.table.setColumnCount(len(PROFILE_COLUMNS))
+        self.table.setHorizontalHeaderLabels(PROFILE_COLUMNS)
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        self.refreshTimer = QtCore.QTimer(self)
+        self.refreshTimer.timeout.connect(self.refresh)
+        self.refreshTimer.start(1000)
+
+    def onEnabledToggled(self, bEnabled):
+        if bEnabled:
+            Profiler().enable()
+        else:
+            Profiler().disable()
+
+    def onReset(self):
+        Profiler().reset()
+        self.refresh()
+
+    def onExport(self):
+        nameFilter = "CSV (*.csv);;JSON (*.json)"
+        filePath, selectedFilter = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export profile", "profile.csv", nameFilter
+        )
+        if not filePath:
+            return
+        if filePath.lower().endswith(".json"):
+            Profiler().exportJson(filePath)
+        else:
+            Profiler().exportCsv(filePath, self.byTypeCheckBox.isChecked())
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        profiler = Profiler()
+        rows = (
+            profiler.typeStats()
+            if self.byTypeCheckBox.isChecked()
+            else profiler.nodeStats()
+        )
+        header = self.table.horizontalHeader()
+        sortColumn = header.sortIndicatorSection()
+        sortOrder = header.sortIndicatorOrder()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(rows))
+        for rowIndex, row in enumerate(rows):
+            for columnIndex, column in enumerate(PROFILE_COLUMNS):
+                value = row[column]
+                if isinstance(value, str):
+                    item = QtWidgets.QTableWidgetItem(value)
+                elif isinstance(value, float):
+                    item = _NumericItem(value, "{0:.3f}".format(value))
+                else:
+                    item = _NumericItem(value, str(value))
+                self.table.setItem(rowIndex, columnIndex, item)
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(sortColumn, sortOrder)
+
+    def onShow(self):
+        super(ProfilerTool, self).onShow()
+        self.enabledCheckBox.setChecked(Profiler().isEnabled())
+        self.refresh()
+
+    def onDestroy(self):
+        self.refreshTimer.stop()
+
+    @staticmethod
+    def isSingleton():
+        return True
+
+    @staticmethod
+    def defaultDockArea():
+        return QtCore.Qt.BottomDockWidgetArea
+
+    @staticmethod
+    def toolTip():
+        return "Node execution statistics"
+
+    @staticmethod
+    def name():
+        return "Profiler"
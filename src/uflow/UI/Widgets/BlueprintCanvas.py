@@ -1,5 +1,6 @@
 from copy import deepcopy
 import json
+import logging
 import uuid
 from collections import Counter
 from functools import partial
@@ -28,6 +29,22 @@ from uflow.UI.Views.VariablesWidget import VARIABLE_TAG, VARIABLE_DATA_TAG
 
 from uflow import getRawNodeInstance
 from uflow.Core.Common import *
+from uflow.Core.BlobStore import decodeValue
+
+logger = logging.getLogger(__name__)
+
+
+def _restorePinData(pin, serialized):
+    """Sets serialized value to ui pin, default value is set if value can not be restored"""
+    try:
+        pin.setData(decodeValue(serialized, pin.jsonDecoderClass()))
+    except FileNotFoundError as e:
+        # blob of large value is missing
+        pin.setData(pin.defaultValue())
+        pin._rawPin.setError(str(e))
+        logger.warning("Value of pin %s is not restored. %s", pin.getFullName(), e)
+    except:
+        pin.setData(pin.defaultValue())
 
 
 def getNodeInstance(jsonTemplate, canvas, parentGraph=None):
@@ -528,16 +545,16 @@ class BlueprintCanvas(CanvasBase):
         self.pasteNodes(data=copiedJson)
         EditorHistory().saveState("Duplicate nodes", modify=True)
 
-    def makeSerializedNodesUnique(self, nodes, extra=None):
-        if extra is None:
-            extra = []
+    def makeSerializedNodesUnique(self, nodes, existingNames=None):
+        if existingNames is None:
+            # names reserved by copied nodes must not affect graph manager, so work on copy of index
+            existingNames = self.graphManager.names.all.copy()
         copiedNodes = deepcopy(nodes)
         # make names unique
         renameData = {}
-        existingNames = self.graphManager.getAllNames() + extra
         for node in copiedNodes:
-            newName = getUniqNameFromList(existingNames, node["name"])
-            existingNames.append(newName)
+            newName = existingNames.uniqName(node["name"])
+            existingNames.add(newName)
             renameData[node["name"]] = newName
             # rename old name in header data
             node["wrapper"]["headerHtml"] = node["wrapper"]["headerHtml"].replace(
@@ -574,7 +591,7 @@ class BlueprintCanvas(CanvasBase):
         for node in copiedNodes:
             if node["type"] == "compound":
                 node["graphData"]["nodes"] = self.makeSerializedNodesUnique(
-                    node["graphData"]["nodes"], extra=existingNames
+                    node["graphData"]["nodes"], existingNames=existingNames
                 )
         return copiedNodes
 
@@ -624,8 +641,7 @@ class BlueprintCanvas(CanvasBase):
         else:
             nodes = json.loads(data)
 
-        existingNames = self.graphManager.getAllNames()
-        nodes = self.makeSerializedNodesUnique(nodes, extra=existingNames)
+        nodes = self.makeSerializedNodesUnique(nodes)
 
         diff = QtCore.QPointF(self.mapToScene(self.mousePos)) - QtCore.QPointF(
             nodes[0]["x"], nodes[0]["y"]
@@ -1862,23 +1878,13 @@ class BlueprintCanvas(CanvasBase):
             pin = nodeInstance.getPinSG(inpJson["name"], PinSelectionGroup.Inputs)
             if pin:
                 pin.uid = uuid.UUID(inpJson["uuid"])
-                try:
-                    pin.setData(
-                        json.loads(inpJson["value"], cls=pin.jsonDecoderClass())
-                    )
-                except:
-                    pin.setData(pin.defaultValue())
+                _restorePinData(pin, inpJson["value"])
 
         for outJson in jsonTemplate["outputs"]:
             pin = nodeInstance.getPinSG(outJson["name"], PinSelectionGroup.Outputs)
             if pin:
                 pin.uid = uuid.UUID(outJson["uuid"])
-                try:
-                    pin.setData(
-                        json.loads(outJson["value"], cls=pin.jsonDecoderClass())
-                    )
-                except:
-                    pin.setData(pin.defaultValue())
+                _restorePinData(pin, outJson["value"])
 
         return nodeInstance
 
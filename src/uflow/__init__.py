@@ -9,6 +9,7 @@ import collections.abc
 from copy import copy
 import os
 import json
+import logging
 
 try:
     from importlib.metadata import entry_points
@@ -30,8 +31,11 @@ __all__ = [
     "getRawNodeInstance",
     "getAllPinClasses",
     "getHashableDataTypes",
+    "INITIALIZE_UI",
 ]
 
+logger = logging.getLogger(__name__)
+
 
 __PACKAGES = {}
 __PACKAGE_PATHS = {}
@@ -147,18 +151,31 @@ def getRawNodeInstance(nodeClassName, packageName=None, libName=None, **kwargs):
                         return compoundNode
 
 
-def INITIALIZE(additionalPackageLocations=None, software=""):
+def _reportInitializationError(message, headless):
+    logger.error(message)
+    if headless:
+        return
+    from qtpy.QtWidgets import QMessageBox
+
+    QMessageBox.critical(None, "Fatal error", message)
+
+
+def INITIALIZE(additionalPackageLocations=None, software="", headless=False):
+    """Discovers and registers packages
+
+    :param additionalPackageLocations: Additional directories to search packages in
+    :type additionalPackageLocations: list(str) or None
+    :param software: Software name used to filter package tools
+    :type software: str
+    :param headless: If True, only nodes, pins and function libraries are registered and Qt is not imported.
+        Errors are logged instead of shown in message boxes. Ui can be registered later with :func:`INITIALIZE_UI`
+    :type headless: bool
+    """
     __PACKAGES.clear()
     __PACKAGE_PATHS.clear()
     __HASHABLE_TYPES.clear()
     if additionalPackageLocations is None:
         additionalPackageLocations = []
-    from uflow.UI.Tool import REGISTER_TOOL
-    from uflow.UI.Widgets.InputWidgets import REGISTER_UI_INPUT_WIDGET_PIN_FACTORY
-    from uflow.UI.Canvas.UINodeBase import REGISTER_UI_NODE_FACTORY
-    from uflow.UI.Canvas.UIPinBase import REGISTER_UI_PIN_FACTORY
-    from uflow import ConfigManager
-    from qtpy.QtWidgets import QMessageBox
 
     # Discover packages via entry points
     if entry_points is not None:
@@ -184,16 +201,13 @@ def INITIALIZE(additionalPackageLocations=None, software=""):
                                 )
 
                 except Exception as e:
-                    QMessageBox.critical(
-                        None,
-                        "Fatal error",
+                    _reportInitializationError(
                         f"Error On Loading entry point package {entry.name}:\n{e}",
+                        headless,
                     )
         except Exception as e:
-            QMessageBox.critical(
-                None,
-                "Fatal error",
-                f"Error discovering packages via entry points:\n{e}",
+            _reportInitializationError(
+                f"Error discovering packages via entry points:\n{e}", headless
             )
 
     packagePaths = Packages.__path__
@@ -244,8 +258,8 @@ def INITIALIZE(additionalPackageLocations=None, software=""):
                 __PACKAGES[modname] = package
                 __PACKAGE_PATHS[modname] = os.path.normpath(mod.__path__[0])
         except Exception as e:
-            QMessageBox.critical(
-                None, "Fatal error", "Error On Module %s :\n%s" % (modname, str(e))
+            _reportInitializationError(
+                "Error On Module %s :\n%s" % (modname, str(e)), headless
             )
             continue
 
@@ -268,6 +282,28 @@ def INITIALIZE(additionalPackageLocations=None, software=""):
                     )
                 registeredInternalPinDataTypes.add(internalType)
 
+    getHashableDataTypes()
+
+    if not headless:
+        INITIALIZE_UI(software)
+
+
+def INITIALIZE_UI(software=""):
+    """Registers ui factories and tools of packages registered by :func:`INITIALIZE`
+
+    Called by :func:`INITIALIZE` unless it runs headless.
+
+    :param software: Software name used to filter package tools
+    :type software: str
+    """
+    from uflow.UI.Tool import REGISTER_TOOL
+    from uflow.UI.Widgets.InputWidgets import REGISTER_UI_INPUT_WIDGET_PIN_FACTORY
+    from uflow.UI.Canvas.UINodeBase import REGISTER_UI_NODE_FACTORY
+    from uflow.UI.Canvas.UIPinBase import REGISTER_UI_PIN_FACTORY
+
+    for name, package in __PACKAGES.items():
+        packageName = package.__class__.__name__
+
         uiPinsFactory = package.UIPinsFactory()
         if uiPinsFactory is not None:
             REGISTER_UI_PIN_FACTORY(packageName, uiPinsFactory)
@@ -286,4 +322,3 @@ def INITIALIZE(additionalPackageLocations=None, software=""):
                 if software not in supportedSoftwares:
                     continue
             REGISTER_TOOL(packageName, toolClass)
-    getHashableDataTypes()
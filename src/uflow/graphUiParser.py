@@ -1,5 +1,4 @@
 import os
-import json
 import threading
 
 from qtpy.QtWidgets import *
@@ -7,6 +6,8 @@ from qtpy import QtGui
 from uflow import INITIALIZE
 from uflow.Core.Common import *
 from uflow.Core.GraphManager import GraphManagerSingleton
+from uflow.Core.GraphRunner import GraphRunner
+from uflow.Core.BulkLoad import readGraphFile
 from uflow.UI.Canvas.UINodeBase import getUINodeInstance
 from uflow.UI.Utils.stylesheet import editableStyleSheet
 from uflow.UI.Widgets.PropertiesFramework import CollapsibleFormWidget
@@ -22,8 +23,7 @@ def run(filePath):
     msg.setIcon(QMessageBox.Critical)
 
     if os.path.exists(filePath):
-        with open(filePath, "r") as f:
-            data = json.load(f)
+        data = readGraphFile(filePath)
 
         # Window to display inputs
         prop = QDialog()
@@ -62,18 +62,12 @@ def run(filePath):
                             uiNode.createInputWidgets(cat, pins=False)
                 prop.show()
 
-                def programLoop():
-                    while True:
-                        man.Tick(deltaTime=0.02)
-                        time.sleep(0.02)
-                        if man.terminationRequested:
-                            break
-
-                t = threading.Thread(target=programLoop)
+                runner = GraphRunner(man, keepAlive=True)
+                t = threading.Thread(target=runner.run)
                 t.start()
 
                 def quitEvent():
-                    man.terminationRequested = True
+                    runner.requestStop()
                     t.join()
 
                 app.aboutToQuit.connect(quitEvent)
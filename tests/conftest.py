@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from uflow import getRawNodeInstance
+from uflow.Core.Common import connectPins
+from uflow.Core.GraphManager import GraphManager
+from uflow.Core.EvaluationEngine import EvaluationEngine, DefaultEvaluationEngine_Impl
+
+from fixturePackage import PACKAGE_NAME, CALLS, registerFixturePackage
+
+
+@pytest.fixture(autouse=True)
+def fixturePackage():
+    registerFixturePackage()
+    CALLS.clear()
+    yield
+    engine = EvaluationEngine()
+    shutdown = getattr(engine.getImpl(), "shutdown", None)
+    if shutdown is not None:
+        shutdown()
+    engine.setImpl(DefaultEvaluationEngine_Impl())
+
+
+@pytest.fixture
+def graphManager():
+    return GraphManager()
+
+
+@pytest.fixture
+def root(graphManager):
+    return graphManager.findRootGraph()
+
+
+@pytest.fixture
+def spawn(root):
+    """Creates fixture package node or function and adds it to root graph"""
+
+    def spawnNode(className, graph=None, libName=None):
+        node = getRawNodeInstance(className, PACKAGE_NAME, libName=libName)
+        (graph or root).addNode(node)
+        return node
+
+    return spawnNode
+
+
+@pytest.fixture
+def sumGraph(graphManager, spawn):
+    """Serialized graph returning ``x + y``"""
+    inputs = spawn("graphInputs")
+    outputs = spawn("graphOutputs")
+    addf = spawn("addf", libName="FixtureLib")
+    connectPins(inputs.xPin, addf.getPinByName("a"))
+    connectPins(inputs.yPin, addf.getPinByName("b"))
+    connectPins(addf.getPinByName("out"), outputs.result)
+    inputs.yPin.setData(10.0)
+    return graphManager.serialize()
+
+
+@pytest.fixture
+def sumGraphFile(sumGraph, tmp_path):
+    filePath = tmp_path / "sum.pygraph"
+    filePath.write_text(json.dumps(sumGraph))
+    return str(filePath)
@@ -0,0 +1,387 @@
+"""Minimal pins, nodes and function libraries used by tests.
+
+Registered under :data:`PACKAGE_NAME` by ``conftest.py``, the same way benchmarks register
+:mod:`uflow.Benchmarks.BenchmarkPackage`. Tests must not depend on installed packages.
+"""
+
+import os
+import collections
+
+from uflow import GET_PACKAGES
+from uflow.Core import PinBase, NodeBase, FunctionLibraryBase, IMPLEMENT_NODE
+from uflow.Core.Common import *
+from uflow.Core.GraphBase import GraphBase
+
+PACKAGE_NAME = "FixturePackage"
+
+#: Number of calls of function library functions and node computations by name
+CALLS = collections.Counter()
+
+_META = {NodeMeta.CATEGORY: "Fixture", NodeMeta.KEYWORDS: []}
+
+
+def _meta(**kwargs):
+    meta = dict(_META)
+    meta.update(kwargs)
+    return meta
+
+
+class FixFloatPin(PinBase):
+    """Float value pin"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, parent, direction, **kwargs):
+        super(FixFloatPin, self).__init__(name, parent, direction, **kwargs)
+        self.setDefaultValue(0.0)
+
+    @staticmethod
+    def IsValuePin():
+        return True
+
+    @staticmethod
+    def pinDataTypeHint():
+        return "FixFloatPin", 0.0
+
+    @staticmethod
+    def internalDataStructure():
+        return float
+
+    @staticmethod
+    def processData(data):
+        return float(data)
+
+    @staticmethod
+    def supportedDataTypes():
+        return ("FixFloatPin", "FixAnyPin")
+
+
+class FixAnyPin(PinBase):
+    """Pin holding any value unchanged, arrays are sent to worker processes through shared memory"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, parent, direction, **kwargs):
+        super(FixAnyPin, self).__init__(name, parent, direction, **kwargs)
+        self.setDefaultValue(None)
+
+    @staticmethod
+    def IsValuePin():
+        return True
+
+    @staticmethod
+    def pinDataTypeHint():
+        return "FixAnyPin", None
+
+    @staticmethod
+    def internalDataStructure():
+        return object
+
+    @staticmethod
+    def processData(data):
+        return data
+
+    @staticmethod
+    def supportedDataTypes():
+        return ("FixAnyPin", "FixFloatPin")
+
+    @staticmethod
+    def supportsSharedMemoryTransport():
+        return True
+
+
+class FixExecPin(PinBase):
+    """Execution pin"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, parent, direction, **kwargs):
+        super(FixExecPin, self).__init__(name, parent, direction, **kwargs)
+        self.dirty = False
+
+    def isExec(self):
+        return True
+
+    @staticmethod
+    def IsValuePin():
+        return False
+
+    @staticmethod
+    def pinDataTypeHint():
+        return "FixExecPin", None
+
+    @staticmethod
+    def internalDataStructure():
+        return None
+
+    @staticmethod
+    def processData(data):
+        return None
+
+    @staticmethod
+    def supportedDataTypes():
+        return ("FixExecPin",)
+
+    def setData(self, data):
+        pass
+
+
+class graphInputs(NodeBase):
+    """Graph inputs with fixed ``x`` and ``y`` values"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(graphInputs, self).__init__(name, **kwargs)
+        self.xPin = self.createOutputPin("x", "FixFloatPin")
+        self.yPin = self.createOutputPin("y", "FixFloatPin")
+
+    def compute(self, *args, **kwargs):
+        pass
+
+
+class graphOutputs(NodeBase):
+    """Graph outputs with fixed ``result`` value"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(graphOutputs, self).__init__(name, **kwargs)
+        self.result = self.createInputPin("result", "FixFloatPin")
+
+    def compute(self, *args, **kwargs):
+        pass
+
+
+class fixAdd(NodeBase):
+    """Class based node adding two values"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(fixAdd, self).__init__(name, **kwargs)
+        self.a = self.createInputPin("a", "FixFloatPin")
+        self.b = self.createInputPin("b", "FixFloatPin")
+        self.out = self.createOutputPin("out", "FixFloatPin")
+
+    def compute(self, *args, **kwargs):
+        CALLS["fixAdd"] += 1
+        self.out.setData(self.a.getData() + self.b.getData())
+
+
+class fixSink(NodeBase):
+    """Callable node pulling value, so upstream pure nodes are evaluated"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(fixSink, self).__init__(name, **kwargs)
+        self.inExec = self.createInputPin("inExec", "FixExecPin", None, self.compute)
+        self.value = self.createInputPin("value", "FixAnyPin")
+        self.result = None
+
+    def compute(self, *args, **kwargs):
+        self.result = self.value.getData()
+
+
+class fixTicker(NodeBase):
+    """Node overriding Tick, counts received ticks"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(fixTicker, self).__init__(name, **kwargs)
+        self.ticks = 0
+
+    def Tick(self, delta):
+        super(fixTicker, self).Tick(delta)
+        self.ticks += 1
+
+
+class fixCountdown(fixTicker):
+    """Node active until it was ticked :attr:`remaining` times"""
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(fixCountdown, self).__init__(name, **kwargs)
+        self.remaining = 3
+
+    def Tick(self, delta):
+        super(fixCountdown, self).Tick(delta)
+        self.remaining -= 1
+
+    def isTickActive(self):
+        return self.remaining > 0
+
+
+class compound(NodeBase):
+    """Node owning subgraph with ``graphInputs`` and ``graphOutputs`` nodes
+
+    Input ``x`` feeds ``x`` of inner ``graphInputs``, output ``result`` reads ``result`` of inner ``graphOutputs``.
+    """
+
+    _packageName = PACKAGE_NAME
+
+    def __init__(self, name, **kwargs):
+        super(compound, self).__init__(name, **kwargs)
+        self.xPin = self.createInputPin("x", "FixFloatPin")
+        self.result = self.createOutputPin("result", "FixFloatPin")
+        self.isCompoundNode = True
+        self.rawGraph = None
+        self.inputsMap = {}
+        self.outputsMap = {}
+
+    def postCreate(self, jsonTemplate=None):
+        super(compound, self).postCreate(jsonTemplate)
+        graph = self.graph()
+        self.rawGraph = GraphBase(self.name, graph.graphManager, graph)
+        if jsonTemplate is not None and "graphData" in jsonTemplate:
+            self.rawGraph.populateFromJson(jsonTemplate["graphData"])
+        else:
+            self.rawGraph.addNode(graphInputs("graphInputs"))
+            self.rawGraph.addNode(graphOutputs("graphOutputs"))
+        inputsNode = self.rawGraph.getNodesList(classNameFilters=["graphInputs"])[0]
+        outputsNode = self.rawGraph.getNodesList(classNameFilters=["graphOutputs"])[0]
+        pinAffects(self.xPin, inputsNode.xPin)
+        pinAffects(outputsNode.result, self.result)
+        self.inputsMap = {self.xPin: inputsNode.xPin}
+        self.outputsMap = {self.result: outputsNode.result}
+
+    def serialize(self):
+        data = super(compound, self).serialize()
+        data["graphData"] = self.rawGraph.serialize()
+        return data
+
+    def kill(self, *args, **kwargs):
+        if self.rawGraph is not None:
+            self.rawGraph.remove()
+        super(compound, self).kill(*args, **kwargs)
+
+    def compute(self, *args, **kwargs):
+        for outputPin, innerPin in self.outputsMap.items():
+            outputPin.setData(innerPin.getData())
+            outputPin.setClean()
+
+
+class FixtureLib(FunctionLibraryBase):
+    """Function based nodes"""
+
+    def __init__(self, packageName):
+        super(FixtureLib, self).__init__(packageName)
+
+    @staticmethod
+    @IMPLEMENT_NODE(returns=("FixFloatPin", 0.0), meta=_meta())
+    def addf(a=("FixFloatPin", 0.0), b=("FixFloatPin", 0.0)):
+        """Row by row addition"""
+        CALLS["addf"] += 1
+        return a + b
+
+    @staticmethod
+    @IMPLEMENT_NODE(returns=("FixFloatPin", 0.0), meta=_meta())
+    def clampf(a=("FixFloatPin", 0.0), clamped=(REF, ("FixAnyPin", None))):
+        """Clamps negative values to zero, reference output is set for clamped values only"""
+        if a < 0:
+            clamped(a)
+            return 0.0
+        return a
+
+    @staticmethod
+    @IMPLEMENT_NODE(returns=("FixFloatPin", 0.0), meta=_meta())
+    def exitf(a=("FixFloatPin", 0.0)):
+        """Terminates process for negative values, as crashing native code would"""
+        if a < 0:
+            os._exit(1)
+        return a
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("FixAnyPin", None), meta=_meta(**{NodeMeta.VECTORIZED: True})
+    )
+    def mulv(a=("FixAnyPin", None), b=("FixAnyPin", None)):
+        """Vectorized multiplication, works with whole columns only"""
+        CALLS["mulv"] += 1
+        if isinstance(a, list) or isinstance(b, list):
+            raise TypeError("mulv expects arrays")
+        return a * b
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("FixFloatPin", 0.0), meta=_meta(**{NodeMeta.MEMOIZE: True})
+    )
+    def squareMemo(a=("FixFloatPin", 0.0)):
+        """Memoized square"""
+        CALLS["squareMemo"] += 1
+        return a * a
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("FixAnyPin", None), meta=_meta(**{NodeMeta.MEMOIZE: True})
+    )
+    def doubleMemo(a=("FixAnyPin", None)):
+        """Memoized doubling of array"""
+        CALLS["doubleMemo"] += 1
+        return a * 2
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("FixFloatPin", 0.0),
+        meta=_meta(**{NodeMeta.PERSISTENT_CACHE: True}),
+    )
+    def squareCached(a=("FixFloatPin", 0.0)):
+        """Square stored in disk cache"""
+        CALLS["squareCached"] += 1
+        return a * a
+
+    @staticmethod
+    @IMPLEMENT_NODE(
+        returns=("FixAnyPin", None),
+        meta=_meta(**{NodeMeta.ISOLATION: NodeIsolation.Process}),
+    )
+    def scaleProcess(a=("FixAnyPin", None), factor=("FixFloatPin", 2.0)):
+        """Scales value in worker process"""
+        return a * factor
+
+
+class FixturePackage(object):
+    """Package interface expected by :func:`~uflow.getRawNodeInstance`"""
+
+    def __init__(self):
+        self._libraries = {"FixtureLib": FixtureLib(PACKAGE_NAME)}
+
+    def GetPinClasses(self):
+        return {
+            "FixFloatPin": FixFloatPin,
+            "FixAnyPin": FixAnyPin,
+            "FixExecPin": FixExecPin,
+        }
+
+    def GetNodeClasses(self):
+        return {
+            "graphInputs": graphInputs,
+            "graphOutputs": graphOutputs,
+            "fixAdd": fixAdd,
+            "fixSink": fixSink,
+            "fixTicker": fixTicker,
+            "fixCountdown": fixCountdown,
+            "compound": compound,
+        }
+
+    def GetFunctionLibraries(self):
+        return self._libraries
+
+    def GetToolClasses(self):
+        return {}
+
+    def GetExporters(self):
+        return {}
+
+    def PrefsWidgets(self):
+        return None
+
+
+def registerFixturePackage():
+    """Registers fixture package if it is not registered yet"""
+    packages = GET_PACKAGES()
+    if PACKAGE_NAME not in packages:
+        packages[PACKAGE_NAME] = FixturePackage()
@@ -0,0 +1,100 @@
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.BatchEvaluation import evaluateBatch
+
+from fixturePackage import CALLS
+
+numpy = pytest.importorskip("numpy")
+
+
+def _pin(node, name):
+    return node.getPinByName(name)
+
+
+def _io(spawn, graph=None):
+    return spawn("graphInputs", graph), spawn("graphOutputs", graph)
+
+
+def _column(result, name):
+    return [float(value) for value in result[name]]
+
+
+def test_vectorizedNodeReceivesArraysFromRowLoopedNode(spawn, root):
+    inputs, outputs = _io(spawn)
+    addf = spawn("addf", libName="FixtureLib")
+    mulv = spawn("mulv", libName="FixtureLib")
+    connectPins(inputs.xPin, _pin(addf, "a"))
+    connectPins(inputs.yPin, _pin(addf, "b"))
+    connectPins(_pin(addf, "out"), _pin(mulv, "a"))
+    connectPins(inputs.yPin, _pin(mulv, "b"))
+    connectPins(_pin(mulv, "out"), outputs.result)
+
+    result = evaluateBatch(root, {"x": numpy.arange(4.0), "y": 2.0})
+    assert _column(result, "result") == [4.0, 6.0, 8.0, 10.0]
+    assert (CALLS["addf"], CALLS["mulv"]) == (4, 1)
+
+
+def test_rowLoopedNodeReceivesVectorizedColumn(spawn, root):
+    inputs, outputs = _io(spawn)
+    mulv = spawn("mulv", libName="FixtureLib")
+    add = spawn("fixAdd")
+    connectPins(inputs.xPin, _pin(mulv, "a"))
+    connectPins(inputs.yPin, _pin(mulv, "b"))
+    connectPins(_pin(mulv, "out"), add.a)
+    connectPins(inputs.xPin, add.b)
+    connectPins(add.out, outputs.result)
+
+    result = evaluateBatch(root, {"x": [1.0, 2.0, 3.0], "y": 10.0})
+    assert _column(result, "result") == [11.0, 22.0, 33.0]
+
+
+def test_referenceOutputsDoNotKeepRowState(spawn, root):
+    pandas = pytest.importorskip("pandas")
+    inputs, outputs = _io(spawn)
+    clampf = spawn("clampf", libName="FixtureLib")
+    connectPins(inputs.xPin, _pin(clampf, "a"))
+    connectPins(_pin(clampf, "clamped"), outputs.result)
+
+    result = evaluateBatch(root, {"x": [-1.0, 2.0, -3.0]})
+    assert list(pandas.isna(result["result"])) == [False, True, False]
+    assert result["result"][2] == -3.0
+
+
+def test_classNodesDoNotKeepRowState(spawn, root):
+    inputs, outputs = _io(spawn)
+    first = spawn("fixAdd")
+    second = spawn("fixAdd")
+    connectPins(inputs.xPin, first.a)
+    connectPins(first.out, second.a)
+    connectPins(second.out, outputs.result)
+    inputs.xPin.setData(100.0)
+    sink = spawn("fixSink")
+    connectPins(second.out, sink.value)
+    sink.inExec.call()
+    assert sink.result == 100.0
+    first.b.setData(1.0)
+
+    result = evaluateBatch(root, {"x": numpy.arange(3.0)})
+    assert _column(result, "result") == [1.0, 2.0, 3.0]
+    # graph keeps values it had before batch
+    assert first.out.currentData() == 100.0
+    assert second.a.currentData() == 100.0
+    assert second.out.currentData() == 100.0
+    assert first.isDirty()
+
+
+def test_compoundIsEvaluatedPerRow(spawn, root):
+    inputs, outputs = _io(spawn)
+    node = spawn("compound")
+    innerInputs = node.rawGraph.getNodesList(classNameFilters=["graphInputs"])[0]
+    innerOutputs = node.rawGraph.getNodesList(classNameFilters=["graphOutputs"])[0]
+    inner = spawn("addf", node.rawGraph, libName="FixtureLib")
+    connectPins(innerInputs.xPin, _pin(inner, "a"))
+    connectPins(innerInputs.xPin, _pin(inner, "b"))
+    connectPins(_pin(inner, "out"), innerOutputs.result)
+    connectPins(inputs.xPin, node.xPin)
+    connectPins(node.result, outputs.result)
+
+    result = evaluateBatch(root, {"x": numpy.arange(1.0, 4.0)})
+    assert _column(result, "result") == [2.0, 4.0, 6.0]
@@ -0,0 +1,59 @@
+import pytest
+
+from uflow.Core.GraphManager import GraphManager
+from uflow.Benchmarks import GENERATORS
+from uflow.Benchmarks.BenchmarkPackage import registerBenchmarkPackage
+from uflow.Benchmarks.Generators import nestedCompoundGraph
+
+
+@pytest.fixture(autouse=True)
+def benchmarkPackage():
+    registerBenchmarkPackage()
+
+
+def _compounds(graphManager):
+    return [node for node in graphManager.getAllNodes() if node.isCompoundNode]
+
+
+def _childCompounds(compound):
+    return [node for node in compound.rawGraph.getNodesList() if node.isCompoundNode]
+
+
+def test_nestedCompoundsEvaluateChildChains():
+    graphManager = GraphManager()
+    synthetic = nestedCompoundGraph(graphManager.findRootGraph(), 8, depth=4)
+    compounds = _compounds(graphManager)
+    assert len(compounds) == 4
+    for node in graphManager.getAllNodes():
+        if node.__class__.__name__ == "benchAdd":
+            node.b.setData(1.0)
+    synthetic.source.setData(1.0)
+    synthetic.sink.inExec.call()
+
+    # two nodes adding one per level and two in root graph, deepest graphOutputs sees all of them
+    innermost = [node for node in compounds if not _childCompounds(node)][0]
+    assert innermost.outputsNode.inp.currentData() == 1.0 + 10
+
+    for node in compounds:
+        assert list(node.inputsMap.values()) == [node.inputsNode.out]
+        assert list(node.outputsMap.values()) == [node.outputsNode.inp]
+
+
+def test_nestedCompoundsRoundTrip():
+    graphManager = GraphManager()
+    nestedCompoundGraph(graphManager.findRootGraph(), 8, depth=3)
+    restored = GraphManager()
+    restored.deserialize(graphManager.serialize())
+    assert len(restored.getAllNodes()) == len(graphManager.getAllNodes())
+    for node in _compounds(restored):
+        assert node.inputsNode.out.affects
+        assert node.outputsNode.inp.affected_by
+
+
+@pytest.mark.parametrize("shape", sorted(GENERATORS))
+def test_generatorsProduceEvaluableGraphs(shape):
+    graphManager = GraphManager()
+    synthetic = GENERATORS[shape](graphManager.findRootGraph(), 16)
+    synthetic.source.setData(1.0)
+    synthetic.sink.inExec.call()
+    assert synthetic.sink.result is not None
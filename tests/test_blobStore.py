@@ -0,0 +1,111 @@
+import logging
+import os
+import shutil
+
+import numpy
+import pytest
+
+from uflow.Core.BlobStore import BLOB_KEY, BlobStore, blobDirectory
+from uflow.Core.BulkLoad import readGraphFile
+from uflow.Core.GraphContainer import writeGraphFile
+from uflow.Core.GraphManager import GraphManager
+
+
+@pytest.fixture
+def blobStore():
+    store = BlobStore()
+    minBytes, directories = store.minBytes, list(store.directories)
+    store.configure(minBytes=1024)
+    yield store
+    store.minBytes = minBytes
+    store.directories[:] = directories
+
+
+def _arrayNode(spawn, values):
+    node = spawn("mulv", libName="FixtureLib")
+    node.getPinByName("a").setData(values)
+    return node
+
+
+def _pinValue(data, nodeName, pinName):
+    for nodeJson in data["nodes"]:
+        if nodeJson["name"] == nodeName:
+            for pinJson in nodeJson["inputs"]:
+                if pinJson["name"] == pinName:
+                    return pinJson["value"]
+
+
+def test_largeValuesRoundTripThroughBlobs(spawn, graphManager, blobStore, tmp_path):
+    values = numpy.arange(4096, dtype=numpy.float64)
+    node = _arrayNode(spawn, values)
+    data = graphManager.serialize()
+    reference = _pinValue(data, node.name, "a")
+    assert reference[BLOB_KEY] and reference["format"] == "npy"
+    assert _pinValue(data, node.name, "b") == "null"
+
+    for fileName in ("graph.pygraph", "graph.pygraphc"):
+        filePath = str(tmp_path / fileName)
+        writeGraphFile(filePath, graphManager.serialize())
+        assert os.listdir(blobDirectory(filePath))
+
+        restored = GraphManager()
+        restored.deserialize(readGraphFile(filePath))
+        pin = restored.findNode(node.name).getPinByName("a")
+        assert numpy.array_equal(pin.currentData(), values)
+        assert pin._lastError is None
+
+
+def test_missingBlobIsReportedOnPin(
+    spawn, graphManager, blobStore, tmp_path, caplog, monkeypatch
+):
+    values = numpy.ones(4096)
+    node = _arrayNode(spawn, values)
+    filePath = str(tmp_path / "graph.pygraph")
+    writeGraphFile(filePath, graphManager.serialize())
+    data = readGraphFile(filePath)
+
+    shutil.rmtree(blobDirectory(filePath))
+    monkeypatch.setattr(blobStore, "directories", [])
+    monkeypatch.setattr(blobStore, "sessionDirectory", None)
+    restored = GraphManager()
+    with caplog.at_level(logging.WARNING):
+        restored.deserialize(data)
+
+    pin = restored.findNode(node.name).getPinByName("a")
+    assert pin.currentData() is None
+    assert "not found" in pin._lastError
+    assert any(pin.getFullName() in record.getMessage() for record in caplog.records)
+
+
+def test_valuesModifiedInPlaceGetNewBlob(blobStore):
+    values = numpy.zeros(1000)
+    reference = blobStore.put(values)
+    values[:] = 7
+    modified = blobStore.put(values)
+
+    assert modified[BLOB_KEY] != reference[BLOB_KEY]
+    assert numpy.array_equal(blobStore.get(modified), numpy.full(1000, 7.0))
+    assert not blobStore.get(reference).any()
+
+
+def test_missingVariableBlobRestoresDefault(
+    graphManager, blobStore, tmp_path, caplog, monkeypatch
+):
+    variable = graphManager.activeGraph().createVariable(
+        dataType="FixAnyPin", name="values"
+    )
+    variable.value = numpy.ones(4096)
+    filePath = str(tmp_path / "graph.pygraph")
+    writeGraphFile(filePath, graphManager.serialize())
+    data = readGraphFile(filePath)
+
+    shutil.rmtree(blobDirectory(filePath))
+    monkeypatch.setattr(blobStore, "directories", [])
+    monkeypatch.setattr(blobStore, "sessionDirectory", None)
+    restored = GraphManager()
+    with caplog.at_level(logging.WARNING):
+        restored.deserialize(data)
+
+    restoredVariable = restored.findVariableByName("values")
+    assert restoredVariable.value is None
+    assert any("values" in record.getMessage() for record in caplog.records)
@@ -0,0 +1,60 @@
+import copy
+import uuid
+
+from uflow.Core.Common import *
+from uflow.Core.BulkLoad import LOAD_PHASES, LoadTimings
+from uflow.Core.GraphManager import GraphManager
+
+
+def _chainData(spawn, graphManager, count):
+    nodes = [spawn("fixAdd") for _ in range(count)]
+    for lhs, rhs in zip(nodes, nodes[1:]):
+        connectPins(lhs.out, rhs.a)
+    nodes[0].b.setData(1.0)
+    return graphManager.findRootGraph().serialize(), [node.name for node in nodes]
+
+
+def _links(graph):
+    return sorted(
+        (lhs.owningNode().name, rhs.owningNode().name)
+        for node in graph.getNodesList()
+        for lhs in node.outputs.values()
+        for rhs in lhs.affects
+    )
+
+
+def test_deserializeCollectsPhaseTimings(spawn, graphManager):
+    _chainData(spawn, graphManager, 5)
+    data = graphManager.serialize()
+    restored = GraphManager()
+    timings = LoadTimings()
+    restored.deserialize(data, timings)
+    assert restored.lastLoadTimings is timings
+    assert (timings.nodes, timings.links) == (5, 4)
+    assert list(timings.asDict())[: len(LOAD_PHASES)] == list(LOAD_PHASES)
+    assert restored.bulkLoader is None
+
+
+def test_loadedNamesAreUniqueBeforeLinksAreRestored(spawn, graphManager):
+    data, names = _chainData(spawn, graphManager, 3)
+    data = copy.deepcopy(data)
+    data["isRoot"] = False
+    # fresh uids, links without usable uids are resolved by serialized names
+    uids = []
+    for nodeJson in data["nodes"]:
+        nodeJson["uuid"] = str(uuid.uuid4())
+        uids.append(uuid.UUID(nodeJson["uuid"]))
+        for outputJson in nodeJson["outputs"]:
+            for linkData in outputJson["linkedTo"]:
+                linkData["lhsNodeUid"] = linkData["rhsNodeUid"] = "broken"
+
+    compound = spawn("compound")
+    compound.rawGraph.populateFromJson(data)
+
+    loaded = [compound.rawGraph.getNodes()[uid] for uid in uids]
+    loadedNames = [node.name for node in loaded]
+    assert not set(loadedNames) & set(names)
+    allNames = [node.name for node in graphManager.getAllNodes()]
+    assert len(allNames) == len(set(allNames))
+    assert _links(compound.rawGraph) == sorted(zip(loadedNames, loadedNames[1:]))
+    assert _links(graphManager.findRootGraph()) == sorted(zip(names, names[1:]))
@@ -0,0 +1,69 @@
+import pytest
+
+from uflow import getRawNodeInstance
+from uflow.Core.Common import *
+from uflow.Core.GraphManager import GraphManager
+from uflow.Core.DiskCache import DiskCache
+
+from fixturePackage import PACKAGE_NAME, CALLS
+
+
+@pytest.fixture
+def diskCache(tmp_path):
+    cache = DiskCache()
+    cache.configure(str(tmp_path / "cache"))
+    yield cache
+    cache.disable()
+
+
+def _square(graph, functionName):
+    node = getRawNodeInstance(functionName, PACKAGE_NAME, libName="FixtureLib")
+    graph.addNode(node)
+    sink = getRawNodeInstance("fixSink", PACKAGE_NAME)
+    graph.addNode(sink)
+    connectPins(node.getPinByName("out"), sink.value)
+    return node, sink
+
+
+def test_memoizedNodeReusesOutputsOfSeenInputs(root):
+    node, sink = _square(root, "squareMemo")
+    for value in (3.0, 4.0, 3.0):
+        node.getPinByName("a").setData(value)
+        sink.inExec.call()
+        assert sink.result == value * value
+    assert CALLS["squareMemo"] == 2
+    stats = node.memoizationStats()
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+
+
+def test_nanInputsShareMemoizedOutputs(root):
+    node, sink = _square(root, "squareMemo")
+    for value in (float("nan"), 2.0, float("nan")):
+        node.getPinByName("a").setData(value)
+        sink.inExec.call()
+    assert CALLS["squareMemo"] == 2
+    assert node.memoizationStats()["hits"] == 1
+
+
+def test_memoizedOutputsAreNotChangedByConsumers(root):
+    numpy = pytest.importorskip("numpy")
+    node, sink = _square(root, "doubleMemo")
+    for value in (numpy.arange(3.0), numpy.ones(3), numpy.arange(3.0)):
+        node.getPinByName("a").setData(value)
+        sink.inExec.call()
+        assert list(sink.result) == list(value * 2)
+        # consumer modifies its input in place
+        sink.result[:] = -1.0
+    assert CALLS["doubleMemo"] == 2
+
+
+def test_persistentCacheIsSharedBetweenGraphs(diskCache):
+    hits = diskCache.hits
+    for _ in range(2):
+        graph = GraphManager().findRootGraph()
+        node, sink = _square(graph, "squareCached")
+        node.getPinByName("a").setData(5.0)
+        sink.inExec.call()
+        assert sink.result == 25.0
+    assert CALLS["squareCached"] == 1
+    assert diskCache.hits == hits + 1
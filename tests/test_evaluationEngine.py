@@ -0,0 +1,157 @@
+import threading
+
+from uflow.Core.Common import *
+from uflow.Core.EvaluationEngine import EvaluationEngine
+
+from fixturePackage import CALLS
+
+
+def _chainNodes(spawn, count):
+    nodes = [spawn("fixAdd") for _ in range(count)]
+    for lhs, rhs in zip(nodes, nodes[1:]):
+        connectPins(lhs.out, rhs.a)
+    return nodes
+
+
+def _sink(spawn, pin):
+    sink = spawn("fixSink")
+    connectPins(pin, sink.value)
+    return sink
+
+
+def test_planIsReusedUntilTopologyChanges(spawn):
+    nodes = _chainNodes(spawn, 3)
+    sink = _sink(spawn, nodes[-1].out)
+    engine = EvaluationEngine()
+    engine.resetPlanCacheStats()
+
+    nodes[0].b.setData(1.0)
+    sink.inExec.call()
+    nodes[0].b.setData(2.0)
+    sink.inExec.call()
+    stats = engine.planCacheStats()
+    assert (stats["misses"], stats["hits"]) == (1, 1)
+    assert sink.result == 2.0
+
+    extra = spawn("fixAdd")
+    extra.b.setData(10.0)
+    connectPins(extra.out, nodes[0].a)
+    assert engine.planCacheStats()["invalidations"] == 1
+    assert extra in engine.getEvaluationPlan(sink)
+
+    sink.inExec.call()
+    assert sink.result == 12.0
+    assert engine.planCacheStats()["misses"] == 2
+
+
+def test_lazyEngineComputesOnlyDirtyCone(spawn):
+    EvaluationEngine().setMode("lazy")
+    left = _chainNodes(spawn, 2)
+    right = _chainNodes(spawn, 2)
+    join = spawn("fixAdd")
+    connectPins(left[-1].out, join.a)
+    connectPins(right[-1].out, join.b)
+    sink = _sink(spawn, join.out)
+
+    left[0].b.setData(1.0)
+    right[0].b.setData(2.0)
+    sink.inExec.call()
+    assert sink.result == 3.0
+    assert CALLS["fixAdd"] == 5
+
+    CALLS.clear()
+    left[0].b.setData(5.0)
+    sink.inExec.call()
+    assert sink.result == 7.0
+    assert CALLS["fixAdd"] == 3
+    assert not right[0].isDirty() and not right[1].isDirty()
+
+    CALLS.clear()
+    sink.inExec.call()
+    assert CALLS["fixAdd"] == 0
+
+
+def test_threadedEngineKeepsDependencyOrder(spawn):
+    EvaluationEngine().setMode("threaded", 4)
+    source = spawn("fixAdd")
+    source.b.setData(1.0)
+    branches = []
+    for index in range(8):
+        node = spawn("fixAdd")
+        node.b.setData(float(index))
+        connectPins(source.out, node.a)
+        branches.append(node)
+    layer = branches
+    while len(layer) > 1:
+        reduced = []
+        for lhs, rhs in zip(layer[::2], layer[1::2]):
+            node = spawn("fixAdd")
+            connectPins(lhs.out, node.a)
+            connectPins(rhs.out, node.b)
+            reduced.append(node)
+        layer = reduced
+    sink = _sink(spawn, layer[0].out)
+
+    computed = []
+    for node in [source] + branches + [layer[0]]:
+        node.computed.connect(
+            lambda *args, node=node: computed.append(node), weak=False
+        )
+    sink.inExec.call()
+
+    assert sink.result == 8 * 1.0 + sum(range(8))
+    assert computed[0] is source
+    assert set(computed[1:9]) == set(branches)
+    assert computed[-1] is layer[0]
+
+
+
+def test_threadedEnginePinSignalsAreSentFromCallingThread(spawn):
+    EvaluationEngine().setMode("threaded", 4)
+    source = spawn("fixAdd")
+    branches = [spawn("fixAdd") for _ in range(4)]
+    join = spawn("fixAdd")
+    for node in branches:
+        connectPins(source.out, node.a)
+    connectPins(branches[0].out, join.a)
+    connectPins(branches[1].out, join.b)
+    sink = _sink(spawn, join.out)
+
+    threads = []
+    for node in branches:
+        for pin in (node.out, join.a, join.b):
+            for signal in (pin.dataBeenSet, pin.markedAsDirty):
+                signal.connect(
+                    lambda *args: threads.append(threading.get_ident()), weak=False
+                )
+    source.b.setData(1.0)
+    threads.clear()
+    sink.inExec.call()
+
+    assert sink.result == 2.0
+    assert threads and set(threads) == {threading.get_ident()}
+
+def test_dirtyPropagationVisitsPinsOnce(spawn):
+    source = spawn("fixAdd")
+    left = _chainNodes(spawn, 2)
+    right = _chainNodes(spawn, 2)
+    join = spawn("fixAdd")
+    connectPins(source.out, left[0].a)
+    connectPins(source.out, right[0].a)
+    connectPins(left[-1].out, join.a)
+    connectPins(right[-1].out, join.b)
+
+    marks = []
+    join.out.markedAsDirty.connect(lambda *args: marks.append(args), weak=False)
+    for node in [source] + left + right + [join]:
+        for pin in node.pins:
+            pin.setClean()
+    source.a.setData(1.0)
+    assert join.out.dirty
+    assert len(marks) == 1
+
+
+def test_dirtyPropagationHandlesLongChains(spawn):
+    nodes = _chainNodes(spawn, 1200)
+    nodes[0].a.setData(1.0)
+    assert nodes[-1].out.dirty
@@ -0,0 +1,56 @@
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.GraphCompiler import GraphCompilationError, compileGraph
+
+
+def _pin(node, name):
+    return node.getPinByName(name)
+
+
+def _load(source, functionName="run"):
+    namespace = {}
+    exec(compile(source, "<compiled graph>", "exec"), namespace)
+    return namespace[functionName]
+
+
+def test_compiledFunctionMatchesGraph(spawn, root):
+    inputs = spawn("graphInputs")
+    outputs = spawn("graphOutputs")
+    addf = spawn("addf", libName="FixtureLib")
+    mulv = spawn("mulv", libName="FixtureLib")
+    connectPins(inputs.xPin, _pin(addf, "a"))
+    connectPins(inputs.yPin, _pin(addf, "b"))
+    connectPins(_pin(addf, "out"), _pin(mulv, "a"))
+    connectPins(inputs.yPin, _pin(mulv, "b"))
+    connectPins(_pin(mulv, "out"), outputs.result)
+
+    run = _load(compileGraph(root))
+    assert run(x=3.0, y=2.0) == {"result": 10.0}
+
+
+def test_compoundIsInlined(spawn, root):
+    inputs = spawn("graphInputs")
+    outputs = spawn("graphOutputs")
+    node = spawn("compound")
+    innerInputs = node.rawGraph.getNodesList(classNameFilters=["graphInputs"])[0]
+    innerOutputs = node.rawGraph.getNodesList(classNameFilters=["graphOutputs"])[0]
+    inner = spawn("addf", node.rawGraph, libName="FixtureLib")
+    connectPins(innerInputs.xPin, _pin(inner, "a"))
+    connectPins(innerInputs.xPin, _pin(inner, "b"))
+    connectPins(_pin(inner, "out"), innerOutputs.result)
+    connectPins(inputs.xPin, node.xPin)
+    connectPins(node.result, outputs.result)
+
+    run = _load(compileGraph(root))
+    assert run(x=4.0, y=0.0) == {"result": 8.0}
+
+
+def test_classNodesAreRejected(spawn, root):
+    inputs = spawn("graphInputs")
+    outputs = spawn("graphOutputs")
+    add = spawn("fixAdd")
+    connectPins(inputs.xPin, add.a)
+    connectPins(add.out, outputs.result)
+    with pytest.raises(GraphCompilationError):
+        compileGraph(root)
@@ -0,0 +1,81 @@
+import copy
+import json
+import pickle
+
+from uflow.Core.BulkLoad import readGraphFile
+from uflow.Core.GraphContainer import (
+    GraphContainer,
+    LazySection,
+    isContainerFile,
+    writeGraphFile,
+)
+from uflow.Core.GraphManager import GraphManager
+
+
+def _nestedGraph(spawn, depth):
+    graph = None
+    compounds = []
+    for _ in range(depth):
+        compound = spawn("compound", graph=graph)
+        spawn("fixAdd", graph=compound.rawGraph)
+        compounds.append(compound)
+        graph = compound.rawGraph
+    return compounds
+
+
+def _canonical(data):
+    """Returns json of serialized graph with pins ordered by index, their order in lists has no meaning"""
+
+    def sortPins(value):
+        if isinstance(value, dict):
+            result = {key: sortPins(item) for key, item in value.items()}
+            for key in ("inputs", "outputs"):
+                if isinstance(result.get(key), list):
+                    result[key] = sorted(result[key], key=lambda pin: pin["pinIndex"])
+            return result
+        if isinstance(value, list):
+            return [sortPins(item) for item in value]
+        return value
+
+    return json.dumps(sortPins(data), sort_keys=True)
+
+
+def test_containerRoundTrip(spawn, graphManager, tmp_path):
+    _nestedGraph(spawn, 3)
+    data = graphManager.serialize()
+    filePath = str(tmp_path / "graph.pygraphc")
+    writeGraphFile(filePath, copy.deepcopy(data))
+    assert isContainerFile(filePath)
+    assert len(GraphContainer(filePath).sections) == 4
+
+    restored = []
+    for source in (readGraphFile(filePath), copy.deepcopy(data)):
+        manager = GraphManager()
+        manager.deserialize(source)
+        restored.append(_canonical(manager.serialize()))
+    assert restored[0] == restored[1]
+
+
+def test_subgraphsAreDecodedOnAccess(spawn, graphManager, tmp_path):
+    _nestedGraph(spawn, 2)
+    filePath = str(tmp_path / "graph.pygraphc")
+    writeGraphFile(filePath, graphManager.serialize())
+
+    container = GraphContainer(filePath)
+    root = container.root()
+    assert container.decodedSections == 1
+    subgraph = [node for node in root["nodes"] if "graphData" in node][0]["graphData"]
+    assert isinstance(subgraph, LazySection) and not subgraph.bLoaded
+    assert subgraph["nodes"]
+    assert subgraph.bLoaded and container.decodedSections == 2
+
+    plain = pickle.loads(pickle.dumps(subgraph))
+    assert type(plain) is dict and plain == dict(subgraph.items())
+
+
+def test_jsonFilesStayJson(spawn, graphManager, tmp_path):
+    spawn("fixAdd")
+    filePath = str(tmp_path / "graph.pygraph")
+    writeGraphFile(filePath, graphManager.serialize())
+    assert not isContainerFile(filePath)
+    assert readGraphFile(filePath) == graphManager.serialize()
@@ -0,0 +1,86 @@
+import csv
+import json
+
+import pytest
+
+from uflow import getRawNodeInstance
+from uflow.Core.Common import connectPins
+from uflow.Core.GraphExecutor import GraphExecutor
+from uflow.Core.BatchJobs import BatchRunner, runBatch, readRecords, _CsvWriter
+
+from fixturePackage import PACKAGE_NAME
+
+
+def test_executorRunsGraphWithDefaults(sumGraph):
+    executor = GraphExecutor(sumGraph)
+    assert executor.inputNames() == ["x", "y"]
+    assert executor.execute({"x": 1.0, "y": 2.0}) == {"result": 3.0}
+    assert executor.execute({"x": 1.0}) == {"result": 11.0}
+    with pytest.raises(ValueError):
+        executor.execute({"z": 1.0})
+
+
+def test_executorReturnsWithTickingNodes(sumGraph):
+    executor = GraphExecutor(sumGraph)
+    root = executor.graphManager.findRootGraph()
+    ticker = getRawNodeInstance("fixTicker", PACKAGE_NAME)
+    root.addNode(ticker)
+    assert executor.execute({"x": 2.0}) == {"result": 12.0}
+    assert ticker.ticks == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batchRunsRecordsInOrder(sumGraphFile, tmp_path, workers):
+    inputsPath = tmp_path / "inputs.jsonl"
+    records = [{"x": float(index)} for index in range(6)] + [{"x": "bad"}]
+    inputsPath.write_text("\n".join(json.dumps(record) for record in records))
+    outputPath = tmp_path / "results.csv"
+
+    if workers == 1:
+        summary = runBatch(sumGraphFile, str(inputsPath), str(outputPath), workers=1)
+    else:
+        runner = BatchRunner(sumGraphFile, workers, retries=1, context="fork")
+        with open(str(outputPath), "w", newline="") as stream:
+            summary = runner.run(
+                readRecords(str(inputsPath)), _CsvWriter(stream, ["result"])
+            )
+
+    with open(str(outputPath), newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert [row["index"] for row in rows] == [str(index) for index in range(7)]
+    assert [float(row["result"]) for row in rows[:6]] == [
+        10.0 + index for index in range(6)
+    ]
+    assert rows[-1]["status"] == "failed"
+    assert rows[-1]["attempts"] == "2"
+    assert (summary.succeeded, summary.failed) == (6, 1)
+
+
+def test_batchFailsOnlyRecordKillingWorker(graphManager, spawn, tmp_path):
+    inputs = spawn("graphInputs")
+    outputs = spawn("graphOutputs")
+    exitf = spawn("exitf", libName="FixtureLib")
+    connectPins(inputs.xPin, exitf.getPinByName("a"))
+    connectPins(exitf.getPinByName("out"), outputs.result)
+    graphPath = tmp_path / "exit.pygraph"
+    graphPath.write_text(json.dumps(graphManager.serialize()))
+    values = [0.0, 1.0, 2.0, -1.0, 3.0, 4.0, 5.0, 6.0, 7.0]
+
+    results = []
+
+    class Writer(object):
+        def write(self, result):
+            results.append(result)
+
+    runner = BatchRunner(str(graphPath), 2, retries=1, context="fork")
+    summary = runner.run([{"x": value} for value in values], Writer())
+
+    assert [result["index"] for result in results] == list(range(len(values)))
+    failed = results[values.index(-1.0)]
+    assert failed["status"] == "failed"
+    assert failed["error"] == "Worker process terminated abruptly"
+    assert [
+        result["outputs"]["result"] for result in results if result["status"] == "ok"
+    ] == [value for value in values if value >= 0]
+    assert (summary.succeeded, summary.failed) == (8, 1)
+    assert summary.workerCrashes == 3
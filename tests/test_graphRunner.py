@@ -0,0 +1,67 @@
+import time
+import threading
+
+import pytest
+
+from uflow.Core.GraphRunner import GraphRunner
+
+
+def test_runnerExitsWhenOnlyTickReceiversRemain(graphManager, spawn):
+    node = spawn("fixAdd")
+    ticks = []
+    node.tick.connect(ticks.append, weak=False)
+    GraphRunner(graphManager).run()
+    assert len(ticks) == 1
+
+
+def test_tickOverridingNodesAreTickedUntilStopped(graphManager, spawn):
+    ticker = spawn("fixTicker")
+    runner = GraphRunner(graphManager, tickInterval=0.001)
+    thread = threading.Thread(target=runner.run)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while ticker.ticks < 3 and time.monotonic() < deadline:
+            time.sleep(0.001)
+    finally:
+        runner.requestStop()
+        thread.join(5.0)
+    assert not thread.is_alive()
+    assert ticker.ticks >= 3
+
+
+def test_runnerTicksActiveNodesUntilIdle(graphManager, spawn):
+    countdown = spawn("fixCountdown")
+    runner = GraphRunner(graphManager, tickInterval=0.001)
+    runner.run()
+    assert countdown.remaining == 0
+    assert countdown.ticks == 3
+
+
+def test_runnerTicksScheduledNodes(graphManager, spawn):
+    node = spawn("fixAdd")
+    ticks = []
+    node.tick.connect(ticks.append, weak=False)
+    node.scheduleTick(0.01)
+    start = time.monotonic()
+    GraphRunner(graphManager).run()
+    assert time.monotonic() - start >= 0.01
+    # regular tick on start, then scheduled tick only
+    assert len(ticks) == 2
+    assert ticks[0] == pytest.approx(0.0, abs=0.005)
+    assert ticks[1] >= 0.01
+
+
+def test_keepAliveRunnerTicksNodesWithReceivers(graphManager, spawn):
+    node = spawn("fixAdd")
+    heartbeat = threading.Event()
+    node.tick.connect(lambda delta: heartbeat.set(), weak=False)
+    runner = GraphRunner(graphManager, tickInterval=0.001, keepAlive=True)
+    thread = threading.Thread(target=runner.run)
+    thread.start()
+    try:
+        assert heartbeat.wait(5.0)
+    finally:
+        runner.requestStop()
+        thread.join(5.0)
+    assert not thread.is_alive()
@@ -0,0 +1,105 @@
+import sys
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from uflow import getRawNodeInstance
+from uflow.Core.Common import connectPins, disconnectPins
+from uflow.Core.GraphManager import GraphManager
+from uflow.Core.GraphService import GraphService
+from uflow.Core.EvaluationEngine import EvaluationEngine
+
+from fixturePackage import PACKAGE_NAME
+
+
+@pytest.fixture
+def service(sumGraphFile):
+    service = GraphService([sumGraphFile], instances=2, timeout=5.0)
+    thread = threading.Thread(target=service.serve, kwargs={"port": 0}, daemon=True)
+    thread.start()
+    while service.address() is None:
+        thread.join(0.01)
+    yield service
+    service.shutdown()
+    thread.join(5.0)
+
+
+def _request(service, path, payload=None):
+    host, port = service.address()[:2]
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request("http://{0}:{1}{2}".format(host, port, path), data)
+    try:
+        with urllib.request.urlopen(request, timeout=5.0) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_serviceRunsConcurrentRequests(service):
+    results = [None] * 8
+
+    def run(index):
+        results[index] = _request(service, "/run/sum", {"x": float(index)})
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5.0)
+
+    assert [code for code, _ in results] == [200] * 8
+    assert [payload["outputs"]["result"] for _, payload in results] == [
+        10.0 + index for index in range(8)
+    ]
+    stats = _request(service, "/stats")[1]["sum"]
+    assert (stats["requests"], stats["errors"], stats["available"]) == (8, 0, 2)
+
+
+def test_serviceReportsErrors(service):
+    assert _request(service, "/run/missing", {})[0] == 404
+    assert _request(service, "/run/sum", {"z": 1.0})[0] == 400
+    code, payload = _request(service, "/health")
+    assert code == 200
+    assert payload["graphs"]["sum"]["inputs"] == ["x", "y"]
+
+
+def test_concurrentGraphsKeepPlanCacheConsistent():
+    engine = EvaluationEngine()
+    engine.resetPlanCacheStats()
+    iterations = 300
+    results = {}
+
+    def run(name):
+        root = GraphManager().findRootGraph()
+        add = getRawNodeInstance("fixAdd", PACKAGE_NAME)
+        sink = getRawNodeInstance("fixSink", PACKAGE_NAME)
+        root.addNode(add)
+        root.addNode(sink)
+        values = []
+        for index in range(iterations):
+            # topology changes invalidate plans while other graph evaluates
+            connectPins(add.out, sink.value)
+            add.b.setData(float(index))
+            sink.inExec.call()
+            values.append(sink.result)
+            disconnectPins(add.out, sink.value)
+        results[name] = values
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=run, args=(name,)) for name in "ab"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30.0)
+    finally:
+        sys.setswitchinterval(interval)
+
+    expected = [float(index) for index in range(iterations)]
+    assert results == {"a": expected, "b": expected}
+    stats = engine.planCacheStats()
+    assert stats["hits"] + stats["misses"] == 2 * iterations
@@ -0,0 +1,80 @@
+import os
+import sys
+import textwrap
+import subprocess
+
+PACKAGE_FILES = {
+    "__init__.py": """
+        import os
+        from uflow.Core.PackageBase import PackageBase
+
+
+        class HeadlessPackage(PackageBase):
+            def __init__(self):
+                super(HeadlessPackage, self).__init__()
+                self.analyzePackage(os.path.dirname(__file__))
+    """,
+    "Pins/HeadlessPin.py": """
+        from uflow.Core import PinBase
+
+
+        class HeadlessPin(PinBase):
+            @staticmethod
+            def IsValuePin():
+                return True
+
+            @staticmethod
+            def pinDataTypeHint():
+                return "HeadlessPin", 0
+
+            @staticmethod
+            def internalDataStructure():
+                return complex
+
+            @staticmethod
+            def processData(data):
+                return data
+    """,
+    "Nodes/headlessNode.py": """
+        from uflow.Core import NodeBase
+
+
+        class headlessNode(NodeBase):
+            def __init__(self, name, **kwargs):
+                super(headlessNode, self).__init__(name, **kwargs)
+                self.createInputPin("value", "HeadlessPin")
+    """,
+    "Tools/HeadlessTool.py": """
+        from qtpy import QtWidgets
+    """,
+}
+
+SCRIPT = """
+import sys
+from uflow import INITIALIZE, GET_PACKAGES, getRawNodeInstance
+INITIALIZE([sys.argv[1]], headless=True)
+node = getRawNodeInstance("headlessNode", "HeadlessPackage")
+qtModules = [name for name in sys.modules if name.split(".")[0] in ("qtpy", "PySide6", "PyQt5")]
+print(sorted(GET_PACKAGES()), node.__class__.__name__, qtModules)
+"""
+
+
+def test_headlessInitializeDoesNotImportQt(tmp_path):
+    packageRoot = tmp_path / "ext" / "uflow" / "Packages" / "HeadlessPackage"
+    for relativePath, source in PACKAGE_FILES.items():
+        filePath = packageRoot / relativePath
+        filePath.parent.mkdir(parents=True, exist_ok=True)
+        filePath.write_text(textwrap.dedent(source))
+
+    sourceRoot = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+    environment = dict(os.environ, PYTHONPATH=os.path.abspath(sourceRoot))
+    environment.pop("uflow_PACKAGES_PATHS", None)
+    completed = subprocess.run(
+        [sys.executable, "-c", SCRIPT, str(tmp_path)],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    lastLine = completed.stdout.strip().splitlines()[-1]
+    assert lastLine == "['HeadlessPackage'] headlessNode []"
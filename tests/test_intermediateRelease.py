@@ -0,0 +1,72 @@
+from uflow.Core.Common import *
+from uflow.Core.EvaluationEngine import EvaluationEngine
+from uflow.Core.IntermediateRelease import IntermediateReleaser
+
+from fixturePackage import CALLS
+
+
+def _chain(spawn, count):
+    nodes = [spawn("fixAdd") for _ in range(count)]
+    for lhs, rhs in zip(nodes, nodes[1:]):
+        connectPins(lhs.out, rhs.a)
+    for node in nodes:
+        node.b.setData(1.0)
+    sink = spawn("fixSink")
+    connectPins(nodes[-1].out, sink.value)
+    return nodes, sink
+
+
+def test_consumedValuesAreReleased(spawn, graphManager):
+    nodes, sink = _chain(spawn, 4)
+    with IntermediateReleaser(graphManager) as releaser:
+        sink.inExec.call()
+        assert sink.result == 4.0
+        assert releaser.releases == 3
+        assert all(releaser.isReleased(node.out) for node in nodes[:-1])
+        # value read by callable sink is kept
+        assert not releaser.isReleased(nodes[-1].out)
+        assert nodes[-1].a.currentData() == 0.0
+
+        CALLS.clear()
+        sink.inExec.call()
+        assert CALLS["fixAdd"] == 0
+
+    assert all(node.out.dirty for node in nodes[:-1])
+    sink.inExec.call()
+    assert sink.result == 4.0
+
+
+def test_releasedValueIsRestoredForRecompute(spawn, graphManager):
+    nodes, sink = _chain(spawn, 3)
+    with IntermediateReleaser(graphManager) as releaser:
+        sink.inExec.call()
+        nodes[-1].b.setData(10.0)
+        sink.inExec.call()
+        assert sink.result == 12.0
+        assert releaser.isReleased(nodes[0].out)
+
+
+def test_threadedReleaseCountsEveryConsumer(spawn, graphManager):
+    EvaluationEngine().setMode("threaded", 4)
+    source = spawn("fixAdd")
+    source.b.setData(1.0)
+    join = None
+    for index in range(16):
+        node = spawn("fixAdd")
+        connectPins(source.out, node.a)
+        node.b.setData(float(index))
+        if join is None:
+            join = node
+            continue
+        adder = spawn("fixAdd")
+        connectPins(join.out, adder.a)
+        connectPins(node.out, adder.b)
+        join = adder
+    sink = spawn("fixSink")
+    connectPins(join.out, sink.value)
+
+    with IntermediateReleaser(graphManager) as releaser:
+        sink.inExec.call()
+        assert sink.result == 16 * 1.0 + sum(range(16))
+        assert releaser.releases == len(releaser._consumers)
+        assert not any(releaser._remaining.values())
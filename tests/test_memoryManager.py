@@ -0,0 +1,76 @@
+import numpy
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.GraphRunner import GraphRunner
+
+from fixturePackage import CALLS
+
+
+@pytest.fixture
+def memoryManager():
+    manager = MemoryManager()
+    manager.destroy()
+    manager.enable()
+    yield manager
+    manager.destroy()
+    manager.setBudget(None)
+
+
+def _scaled(spawn, values):
+    node = spawn("mulv", libName="FixtureLib")
+    node.getPinByName("a").setData(values)
+    node.getPinByName("b").setData(2.0)
+    sink = spawn("fixSink")
+    connectPins(node.getPinByName("out"), sink.value)
+    return node, sink
+
+
+def test_sharedValuesAreCountedOnce(spawn, memoryManager, graphManager):
+    values = numpy.ones(1000)
+    node, sink = _scaled(spawn, values)
+    sink.inExec.call()
+
+    rows = {
+        (row["node"], row["pin"]): row for row in memoryManager.pinStats(graphManager)
+    }
+    out = rows[(node.name, "out")]
+    assert out["bytes"] == values.nbytes
+    assert out["shared"] and rows[(sink.name, "value")]["shared"]
+    assert memoryManager.totalBytes >= 2 * values.nbytes
+    assert memoryManager.totalBytes < 3 * values.nbytes
+
+    byNode = {row["node"]: row for row in memoryManager.nodeStats(graphManager)}
+    assert byNode[sink.name]["bytes"] == values.nbytes
+
+
+def test_budgetReleasesCleanIntermediates(spawn, memoryManager, graphManager):
+    values = numpy.ones(1000)
+    node, sink = _scaled(spawn, values)
+    sink.inExec.call()
+    assert memoryManager.candidates(graphManager) == [node.getPinByName("out")]
+
+    memoryManager.setBudget(values.nbytes + 512)
+    freed = memoryManager.enforceBudget(graphManager)
+    assert freed == values.nbytes
+    assert not memoryManager.isOverBudget()
+    assert memoryManager.stats()["releases"] == 1
+    assert sink.value.currentData() is None
+
+    CALLS.clear()
+    sink.inExec.call()
+    assert CALLS["mulv"] == 1
+    assert numpy.array_equal(sink.result, values * 2.0)
+
+
+def test_runnerEnforcesBudget(spawn, memoryManager, graphManager):
+    values = numpy.ones(1000)
+    node, sink = _scaled(spawn, values)
+    memoryManager.setBudget(values.nbytes + 512)
+
+    GraphRunner(graphManager).run([sink.inExec.call])
+    assert numpy.array_equal(sink.result, values * 2.0)
+    assert memoryManager.stats()["releases"] == 1
+    assert node.getPinByName("out").currentData() is None
+    assert not memoryManager.isOverBudget()
@@ -0,0 +1,48 @@
+from uflow.Core.NameIndex import NameIndex, splitName
+
+
+def test_uniqNameUsesSmallestFreeSuffixOfBaseName():
+    index = NameIndex(["node", "node1", "node3", "node01", "other7"])
+    assert index.uniqName("fresh") == "fresh"
+    assert index.uniqName("node") == "node2"
+    assert index.uniqName("node3") == "node2"
+    # suffixes of other base names do not matter
+    assert index.uniqName("other7") == "other1"
+
+    index.add("node2")
+    index.remove("node1")
+    # zero padded "node01" still holds suffix 1
+    assert index.uniqName("node") == "node4"
+    index.remove("node01")
+    assert index.uniqName("node") == "node1"
+    assert splitName("node12") == ("node", 12)
+
+
+def test_indexCountsDuplicates():
+    index = NameIndex(["a", "a"])
+    assert index.count("a") == 2
+    index.remove("a")
+    assert "a" in index and index.count("a") == 1
+    index.rename("a", "b")
+    assert "a" not in index and index.names() == ["b"]
+
+
+def test_registryFollowsNodeLifetime(spawn, graphManager):
+    first = spawn("fixAdd")
+    second = spawn("fixAdd")
+    assert (first.name, second.name) == ("fixAdd", "fixAdd1")
+    assert graphManager.findNode("fixAdd1") is second
+
+    second.setName("renamed")
+    assert graphManager.findNode("renamed") is second
+    assert graphManager.findNode("fixAdd1") is None
+    assert spawn("fixAdd").name == "fixAdd1"
+
+    compound = spawn("compound")
+    assert compound.rawGraph.findNode("fixAdd") is None
+    assert graphManager.names.findNode("graphInputs", compound.rawGraph) is not None
+
+    first.kill()
+    assert graphManager.findNode("fixAdd") is None
+    assert "fixAdd" not in graphManager.names.nodes
+    assert graphManager.getUniqNodeName("fixAdd") == "fixAdd"
@@ -0,0 +1,36 @@
+from uflow.Core.GraphManager import GraphManager
+from uflow.Core.PathsRegistry import PathsRegistry
+
+
+def test_pathsFollowNodeChanges(spawn, graphManager):
+    paths = graphManager.paths
+    node = spawn("fixAdd")
+    assert paths.getEntity("root/fixAdd") is node
+    assert paths.getEntity("root/fixAdd.out") is node.out
+
+    node.setName("renamed")
+    assert not paths.contains("root/fixAdd")
+    assert paths.getEntity("root/renamed.out") is node.out
+
+    compound = spawn("compound")
+    inner = spawn("fixAdd", graph=compound.rawGraph)
+    assert paths.getEntity("root/compound/fixAdd") is inner
+    compound.rawGraph.name = "moved"
+    assert paths.getEntity("root/moved/fixAdd") is inner
+    assert not paths.contains("root/compound/fixAdd")
+
+    node.kill()
+    assert not any(path.startswith("root/renamed") for path in paths.getAllPaths())
+
+
+def test_pathsArePerGraphManager(spawn, graphManager):
+    node = spawn("fixAdd")
+    other = GraphManager()
+    assert other.paths is not graphManager.paths
+    assert not other.paths.contains("root/fixAdd")
+
+    registry = PathsRegistry()
+    assert registry.getEntity("root/fixAdd", graphManager) is node
+    assert registry.getEntity("root/fixAdd", other) is None
+    registry.rebuild(graphManager)
+    assert registry.getEntity("root/fixAdd", graphManager) is node
@@ -0,0 +1,86 @@
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.ProcessPool import ProcessExecutionBackend
+from uflow.Core.SharedMemoryTransport import SharedMemoryRegistry
+
+from fixturePackage import PACKAGE_NAME
+
+
+@pytest.fixture
+def backend():
+    backend = ProcessExecutionBackend()
+    backend.start(maxWorkers=1, context="fork")
+    backend.resetStats()
+    yield backend
+    backend.shutdown()
+
+
+def _scale(spawn, value):
+    node = spawn("scaleProcess", libName="FixtureLib")
+    node.getPinByName("a").setData(value)
+    sink = spawn("fixSink")
+    connectPins(node.getPinByName("out"), sink.value)
+    return node, sink
+
+
+def test_functionIsComputedInWorker(backend, spawn):
+    node, sink = _scale(spawn, 3.0)
+    sink.inExec.call()
+    assert sink.result == 6.0
+    stats = backend.stats()[node.uid]
+    assert (stats["calls"], stats["fallbacks"]) == (1, 0)
+
+
+def test_spawnedWorkersLoadPackagesFromLocations(spawn, tmp_path):
+    # spawned workers start empty and discover packages like INITIALIZE does
+    packageDir = tmp_path / "fixtures" / "uflow" / "Packages" / PACKAGE_NAME
+    packageDir.mkdir(parents=True)
+    (packageDir / "__init__.py").write_text(
+        "from fixturePackage import {0}\n".format(PACKAGE_NAME)
+    )
+    backend = ProcessExecutionBackend()
+    backend.start(maxWorkers=1, additionalPackageLocations=[str(tmp_path)])
+    try:
+        backend.resetStats()
+        node, sink = _scale(spawn, 3.0)
+        sink.inExec.call()
+    finally:
+        backend.shutdown()
+    assert sink.result == 6.0
+    assert backend.stats()[node.uid]["calls"] == 1
+
+
+def test_unpicklableArgumentsAreComputedInProcess(backend, spawn):
+    class Value(float):
+        pass
+
+    node, sink = _scale(spawn, Value(2.0))
+    sink.inExec.call()
+    assert sink.result == 4.0
+    assert backend.stats()[node.uid]["fallbacks"] == 1
+
+
+def test_sharedSegmentsAreFreedOnceConsumersComputed(backend, spawn):
+    numpy = pytest.importorskip("numpy")
+    registry = SharedMemoryRegistry()
+    source = spawn("mulv", libName="FixtureLib")
+    source.getPinByName("a").setData(numpy.arange(1000.0))
+    source.getPinByName("b").setData(1.0)
+    consumers = []
+    for _ in range(2):
+        node = spawn("scaleProcess", libName="FixtureLib")
+        connectPins(source.getPinByName("out"), node.getPinByName("a"))
+        sink = spawn("fixSink")
+        connectPins(node.getPinByName("out"), sink.value)
+        consumers.append((node, sink))
+
+    consumers[0][1].inExec.call()
+    assert consumers[0][1].result[-1] == 1998.0
+    assert backend.stats()[consumers[0][0].uid]["bytesShared"] > 0
+    # other consumer did not read the value yet
+    assert registry.count() == 1
+
+    consumers[1][1].inExec.call()
+    assert consumers[1][1].result[-1] == 1998.0
+    assert registry.count() == 0
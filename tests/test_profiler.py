@@ -0,0 +1,54 @@
+import csv
+
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.Profiler import Profiler, PROFILE_COLUMNS
+
+
+@pytest.fixture
+def profiler():
+    profiler = Profiler()
+    profiler.reset()
+    profiler.enable()
+    yield profiler
+    profiler.destroy()
+
+
+def _chain(spawn):
+    first = spawn("fixAdd")
+    second = spawn("fixAdd")
+    connectPins(first.out, second.a)
+    sink = spawn("fixSink")
+    connectPins(second.out, sink.value)
+    first.b.setData(1.0)
+    return first, second, sink
+
+
+def test_profilerCountsComputesAndSkips(spawn, profiler):
+    first, second, sink = _chain(spawn)
+    sink.inExec.call()
+    sink.inExec.call()
+
+    rows = {row["name"]: row for row in profiler.nodeStats()}
+    assert rows[first.name]["calls"] == 1
+    assert rows[second.name]["calls"] == 1
+    assert rows[second.name]["skips"] >= 1
+    assert rows[sink.name]["calls"] == 2
+    assert rows[sink.name]["pulls"] >= 1
+    for row in rows.values():
+        assert row["selfMs"] <= row["totalMs"]
+
+    byType = {row["name"]: row for row in profiler.typeStats()}
+    assert byType["fixAdd"]["calls"] == 2
+
+
+def test_profilerExportsRows(spawn, profiler, tmp_path):
+    _chain(spawn)[-1].inExec.call()
+    filePath = tmp_path / "profile.csv"
+    profiler.exportCsv(str(filePath))
+    with open(str(filePath), newline="") as stream:
+        reader = csv.DictReader(stream)
+        assert tuple(reader.fieldnames) == PROFILE_COLUMNS
+        assert len(list(reader)) == 3
+    assert "fixAdd" in profiler.report(byType=True)
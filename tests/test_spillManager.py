@@ -0,0 +1,73 @@
+import gc
+import os
+
+import numpy
+import pandas
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.MemoryManager import MemoryManager
+from uflow.Core.SpillManager import SpillManager, SpilledValue
+
+from fixturePackage import CALLS
+
+
+@pytest.fixture
+def spillManager(tmp_path):
+    manager = SpillManager()
+    directory, minBytes = manager.directory, manager.minBytes
+    manager.configure(str(tmp_path / "spill"), minBytes=0)
+    manager.resetStats()
+    yield manager
+    manager.directory, manager.minBytes = directory, minBytes
+
+
+@pytest.fixture
+def memoryManager():
+    manager = MemoryManager()
+    manager.destroy()
+    yield manager
+    manager.destroy()
+    manager.setBudget(None)
+    manager.setPolicy("release")
+
+
+def test_spillPolicyMovesValuesToDisk(spawn, graphManager, spillManager, memoryManager):
+    values = numpy.arange(1000, dtype=numpy.float64)
+    memoryManager.enable(budget=values.nbytes + 512, policy="spill")
+    node = spawn("mulv", libName="FixtureLib")
+    node.getPinByName("a").setData(values)
+    node.getPinByName("b").setData(2.0)
+    sink = spawn("fixSink")
+    out = node.getPinByName("out")
+    connectPins(out, sink.value)
+    sink.inExec.call()
+
+    assert memoryManager.enforceBudget(graphManager) == values.nbytes
+    assert isinstance(out._data, SpilledValue)
+    assert sink.value._data is out._data
+    assert spillManager.stats()["files"] >= 1
+    filePath = out._data.filePath
+    assert os.path.dirname(filePath) == spillManager.directory
+
+    CALLS.clear()
+    assert numpy.array_equal(sink.value.currentData(), values * 2.0)
+    assert CALLS["mulv"] == 0
+    assert spillManager.stats()["reloads"] == 1
+
+    out._data = None
+    sink.value._data = None
+    gc.collect()
+    assert not os.path.exists(filePath)
+
+
+def test_spilledObjectsRoundTrip(spillManager):
+    frame = pandas.DataFrame({"a": numpy.arange(100), "b": numpy.linspace(0, 1, 100)})
+    for value in (frame, {"rows": [1, 2, 3], "blob": b"x" * 100}):
+        handle = spillManager.spill(value)
+        assert handle.filePath.endswith(".pkl")
+        restored = handle.load()
+        if isinstance(value, pandas.DataFrame):
+            pandas.testing.assert_frame_equal(restored, value)
+        else:
+            assert restored == value
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from uflow.Core.Common import *
+from uflow.Core.Tracer import Tracer, DEFAULT_CAPACITY
+
+
+@pytest.fixture
+def tracer():
+    tracer = Tracer()
+    tracer.clear()
+    tracer.enable()
+    yield tracer
+    tracer.enable(DEFAULT_CAPACITY)
+    tracer.destroy()
+
+
+def test_tracerRecordsComputeEvents(spawn, tracer, tmp_path):
+    node = spawn("fixAdd")
+    sink = spawn("fixSink")
+    connectPins(node.out, sink.value)
+    sink.inExec.call()
+
+    events = [event for event in tracer.events() if event["ph"] == "X"]
+    names = [(event["cat"], event["name"]) for event in events]
+    assert ("compute", node.name) in names
+    assert ("exec", sink.name + ".inExec") in names
+    assert all(event["dur"] >= 0 for event in events)
+
+    filePath = tmp_path / "trace.json"
+    assert tracer.dump(str(filePath)) == len(tracer.events())
+    assert json.loads(filePath.read_text())["otherData"]["droppedEvents"] == 0
+
+
+def test_tracerKeepsRecentEvents(tracer):
+    tracer.enable(capacity=4)
+    for index in range(10):
+        tracer.complete(str(index), "test", tracer.begin())
+    events = [event for event in tracer.events() if event["ph"] == "X"]
+    assert [event["name"] for event in events] == ["6", "7", "8", "9"]
+    assert tracer.dropped == 6